@@ -0,0 +1,3 @@
+"""
+Offline benchmarks for the Sonetel Python package. See benchmarks/README.md.
+"""
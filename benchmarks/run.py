@@ -0,0 +1,267 @@
+"""
+Run the offline benchmarks against a local stand-in for the Sonetel API and write the results as JSON.
+
+Usage:
+    python -m benchmarks.run --output results.json
+    python -m benchmarks.run --latency 0.02 --recordings 50000 --only throughput memory
+
+Benchmarks:
+
+* `overhead` - Time per call of each resource method with no server latency, and the time the package adds on top
+  of a plain `requests.Session` request to the same URL.
+* `throughput` - Calls per second at increasing concurrency, with the configured server latency.
+* `memory` - Memory taken by a large recording and user list, as dicts and as typed models.
+* `import_time` - Cumulative import time of each resource class, measured in a fresh interpreter.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime, timezone
+from statistics import mean, median
+from time import perf_counter
+
+from sonetel import _constants as const
+from .stand_in import ACCOUNT_ID, StandIn, make_token
+
+RESOURCES = ('Account', 'Auth', 'Call', 'PhoneNumber', 'Recording', 'User', 'VoiceApp')
+SECTIONS = ('overhead', 'throughput', 'memory', 'import_time')
+
+
+def _percentile(values: list, percent: float) -> float:
+    values = sorted(values)
+    return values[min(int(len(values) * percent / 100), len(values) - 1)]
+
+
+def _timings(func, iterations: int) -> dict:
+    """
+    Call ``func`` ``iterations`` times and return the per-call latency in microseconds.
+    """
+    func()  # Warm up: open the connection and fill the token caches.
+    samples = []
+    for _ in range(iterations):
+        started = perf_counter()
+        func()
+        samples.append((perf_counter() - started) * 1e6)
+    return {
+        'mean_us': round(mean(samples), 1),
+        'p50_us': round(median(samples), 1),
+        'p99_us': round(_percentile(samples, 99), 1),
+    }
+
+
+def _calls(token: str) -> dict:
+    # pylint: disable=import-outside-toplevel
+    from sonetel import Account, Call, PhoneNumber, User, VoiceApp
+    account, call, numbers = Account(access_token=token), Call(access_token=token), PhoneNumber(access_token=token)
+    users, voiceapps = User(access_token=token), VoiceApp(access_token=token)
+    return {
+        'Account.get': account.get,
+        'Account.get_balance': account.get_balance,
+        'PhoneNumber.get': numbers.get,
+        'User.get': lambda: users.get(all_users=True),
+        'VoiceApp.get': voiceapps.get,
+        'Call.callback': lambda: call.callback('+46101234567', '+12125551234'),
+    }
+
+
+def bench_overhead(server: StandIn, iterations: int) -> dict:
+    """
+    Per-call latency of each resource method, and the overhead over a bare ``requests`` call.
+    """
+    import requests  # pylint: disable=import-outside-toplevel
+
+    server.latency = 0.0
+    token = make_token()
+    results = {name: _timings(func, iterations) for name, func in _calls(token).items()}
+
+    session = requests.Session()
+    # The URL exactly as Account builds it, so both hit the same route.
+    url = f'{const.API_URI_BASE}/{const.API_ENDPOINT_ACCOUNT}/{ACCOUNT_ID}'
+    headers = {'Authorization': f'Bearer {token}', 'Content-Type': 'application/json'}
+    baseline = _timings(lambda: session.get(url, headers=headers).json(), iterations)
+    session.close()
+
+    results['requests.Session.get'] = baseline
+    results['Account.get']['overhead_us'] = round(results['Account.get']['mean_us'] - baseline['mean_us'], 1)
+    return results
+
+
+def _throughput(func, calls: int, concurrency: int) -> float:
+    from sonetel.utilities import map_concurrently  # pylint: disable=import-outside-toplevel
+    started = perf_counter()
+    map_concurrently(lambda _: func(), range(calls), max_workers=concurrency)
+    return calls / (perf_counter() - started)
+
+
+def _async_throughput(calls: int, concurrency: int, token: str) -> float:
+    from sonetel import aio  # pylint: disable=import-outside-toplevel
+
+    async def main():
+        account = aio.AsyncAccount(access_token=token)
+        slots = asyncio.Semaphore(concurrency)
+
+        async def one():
+            async with slots:
+                await account.get()
+
+        await one()
+        started = perf_counter()
+        await asyncio.gather(*(one() for _ in range(calls)))
+        elapsed = perf_counter() - started
+        await aio.get_async_transport().close()
+        return calls / elapsed
+
+    aio.set_async_transport(aio.AsyncTransport(limit=max(concurrency, 1)))
+    return asyncio.run(main())
+
+
+def bench_throughput(server: StandIn, latency: float, concurrency: list, calls: int) -> dict:
+    """
+    Calls per second with ``concurrency`` workers, each call waiting ``latency`` seconds on the server.
+    """
+    from sonetel import transport  # pylint: disable=import-outside-toplevel
+
+    server.latency = latency
+    transport.configure(pool_maxsize=max(concurrency))
+    token = make_token()
+    calls_by_name = _calls(token)
+    results = {'latency_s': latency, 'calls': calls}
+    for name in ('Account.get', 'Call.callback'):
+        results[name] = {str(c): round(_throughput(calls_by_name[name], calls, c), 1) for c in concurrency}
+
+    try:
+        import aiohttp  # pylint: disable=import-outside-toplevel,unused-import
+    except ImportError:
+        results['AsyncAccount.get'] = None
+    else:
+        results['AsyncAccount.get'] = {
+            str(c): round(_async_throughput(calls, c, token), 1) for c in concurrency
+        }
+    return results
+
+
+def _retained(build) -> tuple:
+    """
+    Return the result of ``build()``, the bytes it still holds and the peak allocation while it ran.
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def bench_memory(server: StandIn) -> dict:
+    """
+    Memory taken by the full recording and user lists, as dicts and as typed models.
+    """
+    # pylint: disable=import-outside-toplevel
+    from sonetel import Recording, User
+
+    server.latency = 0.0
+    token = make_token()
+    recordings, users = Recording(access_token=token), User(access_token=token)
+    results = {}
+    for name, func in (
+            ('Recording.get', recordings.get),
+            ('Recording.get(typed=True)', lambda: recordings.get(typed=True)),
+            ('User.get', lambda: users.get(all_users=True)),
+            ('User.get(typed=True)', lambda: users.get(all_users=True, typed=True)),
+    ):
+        func()
+        result, current, peak = _retained(func)
+        body = result['response'] if isinstance(result, dict) else result
+        results[name] = {'records': len(body), 'retained_bytes': current, 'peak_bytes': peak}
+        del result, body
+    return results
+
+
+def import_time_us(statement: str) -> int:
+    """
+    Run ``statement`` with ``python -X importtime`` and return the cumulative time of the sonetel modules it imported.
+    """
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', statement],
+        capture_output=True, text=True, check=True
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        if name.startswith(' sonetel'):
+            total += int(cumulative)
+    return total
+
+
+def bench_import_time(repeat: int = 5) -> dict:
+    """
+    Best of ``repeat`` cumulative import times of `sonetel` and each resource class, in microseconds.
+    """
+    results = {'sonetel': min(import_time_us('import sonetel') for _ in range(repeat))}
+    for resource in RESOURCES:
+        results[resource] = min(import_time_us(f'from sonetel import {resource}') for _ in range(repeat))
+    return results
+
+
+def main(argv: list = None) -> dict:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n', 1)[0])
+    parser.add_argument('--latency', type=float, default=0.01,
+                        help='server latency in seconds for the throughput benchmark (default: 0.01)')
+    parser.add_argument('--recordings', type=int, default=20000, help='number of call recordings (default: 20000)')
+    parser.add_argument('--users', type=int, default=5000, help='number of users (default: 5000)')
+    parser.add_argument('--numbers', type=int, default=100, help='number of phone numbers (default: 100)')
+    parser.add_argument('--iterations', type=int, default=200, help='calls per method in the overhead benchmark')
+    parser.add_argument('--calls', type=int, default=500, help='calls per concurrency level in the throughput benchmark')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 8, 32, 64],
+                        help='concurrency levels for the throughput benchmark')
+    parser.add_argument('--only', nargs='+', choices=SECTIONS, default=list(SECTIONS),
+                        help='benchmarks to run (default: all)')
+    parser.add_argument('--output', default='benchmark-results.json', help='file to write the JSON results to')
+    args = parser.parse_args(argv)
+
+    try:
+        from importlib.metadata import version  # pylint: disable=import-outside-toplevel
+        package_version = version('sonetel')
+    except Exception:  # pylint: disable=broad-except
+        package_version = None
+
+    results = {
+        'meta': {
+            'sonetel': package_version,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'date': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'config': {key: value for key, value in vars(args).items() if key != 'output'},
+        },
+    }
+
+    with StandIn(recordings=args.recordings, users=args.users, numbers=args.numbers) as server:
+        const.API_URI_BASE = server.url
+        const.API_URI_AUTH = f'{server.url}/oauth/token'
+        if 'overhead' in args.only:
+            results['overhead'] = bench_overhead(server, args.iterations)
+        if 'throughput' in args.only:
+            results['throughput'] = bench_throughput(server, args.latency, args.concurrency, args.calls)
+        if 'memory' in args.only:
+            results['memory'] = bench_memory(server)
+        results['meta']['server_requests'] = server.requests
+
+    if 'import_time' in args.only:
+        results['import_time'] = bench_import_time()
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=2)
+    print(json.dumps(results, indent=2))
+    return results
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+A local stand-in for the Sonetel API, used by the benchmarks.
+
+It serves the auth endpoint and the account, phone number, voice app, user, callback and call recording routes
+with generated data. Response latency and list sizes are configurable.
+"""
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+
+ACCOUNT_ID = '1234'
+USER_ID = '5678'
+
+
+def make_token(lifetime: int = 3600) -> str:
+    payload = {
+        'aud': 'api.sonetel.com',
+        'acc_id': ACCOUNT_ID,
+        'user_id': USER_ID,
+        'iat': int(time.time()),
+        'exp': int(time.time()) + lifetime,
+    }
+    return jwt.encode(payload, 'sonetel-python-benchmark-secret-key', algorithm='HS256')
+
+
+def _recording(i: int) -> dict:
+    return {
+        'call_recording_id': f'RE{i:010d}',
+        'account_id': int(ACCOUNT_ID),
+        'created_date': time.strftime('%Y%m%dT%H:%M:%SZ', time.gmtime(1672531200 + i * 60)),
+        'expiry_date': '20300101T00:00:00Z',
+        'type': 'voice_call',
+        'voice_call_details': {'from': '+46101234567', 'to': '+12125551234', 'duration': i % 600},
+        'file_access_details': {'file_download_url': f'https://example.com/RE{i:010d}.mp3'},
+    }
+
+
+def _user(i: int) -> dict:
+    return {
+        'user_id': str(100000 + i),
+        'account_id': ACCOUNT_ID,
+        'email': f'user{i}@example.com',
+        'user_fname': 'Test',
+        'user_lname': f'User {i}',
+        'type': 'regular',
+        'status': 'active',
+    }
+
+
+def _number(i: int) -> dict:
+    return {
+        'phnum': f'+4610{i:07d}',
+        'connect_to_type': 'user',
+        'connect_to': USER_ID,
+        'country': 'SWE',
+        'status': 'active',
+    }
+
+
+def _encode(body) -> bytes:
+    return json.dumps(body).encode()
+
+
+class StandIn:
+    """
+    Run the stand-in API on a random localhost port.
+
+    Args:
+        latency (float): Seconds to wait before answering each request. Defaults to 0.
+        recordings (int): Number of call recordings in the account. Defaults to 1000.
+        users (int): Number of users in the account. Defaults to 100.
+        numbers (int): Number of phone numbers in the account. Defaults to 100.
+    """
+    def __init__(self, latency: float = 0.0, recordings: int = 1000, users: int = 100, numbers: int = 100):
+        self.latency = latency
+        self.requests = 0
+
+        # Bodies are generated once so that the server doesn't dominate the measurements.
+        def success(response):
+            return _encode({'status': 'success', 'response': response})
+
+        self._routes = [
+            ('POST', re.compile(r'^/oauth/token$'),
+             lambda: _encode({'access_token': make_token(), 'refresh_token': 'refresh'})),
+            ('GET', re.compile(r'^/account/+\d+/phonenumbersubscription/$'),
+             lambda body=success([_number(i) for i in range(numbers)]): body),
+            ('GET', re.compile(r'^/account/+\d+/voiceapp/$'),
+             lambda body=success([{'app_id': f'app{i}', 'name': f'App {i}'} for i in range(10)]): body),
+            ('GET', re.compile(r'^/account/+\d+/user/$'),
+             lambda body=success([_user(i) for i in range(users)]): body),
+            ('GET', re.compile(r'^/account/+\d+/user/\d+$'),
+             lambda body=success(_user(0)): body),
+            ('GET', re.compile(r'^/account/+\d+$'),
+             lambda body=success({'account_id': ACCOUNT_ID, 'name': 'ACME', 'currency': 'USD',
+                                  'credit_balance': '12.34'}): body),
+            ('POST', re.compile(r'^/make-calls/call/call-back$'),
+             lambda body=success({'session_id': '1234567890'}): body),
+            ('GET', re.compile(r'^/call-recording$'),
+             lambda body=success([_recording(i) for i in range(recordings)]): body),
+        ]
+
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Headers and body are written separately, which would otherwise hit the delayed ACK timer.
+            disable_nagle_algorithm = True
+
+            def _handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                if length:
+                    self.rfile.read(length)
+                stand_in.requests += 1
+                if stand_in.latency:
+                    time.sleep(stand_in.latency)
+
+                path = self.path.split('?', 1)[0]
+                status, payload = 404, _encode({'status': 'failed', 'response': 'Not found'})
+                for method, pattern, body in stand_in._routes:  # pylint: disable=protected-access
+                    if method == self.command and pattern.match(path):
+                        status, payload = 200, body()
+                        break
+
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                try:
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.request_queue_size = 1024
+        self.url = f'http://127.0.0.1:{self._httpd.server_address[1]}'
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
@@ -4,6 +4,11 @@ setup(
     name='sonetel',
     version='0.2.1',
     packages=['sonetel'],
+    extras_require={
+        'async': ['aiohttp'],
+        'fast': ['orjson'],
+        'store': ['cryptography'],
+    },
     url='https://github.com/Sonetel/sonetel-python',
     license='MIT',
     author='aashish',
@@ -1,11 +1,42 @@
 """
 Sonetel
+
+The resource classes are imported on first use, so that `import sonetel` stays fast and scripts only load the
+modules, and the dependencies (requests, PyJWT), that they actually use.
 """
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .account import Account
+    from .auth import Auth
+    from .calls import Call
+    from .phonenumber import PhoneNumber
+    from .recording import Recording
+    from .users import User
+    from .voiceapps import VoiceApp
+
+_LAZY_IMPORTS = {
+    'Account': '.account',
+    'Auth': '.auth',
+    'Call': '.calls',
+    'PhoneNumber': '.phonenumber',
+    'Recording': '.recording',
+    'User': '.users',
+    'VoiceApp': '.voiceapps',
+}
+
+__all__ = list(_LAZY_IMPORTS)
+
+
+def __getattr__(name):
+    module = _LAZY_IMPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'sonetel' has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
 
-from .account import Account
-from .auth import Auth
-from .calls import Call
-from .phonenumber import PhoneNumber
-from .recording import Recording
-from .users import User
-from .voiceapps import VoiceApp
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
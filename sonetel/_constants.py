@@ -26,6 +26,34 @@ API_ENDPOINT_VOICEAPP = '/voiceapp/'
 API_ENDPOINT_USER = '/user/'
 API_ENDPOINT_CALL_RECORDING = '/call-recording'
 
+# Endpoint groups, used to configure the transport per group of API resources
+GROUP_AUTH = 'auth'
+GROUP_CALLBACK = 'callback'
+GROUP_NUMBERS = 'numbers'
+GROUP_RECORDINGS = 'recordings'
+GROUP_USERS = 'users'
+GROUP_VOICEAPPS = 'voiceapps'
+GROUP_ACCOUNT = 'account'
+GROUP_OTHER = 'other'
+
+# Request lifecycle events, see sonetel.hooks
+EVENT_BEFORE_SEND = 'before_send'
+EVENT_AFTER_RESPONSE = 'after_response'
+EVENT_ERROR = 'error'
+EVENT_RETRY = 'retry'
+EVENT_TOKEN_REFRESH = 'token_refresh'
+EVENT_CIRCUIT_STATE = 'circuit_state'
+
+# Request priority classes, see sonetel.scheduler
+PRIORITY_INTERACTIVE = 'interactive'
+PRIORITY_MUTATION = 'mutation'
+PRIORITY_BULK = 'bulk'
+
+# Circuit breaker states, see sonetel.breaker
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_HALF_OPEN = 'half_open'
+
 # Users
 CONST_TYPES_USER = ['regular', 'admin']
 
@@ -39,4 +67,5 @@ ERR_USER_DETAIL_EMPTY = 2000
 ERR_USED_ID_EMPTY = 2001
 ERR_ACCOUNT_UPDATE_BODY_EMPTY = 3000
 ERR_CALLBACK_NUM_EMPTY = 4000
+ERR_RECORDING_ID_EMPTY = 5000
 
@@ -13,10 +13,11 @@ The class contains the following methods:
 * `get_accountid()` - Get your account ID.
 
 """
-from json import dumps
+from .codec import dumps
 from . import utilities as util
 from . import _constants as const
 from . import exceptions as e
+from . import models
 
 class Account(util.Resource):
     def __init__(self, access_token: str):
@@ -26,7 +27,7 @@ class Account(util.Resource):
         super().__init__(access_token=access_token)
         self._url = f'{const.API_URI_BASE}/{const.API_ENDPOINT_ACCOUNT}/{self._accountid}'
 
-    def get(self) -> dict:
+    def get(self, typed: bool = False) -> dict:
         """
         Get information about the Sonetel account.
 
@@ -39,17 +40,19 @@ class Account(util.Resource):
             'USD'
         
         Args:
-            None
+            typed (bool): Optional. Return the account as an `AccountModel` instead of a dict. Defaults to False.
 
         Returns:
             dict: The account information if the request was processed successfully.
         """
 
-        return util.send_api_request(
+        response = util.send_api_request(
             token=self._token,
             uri=self._url,
             method='get',
+            raw=False if typed else None,
         )
+        return models.AccountModel.from_response(response) if typed else response
 
     def update(self, name: str = '', language: str = '', timezone: str = '') -> dict:
         """
@@ -71,15 +74,7 @@ class Account(util.Resource):
 
         """
 
-        body = {}
-        if name:
-            body['name'] = name
-        if language:
-            body['language'] = language
-        if timezone:
-            body['timezone_details'] = {
-                "zone_id": timezone
-            }
+        body = self._update_body(name=name, language=language, timezone=timezone)
         if len(body) == 0:
             return util.prepare_error(
                 code=const.ERR_ACCOUNT_UPDATE_BODY_EMPTY,
@@ -116,8 +111,32 @@ class Account(util.Resource):
             token=self._token,
             uri=self._url,
             method='get',
+            raw=False,
         )
 
+        return self._format_balance(response, currency)
+
+    @staticmethod
+    def _update_body(name: str, language: str, timezone: str) -> dict:
+        """
+        Build the request body for update(). Returns an empty dict if nothing is to be updated.
+        """
+        body = {}
+        if name:
+            body['name'] = name
+        if language:
+            body['language'] = language
+        if timezone:
+            body['timezone_details'] = {
+                "zone_id": timezone
+            }
+        return body
+
+    @staticmethod
+    def _format_balance(response: dict, currency: bool) -> str:
+        """
+        Extract the prepaid balance from an account response.
+        """
         balance = response['response']['credit_balance']
         if currency:
             balance += f" {response['response']['currency']}"
@@ -0,0 +1,782 @@
+"""
+# Async client
+
+Asyncio versions of the resource classes. They accept the same arguments, run the same input checks and return
+the same response shapes as their synchronous counterparts, but every method that talks to the API is a coroutine.
+
+All requests share one pooled ``aiohttp`` connection set per event loop, so thousands of requests can be in flight
+at the same time. Install the optional dependency with `pip install sonetel[async]`.
+
+Requests are rate limited, paused by ``Retry-After`` and retried like those of the sync transport, see
+`sonetel.ratelimit` and `sonetel.retry`. The waits use ``asyncio.sleep()`` and don't block the event loop.
+
+It contains the following classes:
+
+* `AsyncAuth`
+* `AsyncAccount`
+* `AsyncCall`
+* `AsyncPhoneNumber`
+* `AsyncRecording`
+* `AsyncUser`
+* `AsyncVoiceApp`
+
+Examples:
+    >>> import asyncio
+    >>> from sonetel.aio import AsyncAuth, AsyncCall
+    >>> async def main():
+    ...     auth = AsyncAuth('username', 'password')
+    ...     await auth.create_token()
+    ...     call = AsyncCall(access_token=auth.get_access_token())
+    ...     return await call.callback(num1='+12125551234', num2='+44123456789')
+    >>> asyncio.run(main())
+
+"""
+import asyncio
+from collections import deque
+from contextvars import copy_context
+from functools import partial
+from time import monotonic
+from . import codec
+from . import deadline
+from . import hooks
+from .codec import dumps
+from . import utilities as util
+from . import _constants as const
+from . import exceptions as e
+from . import models
+from .account import Account
+from .auth import Auth, _token_refreshed
+from .calls import Call
+from .phonenumber import PhoneNumber, is_e164
+from .recording import Recording
+from .users import User
+from .voiceapps import VoiceApp
+
+try:
+    import aiohttp
+except ImportError:  # pragma: no cover
+    aiohttp = None
+
+
+def _require_aiohttp():
+    if aiohttp is None:
+        raise e.SonetelException('aiohttp is required for the async client. Install it with "pip install aiohttp".')
+
+
+class AsyncResponse:
+    """
+    A fully read HTTP response.
+    """
+    __slots__ = ('status_code', 'headers', 'content')
+
+    def __init__(self, status_code: int, headers, content: bytes):
+        self.status_code = status_code
+        self.headers = headers
+        self.content = content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8', errors='replace')
+
+    def json(self):
+        return codec.loads(self.content)
+
+
+class AsyncTransport:
+    """
+    Pooled ``aiohttp`` transport. One ``ClientSession`` is kept per event loop.
+
+    Args:
+        limit (int): Optional. Maximum number of open connections. 0 means no limit. Defaults to 1000.
+        limit_per_host (int): Optional. Maximum number of open connections per host. 0 means no limit. Defaults to 0.
+        keepalive_timeout (float): Optional. Seconds an idle connection is kept open. Defaults to 60.
+        coalesce (bool): Optional. Concurrent GET requests for the same URL with the same token share one request
+            and all receive its response. Defaults to True.
+        timeouts (Timeouts): Optional. Connect and read timeouts per endpoint group, see `sonetel.deadline`.
+        rate_limiter (RateLimiter): Optional. Per endpoint group rate limits, see `sonetel.ratelimit`. Defaults to a
+            `RateLimiter` without limits, which only honours ``Retry-After`` on 429 and 503 responses.
+        retry_policy (RetryPolicy): Optional. When and how often failed requests are retried, see `sonetel.retry`.
+            Defaults to `RetryPolicy()`.
+    """
+    def __init__(self, limit: int = 1000, limit_per_host: int = 0, keepalive_timeout: float = 60.0,
+                 coalesce: bool = True, timeouts: deadline.Timeouts = None, rate_limiter=None, retry_policy=None):
+        _require_aiohttp()
+        # pylint: disable=import-outside-toplevel
+        from .ratelimit import RateLimiter
+        from .retry import RetryPolicy
+
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self.coalesce = coalesce
+        self.timeouts = timeouts if timeouts is not None else deadline.Timeouts()
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.coalesced = 0
+        self._sessions = {}
+        self._flights = {}
+
+    def _get_session(self):
+        loop = asyncio.get_running_loop()
+        session = self._sessions.get(loop)
+        if session is None or session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+            )
+            session = aiohttp.ClientSession(connector=connector)
+            self._sessions[loop] = session
+        return session
+
+    async def request(self, method: str, url: str, headers: dict = None, data=None, auth: tuple = None,
+                      timeout: float = None) -> AsyncResponse:
+        """
+        Send an HTTP request and read the full response body. Without a ``timeout``, the connect and read timeouts
+        of the endpoint group are used. Both are bounded by the latency budget of the call, if there is one.
+
+        Like the sync transport, the request waits for the rate limit of its endpoint group, a 429 or 503 response
+        pauses the group for the time given in ``Retry-After`` before the request is sent again, and transient
+        failures are retried as decided by ``retry_policy``. All waits use ``asyncio.sleep()``.
+
+        Raises ``aiohttp.ClientError`` or ``asyncio.TimeoutError`` if the request fails, and
+        `DeadlineExceededException` if the budget is used up.
+        """
+        if not self.coalesce or method.upper() != 'GET':
+            return await self._send(method, url, headers, data, auth, timeout)
+
+        key = (asyncio.get_running_loop(), url, (headers or {}).get('Authorization'))
+        while True:
+            flight = self._flights.get(key)
+            if flight is None:
+                break
+            self.coalesced += 1
+            left = deadline.remaining()
+            try:
+                return await asyncio.wait_for(asyncio.shield(flight), None if left is None else max(left, 0.0))
+            except asyncio.TimeoutError:
+                if flight.done():
+                    raise
+                raise e.DeadlineExceededException(
+                    'the latency budget was used up waiting for an identical request'
+                ) from None
+            except asyncio.CancelledError:
+                # The request we waited for was cancelled, not this one: send it ourselves.
+                if not flight.cancelled():
+                    raise
+
+        flight = self._flights[key] = asyncio.get_running_loop().create_future()
+        try:
+            response = await self._send(method, url, headers, data, auth, timeout)
+        except asyncio.CancelledError:
+            flight.cancel()
+            raise
+        except BaseException as err:
+            flight.set_exception(err)
+            flight.exception()  # Mark it retrieved, in case nobody else was waiting.
+            raise
+        else:
+            flight.set_result(response)
+            return response
+        finally:
+            del self._flights[key]
+
+    async def _send(self, method: str, url: str, headers: dict, data, auth: tuple, timeout: float) -> AsyncResponse:
+        """
+        Send a request, waiting for the rate limiter and retrying as needed. See `Transport._send()`.
+        """
+        from .transport import _exceeds_budget, endpoint_group  # pylint: disable=import-outside-toplevel
+
+        group = endpoint_group(url)
+        limiter = self.rate_limiter
+        policy = self.retry_policy
+        start = monotonic()
+        attempts = 0
+        throttled = 0
+        while True:
+            await limiter.acquire_async(group, timeout=deadline.remaining())
+            attempts += 1
+            sent = monotonic()
+            try:
+                response = await self._attempt(method, url, group, headers, data, auth, timeout)
+            except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                policy.record_attempt(group, monotonic() - sent)
+                elapsed = monotonic() - start
+                if not policy.should_retry(method, attempts, elapsed, err=err):
+                    raise
+                delay = policy.backoff(attempts, elapsed)
+                if _exceeds_budget(delay):
+                    raise
+                policy.record_retry(group)
+                if hooks.active:
+                    hooks.emit(hooks.RETRY, method, url, group=group, attempt=attempts, duration=delay, error=err)
+                await asyncio.sleep(delay)
+                continue
+            policy.record_attempt(group, monotonic() - sent)
+
+            if response.status_code in (429, 503) and throttled < limiter.max_throttle_retries:
+                delay = limiter.throttled(group, response.headers.get('Retry-After'))
+                if hooks.active:
+                    hooks.emit(hooks.RETRY, method, url, group=group, attempt=attempts,
+                               status=response.status_code, duration=delay)
+                attempts -= 1
+                throttled += 1
+                continue
+
+            elapsed = monotonic() - start
+            if policy.should_retry(method, attempts, elapsed, status_code=response.status_code):
+                delay = policy.backoff(attempts, elapsed)
+                if _exceeds_budget(delay):
+                    return response
+                policy.record_retry(group)
+                if hooks.active:
+                    hooks.emit(hooks.RETRY, method, url, group=group, attempt=attempts,
+                               status=response.status_code, duration=delay)
+                await asyncio.sleep(delay)
+                continue
+
+            return response
+
+    def _client_timeout(self, group: str, timeout: float):
+        left = deadline.remaining()
+        if left is not None and left <= 0:
+            raise e.DeadlineExceededException('the latency budget was used up before the request was sent')
+        if timeout is not None:
+            return aiohttp.ClientTimeout(total=timeout if left is None else min(timeout, left))
+
+        connect, read = self.timeouts.for_group(group)
+        return aiohttp.ClientTimeout(total=left, sock_connect=connect, sock_read=read)
+
+    async def _attempt(self, method: str, url: str, group: str, headers: dict, data, auth: tuple,
+                       timeout: float) -> AsyncResponse:
+        client_timeout = self._client_timeout(group, timeout)
+        session = self._get_session()
+        if auth is not None:
+            auth = aiohttp.BasicAuth(*auth)
+        watched = hooks.active
+        if watched:
+            hooks.emit(hooks.BEFORE_SEND, method, url, group=group, bytes=len(data) if isinstance(data, (str, bytes)) else 0)
+        sent = monotonic()
+        try:
+            async with session.request(
+                method=method.upper(),
+                url=url,
+                headers=headers,
+                data=data,
+                auth=auth,
+                timeout=client_timeout,
+            ) as resp:
+                response = AsyncResponse(resp.status, resp.headers, await resp.read())
+        except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+            if watched:
+                hooks.emit(hooks.ERROR, method, url, group=group, duration=monotonic() - sent, error=err)
+            raise
+        if watched:
+            hooks.emit(hooks.AFTER_RESPONSE, method, url, group=group, status=response.status_code,
+                       bytes=len(response.content), duration=monotonic() - sent)
+        return response
+
+    async def close(self):
+        """
+        Close the session that belongs to the running event loop.
+        """
+        session = self._sessions.pop(asyncio.get_running_loop(), None)
+        if session is not None:
+            await session.close()
+
+
+_transport: AsyncTransport = None
+
+
+def get_async_transport() -> AsyncTransport:
+    """
+    Return the process-wide async transport, creating it on first use.
+    """
+    global _transport  # pylint: disable=global-statement
+    if _transport is None:
+        _transport = AsyncTransport()
+    return _transport
+
+
+def set_async_transport(transport) -> None:
+    """
+    Replace the process-wide async transport.
+    """
+    global _transport  # pylint: disable=global-statement
+    _transport = transport
+
+
+async def send_api_request(token: str,
+                           uri: str,
+                           method: str = 'GET',
+                           body: str = None,
+                           body_type: str = const.CONTENT_TYPE_GENERAL,
+                           raw: bool = None) -> dict:
+    """
+    Async version of `sonetel.utilities.send_api_request`. Takes the same parameters and returns the same dicts.
+    ``token`` can also be an `AsyncAuth` instance.
+    """
+
+    # Checks
+    if not token:
+        raise e.SonetelException('"token" is a required parameter')
+    if not uri:
+        raise e.SonetelException('"uri" is a required parameter')
+    _require_aiohttp()
+
+    try:
+        provider = None
+        if not isinstance(token, str):
+            provider = token
+            token = provider.get_access_token()
+            if provider.needs_refresh():
+                token = await provider.refresh(stale_token=token)
+
+        request_header = {
+            "Authorization": "Bearer " + token,
+            "Content-Type": body_type,
+            "User-Agent": f'Sonetel Python Package - v{const.PKG_VERSION}'
+        }
+
+        r = await get_async_transport().request(
+            method=method,
+            url=uri,
+            headers=request_header,
+            data=body,
+        )
+
+        # The token was rejected: refresh it once and try again.
+        if r.status_code == 401 and provider is not None:
+            request_header["Authorization"] = "Bearer " + await provider.refresh(stale_token=token)
+            r = await get_async_transport().request(
+                method=method,
+                url=uri,
+                headers=request_header,
+                data=body,
+            )
+    except e.DeadlineExceededException as err:
+        return {'status': 'failed', 'error': 'DeadlineExceeded', 'message': err}
+    except aiohttp.ClientConnectionError as err:
+        return {'status': 'failed', 'error': 'ConnectionError', 'message': err}
+    except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+        return {'status': 'failed', 'error': 'RequestException', 'message': err}
+
+    if r.status_code >= 400:
+        return {'status': 'failed', 'error': 'HTTPError', 'message': r.text}
+
+    if r.status_code == 200:
+        if raw is None:
+            raw = codec.is_raw()
+        return r.content if raw else r.json()
+
+    return None
+
+
+class AsyncAuth(Auth):
+    """
+    Async authentication class. Unlike `Auth`, creating the object doesn't fetch a token -
+    await `create_token()` first. The background refresh runs as a task on the event loop that created the token.
+    """
+    def __init__(self,
+                 username: str,
+                 password: str,
+                 refresh_lead_time: int = 300,
+                 background_refresh: bool = True):  # pylint: disable=super-init-not-called
+        self._Auth__username = username
+        self._Auth__password = password
+        self.refresh_lead_time = refresh_lead_time
+        self.background_refresh = background_refresh
+        self.token_store = None
+
+        self._refresh_lock = None
+        self._refresh_timer = None
+
+    def _schedule_refresh(self, delay: float = None):
+        if not self.background_refresh:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+        if delay is None:
+            delay = self._refresh_delay()
+        stale_token = self._access_token
+        self._refresh_timer = loop.call_later(
+            max(delay, 0), lambda: loop.create_task(self._background_refresh(stale_token))
+        )
+
+    async def _background_refresh(self, stale_token: str):
+        try:
+            await self.refresh(stale_token=stale_token)
+        except e.SonetelException:
+            self._schedule_refresh(delay=30)
+
+    def get_access_token(self):
+        """
+        Returns the access token without refreshing it. Use `refresh()` to get a new one.
+        """
+        return self._access_token if hasattr(self, '_access_token') else False
+
+    async def refresh(self, stale_token: str = None) -> str:
+        """
+        Refresh the access token and return the new one. See `Auth.refresh()`.
+        """
+        if self._refresh_lock is None:
+            self._refresh_lock = asyncio.Lock()
+
+        async with self._refresh_lock:
+            if stale_token is not None and stale_token != self._access_token:
+                return self._access_token
+
+            started = monotonic()
+            try:
+                token = await self.create_token(grant_type='refresh_token')
+                if 'access_token' not in token:
+                    token = await self.create_token()
+                    if 'access_token' not in token:
+                        raise e.AuthException(f"Unable to refresh the access token: {token.get('message')}")
+            except e.AuthException as err:
+                _token_refreshed(started, err)
+                raise
+            _token_refreshed(started)
+
+            return self._access_token
+
+    async def create_token(self,
+                           refresh_token: str = '',
+                           grant_type: str = 'password',
+                           refresh: str = 'yes',
+                           ):
+        """
+        Create or refresh the API access token. See `Auth.create_token()`.
+        """
+        body = self._prepare_token_body(refresh_token=refresh_token, grant_type=grant_type, refresh=refresh)
+        _require_aiohttp()
+
+        try:
+            req = await get_async_transport().request(
+                method='post',
+                url=const.API_URI_AUTH,
+                data=body,
+                headers={'Content-Type': const.CONTENT_TYPE_AUTH},
+                auth=(const.CONST_JWT_USER, const.CONST_JWT_PASS),
+            )
+        except e.DeadlineExceededException as err:
+            return {'status': 'failed', 'error': 'DeadlineExceeded', 'message': err}
+        except aiohttp.ClientConnectionError as err:
+            return {'status': 'failed', 'error': 'ConnectionError', 'message': err}
+        except asyncio.TimeoutError:
+            return {'status': 'failed', 'error': 'Timeout', 'message': 'Operation timed out. Please try again.'}
+
+        if req.status_code == 200:
+            response_json = req.json()
+            self._set_tokens(response_json)
+            return response_json
+        return {'status': 'failed', 'error': 'Unknown error', 'message': req.text}
+
+
+class AsyncAccount(Account):
+    """
+    Async version of `sonetel.Account`.
+    """
+
+    async def get(self, typed: bool = False) -> dict:
+        response = await send_api_request(token=self._token, uri=self._url, method='get',
+                                          raw=False if typed else None)
+        return models.AccountModel.from_response(response) if typed else response
+
+    async def update(self, name: str = '', language: str = '', timezone: str = '') -> dict:
+        body = self._update_body(name=name, language=language, timezone=timezone)
+        if len(body) == 0:
+            return util.prepare_error(
+                code=const.ERR_ACCOUNT_UPDATE_BODY_EMPTY,
+                message='request body cannot be empty'
+            )
+        return await send_api_request(token=self._token, uri=self._url, method='put', body=dumps(body))
+
+    async def get_balance(self, currency: bool = False) -> str:
+        response = await send_api_request(token=self._token, uri=self._url, method='get', raw=False)
+        return self._format_balance(response, currency)
+
+
+class AsyncCall(Call):
+    """
+    Async version of `sonetel.Call`.
+    """
+
+    async def callback(self, num1: str, num2: str, cli1: str = 'automatic', cli2: str = 'automatic'):
+        if num1 and num2:
+            return await send_api_request(
+                token=self._token,
+                uri=self._url,
+                method='post',
+                body=dumps(self._callback_body(num1, num2, cli1, cli2))
+            )
+        return util.prepare_error(
+            code=const.ERR_CALLBACK_NUM_EMPTY,
+            message='num1 & num2 are required to make a call.'
+        )
+
+
+class AsyncPhoneNumber(PhoneNumber):
+    """
+    Async version of `sonetel.PhoneNumber`.
+    """
+
+    async def get(self, e164only: bool = True, number: str = '', typed: bool = False) -> dict:
+        url = self._url
+
+        if not isinstance(number, str):
+            number = str(number)
+
+        if number:
+            if not is_e164(number):
+                return util.prepare_error(
+                    code=const.ERR_NUM_NOT_E164,
+                    message=f'"{number}" is not a valid e164 number'
+                )
+            url += number
+
+        api_response = await send_api_request(token=self._token, uri=url, raw=False)
+        response = self._format_numbers(api_response, e164only)
+        return models.PhoneNumberSubscriptionModel.from_response(response) if typed and not e164only else response
+
+    async def add(self, number: str) -> dict:
+        if not isinstance(number, str):
+            number = str(number)
+
+        if not is_e164(number):
+            return util.prepare_error(
+                code=const.ERR_NUM_NOT_E164,
+                message=f'"{number}" is not a valid e164 number'
+            )
+
+        return await send_api_request(
+            token=self._token,
+            uri=self._url,
+            method='post',
+            body=dumps({"phnum": number})
+        )
+
+    async def delete(self, number: str):
+        if not isinstance(number, str):
+            number = str(number)
+
+        if not is_e164(number):
+            return util.prepare_error(
+                code=const.ERR_NUM_NOT_E164,
+                message=f'"{number}" is not a valid e164 number'
+            )
+
+        return await send_api_request(token=self._token, uri=f'{self._url}{number}', method='delete')
+
+    async def update(self, number: str, connect_to_type: str, connect_to) -> dict:
+        if not number:
+            return util.prepare_error(
+                code=const.ERR_NUM_UPDATE_EMPTY,
+                message='number is required to update call settings'
+            )
+        if not connect_to:
+            return util.prepare_error(
+                code=const.ERR_NUM_UPDATE_EMPTY,
+                message='connect_to is required to update call settings'
+            )
+        if connect_to_type not in const.CONST_CONNECT_TO_TYPES:
+            return util.prepare_error(
+                code=const.ERR_NUM_UPDATE_EMPTY,
+                message=f'invalid connect_to_type value - {connect_to_type}'
+            )
+
+        body = {
+            "connect_to_type": connect_to_type,
+            "connect_to": connect_to
+        }
+        return await send_api_request(
+            token=self._token,
+            uri=f'{self._url}{number}',
+            method='put',
+            body=dumps(body)
+        )
+
+    async def add_many(self, numbers: list, max_workers: int = 8) -> dict:
+        return await self._run_many(*self._prepare_many(numbers, self._add_job), max_workers)
+
+    async def delete_many(self, numbers: list, max_workers: int = 8) -> dict:
+        return await self._run_many(*self._prepare_many(numbers, self._delete_job), max_workers)
+
+    async def update_many(self, updates: list, max_workers: int = 8) -> dict:
+        return await self._run_many(*self._prepare_many(updates, self._update_job), max_workers)
+
+    async def _run_many(self, jobs: list, invalid: dict, duplicates: list, max_workers: int) -> dict:
+        slots = asyncio.Semaphore(max(max_workers, 1))
+
+        async def send(job):
+            _, url, method, body = job
+            async with slots:
+                return await send_api_request(token=self._token, uri=url, method=method, body=body, raw=False)
+
+        results = await asyncio.gather(*(send(job) for job in jobs))
+        return self._sort_results(jobs, results, invalid, duplicates)
+
+
+def _window_records(result: tuple, previous_ids: set, typed: bool):
+    """
+    Collect the recordings of one window, see `Recording._window_items()`. Returns the recordings and their IDs.
+    """
+    records = []
+    items = Recording._window_items(  # pylint: disable=protected-access
+        result, previous_ids, models.RecordingModel if typed else None
+    )
+    try:
+        while True:
+            records.append(next(items))
+    except StopIteration as stop:
+        ids = stop.value
+    return records, ids
+
+
+class AsyncRecording(Recording):
+    """
+    Async version of `sonetel.Recording`. `iter()` returns an async generator: ``async for rec in recording.iter(...)``.
+
+    `download()` and `download_many()` write files with blocking I/O, so they run `sonetel.Recording` on the event
+    loop's default executor, in the context of the call. With an `AsyncAuth` as the token, it is refreshed first
+    if it is about to expire.
+    """
+
+    async def get(self,
+                  start_time: str = None,
+                  end_time: str = None,
+                  file_access_details: bool = False,
+                  voice_call_details: bool = False,
+                  rec_id: str = None,
+                  typed: bool = False
+                  ):
+        url = self._get_url(
+            start_time=start_time,
+            end_time=end_time,
+            file_access_details=file_access_details,
+            voice_call_details=voice_call_details,
+            rec_id=rec_id
+        )
+        response = await send_api_request(token=self._token, uri=url, method='get', raw=False if typed else None)
+        return models.RecordingModel.from_response(response) if typed else response
+
+    async def _iter_windows(self, windows, parallelism: int, file_access_details: bool, voice_call_details: bool,
+                            typed: bool, context):
+        pending = deque()
+        previous_ids = set()
+
+        async def fetch(window_start, window_end):
+            url = self._get_url(
+                start_time=window_start,
+                end_time=window_end,
+                file_access_details=file_access_details,
+                voice_call_details=voice_call_details,
+                rec_id=None
+            )
+            return window_start, window_end, await send_api_request(token=self._token, uri=url, raw=False)
+
+        try:
+            for window_start, window_end in windows:
+                # A task runs in a copy of the context it was created in.
+                pending.append(context.run(asyncio.ensure_future, fetch(window_start, window_end)))
+                if len(pending) > parallelism:
+                    records, previous_ids = _window_records(await pending.popleft(), previous_ids, typed)
+                    for rec in records:
+                        yield rec
+            while pending:
+                records, previous_ids = _window_records(await pending.popleft(), previous_ids, typed)
+                for rec in records:
+                    yield rec
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def delete(self, rec_id: str) -> dict:
+        return await send_api_request(token=self._token, uri=f'{self._url}/{rec_id}', method='delete')
+
+    async def download(self, rec_id: str = None, path: str = None, recording: dict = None,
+                       chunk_size: int = 65536) -> dict:
+        return await self._in_executor(Recording.download, rec_id=rec_id, path=path, recording=recording,
+                                       chunk_size=chunk_size)
+
+    async def download_many(self,
+                            recordings,
+                            directory: str = '.',
+                            max_workers: int = 8,
+                            manifest: str = 'manifest.json',
+                            chunk_size: int = 65536) -> dict:
+        return await self._in_executor(Recording.download_many, recordings=recordings, directory=directory,
+                                       max_workers=max_workers, manifest=manifest, chunk_size=chunk_size)
+
+    async def _in_executor(self, method, **kwargs):
+        """
+        Run a blocking `Recording` method on the default executor, in a copy of the current context.
+        """
+        token = self._token
+        if not isinstance(token, str):
+            provider = token
+            token = provider.get_access_token()
+            if provider.needs_refresh():
+                token = await provider.refresh(stale_token=token)
+        context = copy_context()
+        call = partial(context.run, method, Recording(access_token=token), **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(None, call)
+
+
+class AsyncUser(User):
+    """
+    Async version of `sonetel.User`.
+    """
+
+    async def get(self, all_users: bool = False, userid: str = '', typed: bool = False):
+        if not util.is_valid_token(self._decoded_token):
+            return False
+        url = self._get_url(all_users=all_users, userid=userid)
+        response = await send_api_request(token=self._token, uri=url, method='get', raw=False if typed else None)
+        return models.UserModel.from_response(response) if typed else response
+
+    async def add(self,
+                  email: str,
+                  f_name: str,
+                  l_name: str,
+                  password: str,
+                  user_type: str = 'regular'
+                  ) -> dict:
+        error = self._check_new_user(email=email, f_name=f_name, l_name=l_name, password=password)
+        if error:
+            return error
+
+        body = {
+            "user_fname": f_name,
+            "user_lname": l_name,
+            "email": email,
+            "password": password,
+            "type": user_type
+        }
+        return await send_api_request(token=self._token, uri=self._url, method='post', body=dumps(body))
+
+    async def delete(self, userid: str):
+        if not userid:
+            return util.prepare_error(
+                code=const.ERR_USED_ID_EMPTY,
+                message='user id cannot be empty'
+            )
+        return await send_api_request(token=self._token, uri=self._url + userid, method='delete')
+
+
+class AsyncVoiceApp(VoiceApp):
+    """
+    Async version of `sonetel.VoiceApp`.
+    """
+
+    async def get(self, app_id: str = None, typed: bool = False):
+        url = f"{self._url}/{app_id}" if app_id else self._url
+        response = await send_api_request(token=self._token, uri=url, raw=False if typed else None)
+        return models.VoiceAppModel.from_response(response) if typed else response
+
+    async def delete(self, app_id: str):
+        return await send_api_request(token=self._token, uri=f"{self._url}/{app_id}", method="DELETE")
@@ -9,32 +9,78 @@ It contains the following methods:
 * `get_access_token()` - Get the access token.
 * `get_decoded_token()` - Get the decoded access token.
 * `get_refresh_token()` - Get the refresh token.
+* `refresh()` - Refresh the access token. Concurrent callers share a single refresh request.
+
+The access token is refreshed automatically `refresh_lead_time` seconds before it expires, both from a background
+timer and whenever `get_access_token()` sees a token that is about to expire.
+
+Pass a `sonetel.tokenstore.FileTokenStore` as `token_store` to share tokens between processes and restarts.
 
 """
 # Import Packages.
-from jwt import decode
-import requests
+import threading
+from collections import namedtuple
+from contextlib import nullcontext
+from time import monotonic, time
 from . import _constants as const
+from . import codec
+from . import deadline
 from . import exceptions as e
+from . import hooks
+from . import utilities as util
+
+# Replaced as a whole, so readers on other threads never see the access token of one response with the refresh
+# token or expiry of another.
+_Tokens = namedtuple('_Tokens', ('access', 'refresh', 'decoded', 'created'))
+
+
+def _token_refreshed(started: float, error: Exception = None):
+    """
+    Emit a token_refresh event, if anybody listens.
+    """
+    if hooks.active:
+        hooks.emit(hooks.TOKEN_REFRESH, 'POST', const.API_URI_AUTH, group=const.GROUP_AUTH,
+                   status=None if error else 200, duration=monotonic() - started, error=error)
+
 
 class Auth:
     """
     Authentication class. Create, refresh and fetch tokens.
+
+    Args:
+        username (str): The email address of the Sonetel user.
+        password (str): The password of the Sonetel user.
+        refresh_lead_time (int): Optional. Refresh the access token this many seconds before it expires. Defaults to 300.
+        background_refresh (bool): Optional. Refresh the access token from a background timer, so callers never wait for it. Defaults to True.
+        token_store (FileTokenStore): Optional. Reuse tokens stored by other processes, and store new ones for them.
+            Only one process creates or refreshes the token at a time.
     """
-    def __init__(self, username: str, password: str):
+    def __init__(self,
+                 username: str,
+                 password: str,
+                 refresh_lead_time: int = 300,
+                 background_refresh: bool = True,
+                 token_store=None):
 
         self.__username = username
         self.__password = password
+        self.refresh_lead_time = refresh_lead_time
+        self.background_refresh = background_refresh
+        self.token_store = token_store
+        self._store_key = token_store.key_for(username, const.API_URI_AUTH) if token_store is not None else None
 
-        # Get access token from API
-        token = self.create_token()
-        self._access_token = token['access_token']
-        self._refresh_token = token['refresh_token']
-        self._decoded_token = decode(
-            self._access_token,
-            audience='api.sonetel.com',
-            options={"verify_signature": False}
-        )
+        self._refresh_lock = threading.Lock()
+        self._refresh_timer = None
+
+        with self._store_lock():
+            if self._load_stored_tokens() is not None:
+                return
+
+            # Get access token from API
+            token = self.create_token()
+            if 'access_token' not in token:
+                raise e.AuthException(f"Unable to create an access token: {token.get('message')}")
+            self._set_tokens(token)
 
     def create_token(self,
                      refresh_token: str = '',
@@ -55,24 +101,10 @@ class Auth:
         :return: dict. The access token and refresh token if the request was processed successfully. If the request failed, the error message is returned.
         """
 
-        # Checks
-        if grant_type.strip().lower() not in const.CONST_TYPES_GRANT:
-            raise e.AuthException(f'invalid grant: {grant_type}')
-
-        if refresh.strip().lower() not in const.CONST_TYPES_REFRESH:
-            refresh = 'yes'
-
-        if grant_type.strip().lower() == 'refresh_token' and not refresh_token:
-            refresh_token = self._refresh_token
-
-        # Prepare the request body.
-        body = f"grant_type={grant_type}&refresh={refresh}"
+        import requests  # pylint: disable=import-outside-toplevel
+        from . import transport  # pylint: disable=import-outside-toplevel
 
-        # Add the refresh token to the request body if passed to the function
-        if grant_type == 'refresh_token':
-            body += f"&refresh_token={refresh_token}"
-        else:
-            body += f"&username={self.__username}&password={self.__password}"
+        body = self._prepare_token_body(refresh_token=refresh_token, grant_type=grant_type, refresh=refresh)
 
         # Prepare the request
         auth = (const.CONST_JWT_USER, const.CONST_JWT_PASS)
@@ -80,14 +112,18 @@ class Auth:
 
         # Send the request
         try:
-            req = requests.post(
+            req = transport.get_transport().request(
+                method='post',
                 url=const.API_URI_AUTH,
                 data=body,
                 headers=headers,
                 auth=auth,
-                timeout=60
             )
             req.raise_for_status()
+        except e.DeadlineExceededException as err:
+            return {'status': 'failed', 'error': 'DeadlineExceeded', 'message': err}
+        except e.CircuitOpenException as err:
+            return {'status': 'failed', 'error': 'CircuitOpen', 'message': err}
         except requests.exceptions.ConnectionError as err:
             return {'status': 'failed', 'error': 'ConnectionError', 'message': err}
         except requests.exceptions.Timeout:
@@ -97,20 +133,202 @@ class Auth:
 
         # Check the response and handle accordingly.
         if req.status_code == requests.codes.ok:  # pylint: disable=no-member
-            response_json = req.json()
+            response_json = codec.loads(req.content)
 
-            if refresh_token and grant_type == 'refresh_token':
-                self._access_token = response_json["access_token"]
-                self._refresh_token = response_json["refresh_token"]
-                self._decoded_token = decode(
-                    self._access_token,
-                    audience='api.sonetel.com',
-                    options={"verify_signature": False}
-                )
+            if grant_type == 'refresh_token':
+                self._set_tokens(response_json)
 
             return response_json
         return {'status': 'failed', 'error': 'Unknown error', 'message': req.text}
 
+    def _prepare_token_body(self, refresh_token: str, grant_type: str, refresh: str) -> str:
+        """
+        Validate the token request parameters and return the form encoded request body.
+        """
+        # Checks
+        if grant_type.strip().lower() not in const.CONST_TYPES_GRANT:
+            raise e.AuthException(f'invalid grant: {grant_type}')
+
+        if refresh.strip().lower() not in const.CONST_TYPES_REFRESH:
+            refresh = 'yes'
+
+        if grant_type.strip().lower() == 'refresh_token' and not refresh_token:
+            refresh_token = self._refresh_token
+
+        # Prepare the request body.
+        body = f"grant_type={grant_type}&refresh={refresh}"
+
+        # Add the refresh token to the request body if passed to the function
+        if grant_type == 'refresh_token':
+            body += f"&refresh_token={refresh_token}"
+        else:
+            body += f"&username={self.__username}&password={self.__password}"
+
+        return body
+
+    def _set_tokens(self, response_json: dict, persist: bool = True):
+        """
+        Store the access and refresh tokens from a successful token response, and save them to the token store.
+        """
+        access_token = response_json["access_token"]
+        tokens = self._tokens = _Tokens(
+            access=access_token,
+            refresh=response_json.get("refresh_token", getattr(self, '_refresh_token', '')),
+            decoded=util.decode_token(access_token),
+            created=time(),
+        )
+        if persist and getattr(self, 'token_store', None) is not None:
+            self.token_store.save(self._store_key, {
+                'access_token': tokens.access,
+                'refresh_token': tokens.refresh,
+            })
+        self._schedule_refresh()
+
+    @property
+    def _access_token(self) -> str:
+        return self._tokens.access
+
+    @property
+    def _refresh_token(self) -> str:
+        return self._tokens.refresh
+
+    @property
+    def _decoded_token(self) -> dict:
+        return self._tokens.decoded
+
+    def _store_lock(self):
+        """
+        The token store lock for this user, or a no-op without a token store.
+        """
+        if getattr(self, 'token_store', None) is None:
+            return nullcontext()
+        return self.token_store.lock(self._store_key)
+
+    def _load_stored_tokens(self):
+        """
+        Adopt the tokens from the token store if they are newer than ours. A stored token that is about to expire
+        is refreshed with its refresh token. Returns the access token, or None if the caller has to create one.
+        """
+        if getattr(self, 'token_store', None) is None:
+            return None
+        stored = self.token_store.load(self._store_key)
+        if not stored or stored.get('access_token') == getattr(self, '_access_token', None):
+            return None
+
+        try:
+            decoded = util.decode_token(stored['access_token'])
+        except Exception:  # pylint: disable=broad-except
+            return None
+        if self._refresh_delay(decoded, created=time()) > 0:
+            self._set_tokens(stored, persist=False)
+            return self._access_token
+
+        if stored.get('refresh_token'):
+            token = self.create_token(refresh_token=stored['refresh_token'], grant_type='refresh_token')
+            if 'access_token' in token:
+                return self._access_token
+        return None
+
+    def _refresh_delay(self, decoded: dict = None, created: float = None) -> float:
+        """
+        Seconds until the access token, or the given decoded token, should be refreshed. The lead time is capped
+        at half the token's lifetime so that short-lived tokens are not refreshed on every use.
+        """
+        if decoded is None:
+            _, _, decoded, created = self._tokens
+        exp = decoded['exp']
+        lifetime = exp - decoded.get('iat', created)
+        lead_time = min(self.refresh_lead_time, lifetime / 2)
+        return exp - lead_time - time()
+
+    def _schedule_refresh(self, delay: float = None):
+        """
+        (Re)start the background refresh timer.
+        """
+        if not getattr(self, 'background_refresh', False):
+            return
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+        if delay is None:
+            delay = self._refresh_delay()
+        self._refresh_timer = threading.Timer(max(delay, 0), self._background_refresh, args=(self._access_token,))
+        self._refresh_timer.daemon = True
+        self._refresh_timer.start()
+
+    def _background_refresh(self, stale_token: str):
+        try:
+            self.refresh(stale_token=stale_token)
+        except e.SonetelException:
+            # Try again shortly; callers fall back to refreshing on demand.
+            self._schedule_refresh(delay=min(30, max(self._decoded_token['exp'] - time(), 1)))
+
+    def needs_refresh(self) -> bool:
+        """
+        Return True if the access token expires within the refresh lead time.
+        """
+        return self._refresh_delay() <= 0
+
+    def refresh(self, stale_token: str = None) -> str:
+        """
+        Refresh the access token and return the new one.
+
+        Only one refresh request is sent at a time. Callers that pass the token they saw as ``stale_token`` and
+        find it was already replaced by another thread get the new token without sending a request. With a token
+        store, a token refreshed by another process is used in the same way. If the refresh token is rejected, a
+        new token is created with the username and password instead.
+
+        Examples:
+            >>> from sonetel import Auth
+            >>> auth = Auth('username', 'password')
+            >>> token = auth.refresh()
+
+        Args:
+            stale_token (str): Optional. The access token the caller found to be expired or rejected.
+
+        Returns:
+            str: The current access token.
+        """
+        if not self._refresh_lock.acquire(timeout=deadline.lock_timeout()):
+            raise e.DeadlineExceededException('the latency budget was used up waiting for the token refresh')
+        try:
+            return self._refresh(stale_token)
+        finally:
+            self._refresh_lock.release()
+
+    def _refresh(self, stale_token: str = None) -> str:
+        """
+        Refresh the access token. Called with the refresh lock held.
+        """
+        with self._store_lock():
+            if stale_token is not None and stale_token != self._access_token:
+                return self._access_token
+
+            started = monotonic()
+            try:
+                # Another process may have refreshed the token already.
+                if self._load_stored_tokens() is None:
+                    token = self.create_token(grant_type='refresh_token')
+                    if 'access_token' not in token:
+                        token = self.create_token()
+                        if 'access_token' not in token:
+                            raise e.AuthException(f"Unable to refresh the access token: {token.get('message')}")
+                        self._set_tokens(token)
+            except e.SonetelException as err:
+                _token_refreshed(started, err)
+                raise
+            _token_refreshed(started)
+
+            return self._access_token
+
+    def close(self):
+        """
+        Stop the background refresh timer.
+        """
+        self.background_refresh = False
+        if self._refresh_timer is not None:
+            self._refresh_timer.cancel()
+            self._refresh_timer = None
+
     def get_access_token(self):
         """
         Returns the access token.
@@ -127,7 +345,12 @@ class Auth:
         Returns:
             access_token (str): The access token that can be used to access other account resources.
         """
-        return self._access_token if hasattr(self, '_access_token') else False
+        if not hasattr(self, '_access_token'):
+            return False
+        token = self._access_token
+        if self.needs_refresh():
+            token = self.refresh(stale_token=token)
+        return token
 
     def get_refresh_token(self):
         """
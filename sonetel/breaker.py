@@ -0,0 +1,233 @@
+"""
+# Circuit breaker
+
+Stop sending requests to an endpoint group while the Sonetel API is failing, instead of letting every call wait
+for its timeout. Each endpoint group has its own circuit:
+
+* `closed` - Requests are sent. The outcomes of the last ``window`` requests are kept, and once at least
+  ``min_calls`` are known the circuit opens if too many of them failed or were slow.
+* `open` - Requests fail at once with `CircuitOpenException`; `send_api_request` returns it as a
+  ``CircuitOpen`` error. After ``open_duration`` seconds the circuit is half-open.
+* `half_open` - Up to ``probes`` requests are sent as probes. If they all succeed the circuit closes, and if one
+  fails or is slow it opens again. Other requests fail as if the circuit were open.
+
+Connection errors, timeouts and 5xx responses are failures. Other responses, including 4xx, are successes.
+
+Every change of state is published as a `circuit_state` event, see `sonetel.hooks`.
+
+Examples:
+    >>> from sonetel import hooks, transport
+    >>> from sonetel.breaker import CircuitBreaker
+    >>> transport.configure(circuit_breaker=CircuitBreaker(failure_rate=0.5, slow_call_duration=5, open_duration=30))
+    >>> hooks.subscribe(hooks.CIRCUIT_STATE, lambda event: print(event.group, event.state))
+    >>> transport.get_transport().circuit_breaker.state('callback')
+    'closed'
+
+"""
+import threading
+from collections import deque
+from time import monotonic
+from . import _constants as const
+from . import exceptions as e
+from . import hooks
+
+CLOSED = const.CIRCUIT_CLOSED
+OPEN = const.CIRCUIT_OPEN
+HALF_OPEN = const.CIRCUIT_HALF_OPEN
+
+DEFAULT_GROUPS = (
+    const.GROUP_AUTH,
+    const.GROUP_CALLBACK,
+    const.GROUP_NUMBERS,
+    const.GROUP_RECORDINGS,
+    const.GROUP_USERS,
+    const.GROUP_VOICEAPPS,
+    const.GROUP_ACCOUNT,
+)
+
+
+class _Circuit:
+    """
+    State and recent outcomes of one endpoint group.
+    """
+    __slots__ = ('state', 'outcomes', 'failures', 'slow', 'opened_at', 'probing', 'probe_since', 'passed',
+                 'rejected', 'opened')
+
+    def __init__(self, window: int):
+        self.state = CLOSED
+        self.outcomes = deque(maxlen=window)
+        self.failures = 0
+        self.slow = 0
+        self.opened_at = 0.0
+        self.probing = 0
+        self.probe_since = 0.0
+        self.passed = 0
+        self.rejected = 0
+        self.opened = 0
+
+    def add(self, failed: bool, slow: bool):
+        if len(self.outcomes) == self.outcomes.maxlen:
+            old_failed, old_slow = self.outcomes[0]
+            self.failures -= old_failed
+            self.slow -= old_slow
+        self.outcomes.append((failed, slow))
+        self.failures += failed
+        self.slow += slow
+
+    def clear(self):
+        self.outcomes.clear()
+        self.failures = 0
+        self.slow = 0
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker per endpoint group.
+
+    Args:
+        failure_rate (float): Optional. Share of failed requests in the window that opens the circuit. Defaults to 0.5.
+        slow_call_rate (float): Optional. Share of slow requests in the window that opens the circuit. Defaults to 0.8.
+        slow_call_duration (float): Optional. Seconds after which a request counts as slow. Defaults to 10.
+        window (int): Optional. Number of recent requests the rates are computed over. Defaults to 50.
+        min_calls (int): Optional. Minimum number of requests in the window before the circuit can open. Defaults to 20.
+        open_duration (float): Optional. Seconds the circuit stays open before probe requests are sent. Defaults to 30.
+        probes (int): Optional. Number of successful probe requests that close the circuit again. Defaults to 3.
+        groups (tuple): Optional. The endpoint groups with a circuit. Defaults to all groups except `other`.
+    """
+    def __init__(self,
+                 failure_rate: float = 0.5,
+                 slow_call_rate: float = 0.8,
+                 slow_call_duration: float = 10.0,
+                 window: int = 50,
+                 min_calls: int = 20,
+                 open_duration: float = 30.0,
+                 probes: int = 3,
+                 groups: tuple = DEFAULT_GROUPS):
+
+        self.failure_rate = failure_rate
+        self.slow_call_rate = slow_call_rate
+        self.slow_call_duration = slow_call_duration
+        self.window = window
+        self.min_calls = min_calls
+        self.open_duration = open_duration
+        self.probes = probes
+        self.groups = frozenset(groups)
+
+        self._lock = threading.Lock()
+        self._circuits = {}
+
+    def _get_circuit(self, group: str) -> _Circuit:
+        circuit = self._circuits.get(group)
+        if circuit is None:
+            circuit = self._circuits[group] = _Circuit(self.window)
+        return circuit
+
+    def _set_state(self, circuit: _Circuit, state: str, now: float):
+        circuit.state = state
+        if state == OPEN:
+            circuit.opened_at = now
+            circuit.opened += 1
+        elif state == HALF_OPEN:
+            circuit.probing = 0
+            circuit.passed = 0
+        else:
+            circuit.clear()
+
+    def before(self, method: str, url: str, group: str):
+        """
+        Check the circuit of ``group`` before a request is sent. Raises `CircuitOpenException` if the request may
+        not be sent.
+        """
+        if group not in self.groups:
+            return
+        changed = rejected = False
+        with self._lock:
+            circuit = self._get_circuit(group)
+            if circuit.state == CLOSED:
+                return
+            now = monotonic()
+            if circuit.state == OPEN:
+                if now - circuit.opened_at < self.open_duration:
+                    rejected = True
+                else:
+                    self._set_state(circuit, HALF_OPEN, now)
+                    changed = True
+            if circuit.state == HALF_OPEN:
+                # Probes that never reported back, e.g. because the latency budget ran out, free their place.
+                if circuit.probing >= self.probes and now - circuit.probe_since < self.open_duration:
+                    rejected = True
+                else:
+                    if circuit.probing >= self.probes:
+                        circuit.probing = 0
+                    circuit.probing += 1
+                    circuit.probe_since = now
+            if rejected:
+                circuit.rejected += 1
+
+        if changed and hooks.active:
+            hooks.emit(hooks.CIRCUIT_STATE, method, url, group=group, state=HALF_OPEN)
+        if rejected:
+            raise e.CircuitOpenException(f'the circuit of the {group} endpoints is open')
+
+    def record(self, method: str, url: str, group: str, duration: float, failed: bool):
+        """
+        Report the outcome of a request sent after `before()`.
+        """
+        if group not in self.groups:
+            return
+        slow = duration >= self.slow_call_duration
+        state = None
+        with self._lock:
+            circuit = self._get_circuit(group)
+            if circuit.state == HALF_OPEN:
+                circuit.probing = max(circuit.probing - 1, 0)
+                if failed or slow:
+                    state = OPEN
+                else:
+                    circuit.passed += 1
+                    if circuit.passed >= self.probes:
+                        state = CLOSED
+            elif circuit.state == CLOSED:
+                circuit.add(failed, slow)
+                calls = len(circuit.outcomes)
+                if calls >= self.min_calls and (circuit.failures >= self.failure_rate * calls or
+                                                circuit.slow >= self.slow_call_rate * calls):
+                    state = OPEN
+            if state is not None:
+                self._set_state(circuit, state, monotonic())
+
+        if state is not None and hooks.active:
+            hooks.emit(hooks.CIRCUIT_STATE, method, url, group=group, duration=duration, state=state)
+
+    def state(self, group: str) -> str:
+        """
+        The current state of the circuit of ``group``. An open circuit whose ``open_duration`` has passed is
+        reported as open until the next request probes it.
+        """
+        with self._lock:
+            circuit = self._circuits.get(group)
+            return CLOSED if circuit is None else circuit.state
+
+    def reset(self):
+        """
+        Close all circuits and forget their recent outcomes.
+        """
+        with self._lock:
+            self._circuits.clear()
+
+    def stats(self) -> dict:
+        """
+        State, failure and slow call rates, rejected requests and the number of times the circuit opened, per
+        endpoint group.
+        """
+        with self._lock:
+            return {
+                group: {
+                    'state': circuit.state,
+                    'calls': len(circuit.outcomes),
+                    'failure_rate': circuit.failures / len(circuit.outcomes) if circuit.outcomes else 0.0,
+                    'slow_call_rate': circuit.slow / len(circuit.outcomes) if circuit.outcomes else 0.0,
+                    'rejected': circuit.rejected,
+                    'opened': circuit.opened,
+                } for group, circuit in self._circuits.items()
+            }
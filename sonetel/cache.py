@@ -0,0 +1,134 @@
+"""
+# Response cache
+
+Opt-in, in-memory cache for GET responses, used by the transport. Each endpoint group has its own time to live.
+Once an entry is older than its TTL it is still returned for ``stale_while_revalidate`` seconds while a
+background request fetches a fresh copy.
+
+Successful POST, PUT and DELETE requests invalidate the cached responses of the resource they changed, so for
+example `PhoneNumber.add()` clears the cached result of `PhoneNumber.get()`.
+
+Examples:
+    >>> from sonetel import transport
+    >>> from sonetel.cache import ResponseCache
+    >>> transport.configure(cache=ResponseCache(ttl={'account': 30, 'numbers': 300}, max_entries=512))
+    >>> transport.get_transport().cache.stats()
+    {'entries': 0, 'hits': 0, 'stale_hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+
+"""
+import threading
+from collections import OrderedDict
+from time import monotonic
+from . import _constants as const
+
+DEFAULT_TTL = {
+    const.GROUP_ACCOUNT: 30,
+    const.GROUP_NUMBERS: 60,
+    const.GROUP_USERS: 60,
+    const.GROUP_VOICEAPPS: 60,
+}
+
+
+class ResponseCache:
+    """
+    LRU cache of GET responses with a TTL per endpoint group.
+
+    Args:
+        ttl (dict): Optional. Maps an endpoint group to the number of seconds its responses stay fresh. Groups that
+            are not listed are not cached. Defaults to 30 seconds for `account` and 60 seconds for `numbers`, `users` and `voiceapps`.
+        max_entries (int): Optional. Maximum number of cached responses. Defaults to 1024.
+        stale_while_revalidate (float): Optional. Seconds after the TTL during which a stale response is returned while it
+            is refreshed in the background. Defaults to 30.
+    """
+    def __init__(self, ttl: dict = None, max_entries: int = 1024, stale_while_revalidate: float = 30.0):
+        self.ttl = dict(DEFAULT_TTL if ttl is None else ttl)
+        self.max_entries = max_entries
+        self.stale_while_revalidate = stale_while_revalidate
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._revalidating = set()
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def cacheable(self, group: str) -> bool:
+        return bool(self.ttl.get(group))
+
+    def get(self, key, group: str):
+        """
+        Look up a response.
+
+        Returns:
+            tuple: ``(response, revalidate)``. ``response`` is None on a miss. ``revalidate`` is True if the
+            response is stale and the caller should refresh it in the background.
+        """
+        now = monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None, False
+
+            response, stored = entry
+            age = now - stored
+            ttl = self.ttl.get(group, 0)
+            if age <= ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return response, False
+
+            if age <= ttl + self.stale_while_revalidate:
+                self._entries.move_to_end(key)
+                self.stale_hits += 1
+                revalidate = key not in self._revalidating
+                self._revalidating.add(key)
+                return response, revalidate
+
+            del self._entries[key]
+            self.misses += 1
+            return None, False
+
+    def set(self, key, response):
+        with self._lock:
+            self._revalidating.discard(key)
+            self._entries[key] = (response, monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def revalidation_failed(self, key):
+        with self._lock:
+            self._revalidating.discard(key)
+
+    def invalidate(self, prefix: str):
+        """
+        Remove all responses whose URL starts with ``prefix``.
+        """
+        with self._lock:
+            stale = [key for key in self._entries if key[0].startswith(prefix)]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """
+        Hit, miss and eviction counters.
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'stale_hits': self.stale_hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
@@ -2,7 +2,7 @@
 Make phone calls using Sonetel's CallBack API.
 """
 # Import Packages.
-from json import dumps
+from .codec import dumps
 from . import utilities as util
 from . import _constants as const
 from . import exceptions as e
@@ -18,7 +18,7 @@ class Call(util.Resource):
         {'statusCode': 202, "response": {"session_id": "1234567890"}}
     
     Args:
-        access_token (str, required): The access token generated from the Auth class.
+        access_token (str or Auth, required): The access token generated from the Auth class, or the Auth instance itself to always use its current token.
         app_name (str, optional): The name of the app that is making the request. Defaults to 'PythonSonetelPackage'. This is used to identify the app in logs.
     
     Returns:
@@ -68,21 +68,25 @@ class Call(util.Resource):
         if num1 and num2:
 
             # Initiate the callback
-            body = {
-                "app_id": f'{self._app_name}-{const.PKG_VERSION}',
-                "call1": num1,
-                "call2": num2,
-                "show_1": cli1,
-                "show_2": cli2
-            }
-
             return util.send_api_request(
                 token=self._token,
                 uri=self._url,
                 method='post',
-                body=dumps(body)
+                body=dumps(self._callback_body(num1, num2, cli1, cli2))
             )
         return util.prepare_error(
             code=const.ERR_CALLBACK_NUM_EMPTY,
             message='num1 & num2 are required to make a call.'
         )
+
+    def _callback_body(self, num1: str, num2: str, cli1: str, cli2: str) -> dict:
+        """
+        Build the request body for callback().
+        """
+        return {
+            "app_id": f'{self._app_name}-{const.PKG_VERSION}',
+            "call1": num1,
+            "call2": num2,
+            "show_1": cli1,
+            "show_2": cli2
+        }
@@ -0,0 +1,134 @@
+"""
+# JSON codec
+
+Encode request bodies and decode response bodies. The fastest available codec is picked on first use: `orjson` if
+it is installed, otherwise the standard library `json` module. `codec.name` is the name of the codec in use and
+`codec.CODECS` maps the available names to their ``(dumps, loads)`` functions.
+
+It contains the following functions:
+
+* `dumps()` - Encode an object as JSON.
+* `loads()` - Decode a JSON document.
+* `set_codec()` - Select a codec by name, or install your own pair of functions.
+* `raw_responses()` - Context manager that makes API calls return the undecoded response body.
+
+Examples:
+    >>> from sonetel import codec
+    >>> codec.name
+    'orjson'
+    >>> with codec.raw_responses():
+    ...     body = Recording(access_token=token).get()
+    >>> type(body)
+    <class 'bytes'>
+
+"""
+import json
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+_raw = ContextVar('sonetel_raw_responses', default=False)
+
+# Chosen on first use, so that importing the package doesn't pay for importing orjson.
+_codecs = None
+_name = None
+_dumps = _loads = None
+
+
+def _json_dumps(obj) -> str:
+    return json.dumps(obj)
+
+
+def _available() -> dict:
+    """
+    The codecs that can be used, by name. Looks for orjson the first time it is called.
+    """
+    global _codecs  # pylint: disable=global-statement
+    if _codecs is None:
+        codecs = {'json': (_json_dumps, json.loads)}
+        try:
+            import orjson  # pylint: disable=import-outside-toplevel
+        except ImportError:  # pragma: no cover
+            pass
+        else:
+            codecs['orjson'] = (orjson.dumps, orjson.loads)
+        _codecs = codecs
+    return _codecs
+
+
+def _select_default():
+    global _name, _dumps, _loads  # pylint: disable=global-statement
+    codecs = _available()
+    _name = 'orjson' if 'orjson' in codecs else 'json'
+    _dumps, _loads = codecs[_name]
+
+
+def __getattr__(attr):
+    # ``name`` and ``CODECS`` are resolved on access, see above.
+    if attr == 'name':
+        if _name is None:
+            _select_default()
+        return _name
+    if attr == 'CODECS':
+        return _available()
+    raise AttributeError(f'module {__name__!r} has no attribute {attr!r}')
+
+
+def dumps(obj):
+    """
+    Encode an object as JSON. Returns str or bytes, depending on the codec.
+    """
+    if _dumps is None:
+        _select_default()
+    return _dumps(obj)
+
+
+def loads(data):
+    """
+    Decode a JSON document given as str or bytes.
+    """
+    if _loads is None:
+        _select_default()
+    return _loads(data)
+
+
+def set_codec(codec_name: str = None, encoder=None, decoder=None):
+    """
+    Select the codec used by the package.
+
+    Args:
+        codec_name (str): Optional. 'orjson' or 'json'.
+        encoder (callable): Optional. A custom function that encodes an object as JSON. Used with ``decoder`` instead of ``codec_name``.
+        decoder (callable): Optional. A custom function that decodes a JSON document.
+    """
+    global _name, _dumps, _loads  # pylint: disable=global-statement
+    if codec_name is not None:
+        codecs = _available()
+        if codec_name not in codecs:
+            raise ValueError(f'codec not available: {codec_name}')
+        _name = codec_name
+        _dumps, _loads = codecs[codec_name]
+    elif encoder is not None and decoder is not None:
+        _name = 'custom'
+        _dumps, _loads = encoder, decoder
+    else:
+        raise ValueError('pass a codec name, or both an encoder and a decoder')
+
+
+def is_raw() -> bool:
+    """
+    Return True inside a `raw_responses()` block.
+    """
+    return _raw.get()
+
+
+@contextmanager
+def raw_responses():
+    """
+    Within this block, methods that return the API response as is return the response body as bytes,
+    without decoding it. Useful when the response is passed on unchanged.
+    """
+    token = _raw.set(True)
+    try:
+        yield
+    finally:
+        _raw.reset(token)
@@ -0,0 +1,173 @@
+"""
+# Adaptive concurrency
+
+Limit the number of requests in flight per endpoint group, and let the limit follow what the Sonetel API can
+sustain instead of fixing it up front. The limiter uses additive increase, multiplicative decrease (AIMD):
+
+* While requests come back within ``tolerance`` times the baseline latency - the lowest latency seen recently -
+  and the limit is in use, the limit grows by ``increase`` every round trip.
+* When latency rises above that, a request times out, or the API answers 429 or 503, the limit is multiplied by
+  ``decrease``, at most once per round trip.
+
+Requests over the limit wait for a free slot, bounded by the latency budget of the call. The limiter sits in the
+transport, so it applies to every request: the bulk helpers such as `PhoneNumber.add_many()` and
+`Recording.download_many()`, the `sonetel.dialer.Dialer` and single `Call.callback()` calls. Their own worker
+counts are then an upper bound only.
+
+Examples:
+    >>> from sonetel import transport
+    >>> from sonetel.concurrency import AdaptiveLimiter
+    >>> transport.configure(pool_maxsize=64, concurrency_limiter=AdaptiveLimiter(initial_limit=10, max_limit=64))
+    >>> PhoneNumber(access_token=auth).update_many(numbers, connect_to_type='user', connect_to=user_id)
+    >>> transport.get_transport().concurrency_limiter.limit('numbers')
+    23
+
+"""
+import threading
+from time import monotonic
+from . import exceptions as e
+
+
+class _Limit:
+    """
+    Limit and latency baseline of one endpoint group.
+    """
+    __slots__ = ('limit', 'in_flight', 'waiting', 'min_rtt', 'candidate_rtt', 'samples', 'last_decrease', 'drops',
+                 'changed')
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.in_flight = 0
+        self.waiting = 0
+        self.min_rtt = None
+        self.candidate_rtt = float('inf')
+        self.samples = 0
+        self.last_decrease = 0.0
+        self.drops = 0
+        self.changed = threading.Condition()
+
+
+class AdaptiveLimiter:
+    """
+    AIMD concurrency limit per endpoint group.
+
+    Args:
+        initial_limit (int): Optional. Limit of a group before any request has completed. Defaults to 10.
+        min_limit (int): Optional. The limit never drops below this. Defaults to 1.
+        max_limit (int): Optional. The limit never grows above this. Defaults to 100.
+        increase (float): Optional. Added to the limit every round trip while latency is stable. Defaults to 1.
+        decrease (float): Optional. Factor applied to the limit when latency rises or requests are dropped. Defaults to 0.7.
+        tolerance (float): Optional. Latency up to this multiple of the baseline counts as stable. Defaults to 2.
+        window (int): Optional. Number of requests after which the baseline latency is measured again, so it can
+            follow a lasting change in latency. Defaults to 200.
+    """
+    def __init__(self,
+                 initial_limit: int = 10,
+                 min_limit: int = 1,
+                 max_limit: int = 100,
+                 increase: float = 1.0,
+                 decrease: float = 0.7,
+                 tolerance: float = 2.0,
+                 window: int = 200):
+
+        self.initial_limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.tolerance = tolerance
+        self.window = window
+
+        self._lock = threading.Lock()
+        self._limits = {}
+
+    def _get_limit(self, group: str) -> _Limit:
+        limit = self._limits.get(group)
+        if limit is None:
+            with self._lock:
+                limit = self._limits.setdefault(group, _Limit(float(self.initial_limit)))
+        return limit
+
+    def limit(self, group: str) -> int:
+        """
+        The current number of requests to ``group`` allowed in flight.
+        """
+        return int(self._get_limit(group).limit)
+
+    def acquire(self, group: str, timeout: float = None) -> bool:
+        """
+        Wait until a request to ``group`` may be sent. Returns True if the request had to wait.
+        Raises `DeadlineExceededException` if no slot is free within ``timeout`` seconds.
+        """
+        state = self._get_limit(group)
+        with state.changed:
+            if state.in_flight < int(state.limit):
+                state.in_flight += 1
+                return False
+            state.waiting += 1
+            try:
+                if not state.changed.wait_for(lambda: state.in_flight < int(state.limit),
+                                              None if timeout is None else max(timeout, 0.0)):
+                    raise e.DeadlineExceededException('the latency budget was used up waiting for a request slot')
+            finally:
+                state.waiting -= 1
+            state.in_flight += 1
+            return True
+
+    def release(self, group: str):
+        """
+        Free the slot of a finished request.
+        """
+        state = self._get_limit(group)
+        with state.changed:
+            state.in_flight -= 1
+            state.changed.notify()
+
+    def record(self, group: str, rtt: float, dropped: bool = False):
+        """
+        Adjust the limit of ``group`` to the outcome of a request.
+
+        Args:
+            group (str): The endpoint group.
+            rtt (float): Seconds from sending the request to receiving the response headers.
+            dropped (bool): Optional. The request timed out or was answered with 429 or 503.
+        """
+        state = self._get_limit(group)
+        now = monotonic()
+        with state.changed:
+            if not dropped:
+                state.samples += 1
+                state.candidate_rtt = min(state.candidate_rtt, rtt)
+                if state.min_rtt is None or rtt < state.min_rtt:
+                    state.min_rtt = rtt
+                if state.samples >= self.window:
+                    state.min_rtt = state.candidate_rtt
+                    state.candidate_rtt = float('inf')
+                    state.samples = 0
+
+            if dropped or rtt > state.min_rtt * self.tolerance:
+                state.drops += dropped
+                if now - state.last_decrease >= rtt:
+                    state.limit = max(state.limit * self.decrease, self.min_limit)
+                    state.last_decrease = now
+            elif state.in_flight * 2 >= state.limit:
+                grown = min(state.limit + self.increase / state.limit, self.max_limit)
+                if int(grown) > int(state.limit):
+                    state.changed.notify(int(grown) - int(state.limit))
+                state.limit = grown
+
+    def stats(self) -> dict:
+        """
+        Limit, requests in flight and waiting, baseline latency in seconds and dropped requests, per endpoint group.
+        """
+        with self._lock:
+            limits = dict(self._limits)
+        return {
+            group: {
+                'limit': int(state.limit),
+                'in_flight': state.in_flight,
+                'waiting': state.waiting,
+                'min_rtt': state.min_rtt,
+                'drops': state.drops,
+            } for group, state in limits.items()
+        }
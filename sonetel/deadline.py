@@ -0,0 +1,111 @@
+"""
+# Deadlines and timeouts
+
+Give a call a latency budget. Inside a `budget()` block, or on a resource returned by `Resource.within()`, every
+step of an API call is bounded by the time that is left: waiting for the rate limiter, waiting for a token refresh,
+the connect and read timeouts of each attempt and the backoff between retries. Once the budget is used up the call
+fails fast with `DeadlineExceededException` - returned as an error dict by the resource methods, like other request
+failures - instead of queueing work that can no longer finish in time.
+
+Budgets nest: an inner budget can only shorten the deadline of the outer one. They follow the call into the
+`sonetel.futures` executor, the bulk helpers and asyncio tasks.
+
+Connect and read timeouts are set per endpoint group with `Timeouts`, passed to the transport.
+
+Examples:
+    >>> from sonetel import Account, deadline, transport
+    >>> transport.configure(timeouts=deadline.Timeouts(connect=3, read=30, groups={'recordings': (3, 120)}))
+    >>> with deadline.budget(2.0):
+    ...     Account(access_token=auth).get()
+    >>> Account(access_token=auth).within(0.5).get_balance()
+    '12.34'
+
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic
+from . import exceptions as e
+
+# Absolute deadline, in monotonic() seconds, of the current call. None means no deadline.
+_deadline = ContextVar('sonetel_deadline', default=None)
+
+DEFAULT_CONNECT_TIMEOUT = 10.0
+DEFAULT_READ_TIMEOUT = 60.0
+
+
+class Timeouts:
+    """
+    Connect and read timeouts per endpoint group, in seconds.
+
+    Args:
+        connect (float): Optional. Default connect timeout. Defaults to 10.
+        read (float): Optional. Default read timeout, i.e. the longest wait for the server between two bytes of the response. Defaults to 60.
+        groups (dict): Optional. Maps an endpoint group to a ``(connect, read)`` tuple that overrides the defaults.
+    """
+    def __init__(self, connect: float = DEFAULT_CONNECT_TIMEOUT, read: float = DEFAULT_READ_TIMEOUT,
+                 groups: dict = None):
+        self.connect = connect
+        self.read = read
+        self.groups = dict(groups or {})
+
+    def for_group(self, group: str) -> tuple:
+        """
+        Return the ``(connect, read)`` timeouts of an endpoint group.
+        """
+        return self.groups.get(group, (self.connect, self.read))
+
+
+@contextmanager
+def budget(seconds: float):
+    """
+    Run the block with a latency budget of ``seconds``. If a budget is already running, the earlier deadline wins.
+    """
+    deadline = monotonic() + seconds
+    current = _deadline.get()
+    token = _deadline.set(deadline if current is None else min(current, deadline))
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float:
+    """
+    Seconds left in the current budget, or None if there is no budget.
+    """
+    deadline = _deadline.get()
+    return None if deadline is None else deadline - monotonic()
+
+
+def check(what: str = 'the request'):
+    """
+    Raise `DeadlineExceededException` if the current budget is used up.
+    """
+    left = remaining()
+    if left is not None and left <= 0:
+        raise e.DeadlineExceededException(f'the latency budget was used up before {what}')
+
+
+def cap(timeout):
+    """
+    Shorten a requests style timeout - a number or a ``(connect, read)`` tuple - to the remaining budget.
+    """
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise e.DeadlineExceededException('the latency budget was used up before the request was sent')
+    if timeout is None:
+        return left
+    if isinstance(timeout, tuple):
+        return tuple(left if value is None else min(value, left) for value in timeout)
+    return min(timeout, left)
+
+
+def lock_timeout() -> float:
+    """
+    Timeout for ``Lock.acquire()``: the remaining budget, or -1 to wait without a limit.
+    """
+    left = remaining()
+    return -1 if left is None else max(left, 0.0)
+
@@ -0,0 +1,220 @@
+"""
+# Dialer
+
+Run callback campaigns with `Call.callback()`. The dialer takes an iterable of call pairs, places callbacks at a
+target rate with a cap on the number of requests in flight, and keeps a minimum interval between two calls to the
+same `num1`, so no single agent is flooded. Pairs that can't be placed yet are set aside and the next pair is dialed.
+
+If a state file is given, every placed pair is appended to it and a restarted run skips those pairs. A pair that
+appears more than once in the input is dialed once; the repeats are counted as duplicates.
+
+Examples:
+    >>> from sonetel import Call
+    >>> from sonetel.dialer import Dialer
+    >>> dialer = Dialer(Call(access_token=auth), rate=5, max_in_flight=20, per_destination_interval=60,
+    ...                 state_file='campaign.state', on_progress=print)
+    >>> stats = dialer.run([('+46101234567', '+12125551234'), ('+46101234568', '+12125551235')])
+    >>> stats['placed']
+    2
+
+"""
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic, sleep
+from .ratelimit import TokenBucket
+
+
+def _pair_key(pair: tuple) -> str:
+    return f'{pair[0]}|{pair[1]}'
+
+
+def _percentile(values: list, percent: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * percent / 100), len(values) - 1)]
+
+
+class Dialer:
+    """
+    Callback campaign dialer.
+
+    Args:
+        call (Call): The `Call` resource used to place the callbacks.
+        rate (float): Optional. Target number of callbacks started per second. Defaults to 1.
+        max_in_flight (int): Optional. Maximum number of callback requests in flight. Defaults to 10.
+        per_destination_interval (float): Optional. Minimum number of seconds between two callbacks to the same `num1`. Defaults to 0.
+        state_file (str): Optional. File that records placed pairs, so that a restarted run skips them.
+        max_deferred (int): Optional. Maximum number of pairs set aside while their `num1` is being paced. Defaults to 1000.
+        on_progress (callable): Optional. Called with the current stats after every callback. If it raises, no
+            further pairs are dialed and `run()` raises the exception once the callbacks in flight have finished.
+    """
+    def __init__(self,
+                 call,
+                 rate: float = 1.0,
+                 max_in_flight: int = 10,
+                 per_destination_interval: float = 0.0,
+                 state_file: str = None,
+                 max_deferred: int = 1000,
+                 on_progress=None):
+
+        self.call = call
+        self.max_in_flight = max_in_flight
+        self.per_destination_interval = per_destination_interval
+        self.state_file = state_file
+        self.max_deferred = max_deferred
+        self.on_progress = on_progress
+
+        self._bucket = TokenBucket(rate=rate, burst=1)
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._lock = threading.Lock()
+        self._last_call = {}
+        self._latencies = deque(maxlen=10000)
+        self._deferred = deque()
+        self._started = None
+        self._in_flight = 0
+        self._seen = set()
+        self._progress_error = None
+
+        self.placed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.duplicates = 0
+        self.errors = deque(maxlen=100)
+
+    def _load_state(self) -> set:
+        if not self.state_file or not os.path.exists(self.state_file):
+            return set()
+        with open(self.state_file, encoding='utf-8') as file:
+            return {line.rstrip('\n') for line in file if line.strip()}
+
+    def _ready_at(self, num1: str) -> float:
+        last = self._last_call.get(num1)
+        return 0.0 if last is None else last + self.per_destination_interval
+
+    def _next_pair(self, pairs, done: set):
+        """
+        Return the next pair that may be dialed now, or None when all pairs have been dialed.
+        """
+        while True:
+            now = monotonic()
+            for _ in range(len(self._deferred)):
+                pair = self._deferred.popleft()
+                if self._ready_at(pair[0]) <= now:
+                    return pair
+                self._deferred.append(pair)
+
+            if len(self._deferred) < self.max_deferred:
+                pair = next(pairs, None)
+                if pair is not None:
+                    pair = tuple(pair)
+                    key = _pair_key(pair)
+                    if key in done:
+                        self.skipped += 1
+                        continue
+                    if key in self._seen:
+                        self.duplicates += 1
+                        continue
+                    self._seen.add(key)
+                    if self._ready_at(pair[0]) <= now:
+                        return pair
+                    self._deferred.append(pair)
+                    continue
+
+            if not self._deferred:
+                return None
+            sleep(max(min(self._ready_at(pair[0]) for pair in self._deferred) - now, 0.001))
+
+    def _place(self, pair: tuple, state):
+        started = monotonic()
+        try:
+            result = self.call.callback(*pair)
+        except Exception as err:  # pylint: disable=broad-except
+            result = {'status': 'failed', 'error': type(err).__name__, 'message': err}
+        latency = monotonic() - started
+
+        with self._lock:
+            self._in_flight -= 1
+            self._latencies.append(latency)
+            if isinstance(result, dict) and result.get('status') == 'failed':
+                self.failed += 1
+                self.errors.append((pair, result))
+            else:
+                self.placed += 1
+                if state is not None:
+                    state.write(_pair_key(pair) + '\n')
+                    state.flush()
+        self._slots.release()
+
+        if self.on_progress is not None:
+            try:
+                self.on_progress(self.stats())
+            except Exception as err:  # pylint: disable=broad-except
+                with self._lock:
+                    if self._progress_error is None:
+                        self._progress_error = err
+
+    def run(self, pairs) -> dict:
+        """
+        Dial all pairs and return the final stats.
+
+        Args:
+            pairs: An iterable of ``(num1, num2)`` or ``(num1, num2, cli1, cli2)`` tuples. It is consumed lazily,
+                so it can be a generator reading from a file or queue.
+
+        Returns:
+            dict: The final stats, see `stats()`.
+
+        Raises:
+            Exception: The first exception raised by ``on_progress``.
+        """
+        done = self._load_state()
+        self._deferred = deque()
+        self._seen = set()
+        self._progress_error = None
+        self._started = monotonic()
+
+        state = open(self.state_file, 'a', encoding='utf-8') if self.state_file else None
+        try:
+            with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+                pairs = iter(pairs)
+                while self._progress_error is None:
+                    pair = self._next_pair(pairs, done)
+                    if pair is None:
+                        break
+                    self._slots.acquire()
+                    self._bucket.acquire()
+                    self._last_call[pair[0]] = monotonic()
+                    with self._lock:
+                        self._in_flight += 1
+                    pool.submit(self._place, pair, state)
+        finally:
+            if state is not None:
+                state.close()
+
+        if self._progress_error is not None:
+            raise self._progress_error
+        return self.stats()
+
+    def stats(self) -> dict:
+        """
+        Progress of the current run: callbacks placed and failed, pairs skipped because the state file lists them,
+        repeated pairs, throughput in calls per second and callback request latency percentiles in seconds.
+        """
+        with self._lock:
+            latencies = list(self._latencies)
+            placed, failed, in_flight = self.placed, self.failed, self._in_flight
+        elapsed = monotonic() - self._started if self._started else 0.0
+        return {
+            'placed': placed,
+            'failed': failed,
+            'skipped': self.skipped,
+            'duplicates': self.duplicates,
+            'in_flight': in_flight,
+            'throughput': (placed + failed) / elapsed if elapsed else 0.0,
+            'latency_p50': _percentile(latencies, 50),
+            'latency_p90': _percentile(latencies, 90),
+            'latency_p99': _percentile(latencies, 99),
+        }
@@ -33,3 +33,21 @@ class UserException(SonetelException):
     Errors related to the User API
     """
     pass
+
+class RecordingException(SonetelException):
+    """
+    Errors related to call recordings
+    """
+    pass
+
+class DeadlineExceededException(SonetelException):
+    """
+    The latency budget of a call was used up
+    """
+    pass
+
+class CircuitOpenException(SonetelException):
+    """
+    The circuit breaker of the endpoint group is open and the request was not sent
+    """
+    pass
@@ -0,0 +1,123 @@
+"""
+# Futures
+
+Run API calls concurrently from synchronous code. Every resource method has a ``submit_`` variant that runs the
+method on a shared, bounded thread pool and returns a `concurrent.futures.Future`, e.g. `Account.submit_get()`,
+`PhoneNumber.submit_update()` or `Call.submit_callback()`. The variants take the same arguments as the method.
+
+The thread pool has as many workers as the transport keeps connections per host, so every worker can reuse a
+pooled connection. Submitting blocks while ``max_pending`` calls are queued or running.
+
+It contains the following functions:
+
+* `submit()` - Run any function on the shared executor.
+* `gather()` - Wait for futures and return their results in the order they were given.
+* `configure()` - Replace the shared executor with one of a different size.
+
+Examples:
+    >>> from sonetel import PhoneNumber, futures
+    >>> numbers = PhoneNumber(access_token=auth)
+    >>> pending = [numbers.submit_update(n, 'user', user_id) for n in ('+46101234567', '+46101234568')]
+    >>> futures.gather(pending)
+    [{'status': 'success', ...}, {'status': 'success', ...}]
+
+"""
+import threading
+import concurrent.futures
+from contextvars import copy_context
+
+
+class BoundedExecutor:
+    """
+    Thread pool that blocks `submit()` while ``max_pending`` calls are queued or running.
+
+    Args:
+        max_workers (int): Optional. Number of worker threads. Defaults to the ``pool_maxsize`` of the shared transport.
+        max_pending (int): Optional. Maximum number of calls queued or running. Defaults to 100 times ``max_workers``.
+    """
+    def __init__(self, max_workers: int = None, max_pending: int = None):
+        if max_workers is None:
+            from .transport import get_transport  # pylint: disable=import-outside-toplevel
+            max_workers = getattr(get_transport(), 'pool_maxsize', 10)
+        self.max_workers = max_workers
+        self.max_pending = max_pending if max_pending is not None else max_workers * 100
+
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='sonetel')
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    def submit(self, func, *args, **kwargs):
+        """
+        Schedule ``func(*args, **kwargs)`` and return a `Future`. The call runs in a copy of the caller's context,
+        so a latency budget or `codec.raw_responses()` block carries over.
+        """
+        self._slots.acquire()
+        try:
+            future = self._executor.submit(copy_context().run, func, *args, **kwargs)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait)
+
+
+_executor: BoundedExecutor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> BoundedExecutor:
+    """
+    Return the shared executor, creating it on first use.
+    """
+    global _executor  # pylint: disable=global-statement
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = BoundedExecutor()
+    return _executor
+
+
+def configure(max_workers: int = None, max_pending: int = None) -> BoundedExecutor:
+    """
+    Replace the shared executor. Calls already submitted to the previous one still complete.
+    """
+    global _executor  # pylint: disable=global-statement
+    executor = BoundedExecutor(max_workers=max_workers, max_pending=max_pending)
+    with _executor_lock:
+        previous, _executor = _executor, executor
+    if previous is not None:
+        previous.shutdown(wait=False)
+    return executor
+
+
+def submit(func, *args, **kwargs):
+    """
+    Run ``func(*args, **kwargs)`` on the shared executor and return a `Future`.
+    """
+    return get_executor().submit(func, *args, **kwargs)
+
+
+def gather(futures, timeout: float = None, return_exceptions: bool = False) -> list:
+    """
+    Wait for all futures and return their results in the order of ``futures``.
+
+    Args:
+        futures: An iterable of `Future` objects.
+        timeout (float): Optional. Maximum number of seconds to wait for all of them. Raises
+            ``concurrent.futures.TimeoutError`` if they are not all done in time.
+        return_exceptions (bool): Optional. Return exceptions in place of results instead of raising the first one. Defaults to False.
+    """
+    futures = list(futures)
+    not_done = concurrent.futures.wait(futures, timeout=timeout).not_done
+    if not_done:
+        raise concurrent.futures.TimeoutError(f'{len(not_done)} of {len(futures)} futures are not done')
+
+    results = []
+    for future in futures:
+        error = future.exception()
+        if error is not None and not return_exceptions:
+            raise error
+        results.append(error if error is not None else future.result())
+    return results
@@ -0,0 +1,222 @@
+"""
+# Hedged requests
+
+Opt-in request hedging for GET requests. If no response has arrived after a delay, a second identical request is
+sent on another pooled connection and whichever response arrives first is used. This cuts the tail latency caused by
+the occasional slow upstream response.
+
+The delay is a percentile of the recent response times of the endpoint group, so only the slowest requests are
+hedged. A budget caps the number of extra requests: every GET earns ``budget`` hedges, up to ``max_burst``, so with
+the default of 0.05 hedging adds at most about 5% to the request volume.
+
+The losing request can't be aborted once it was sent; its response is discarded and its connection released as soon
+as it arrives.
+
+Hedged requests wait on a thread pool of ``max_workers`` threads, so that the caller can return the first response.
+This never limits the number of concurrent GETs: when every thread is busy, a request is sent on the caller's
+thread and isn't hedged. The hedge shares the scheduler and concurrency limiter slot of the request it hedges and
+doesn't take one of its own; the budget bounds how many extra requests that adds.
+
+Examples:
+    >>> from sonetel import transport
+    >>> from sonetel.hedge import HedgePolicy
+    >>> transport.configure(hedge_policy=HedgePolicy(percentile=95, budget=0.05))
+    >>> transport.get_transport().hedge_policy.stats()
+    {'requests': 0, 'hedged': 0, 'hedge_wins': 0, 'budget_exhausted': 0, 'saturated': 0}
+
+"""
+import threading
+import concurrent.futures
+from collections import deque
+from time import monotonic
+from . import _constants as const
+
+
+class HedgePolicy:
+    """
+    When to hedge a GET request.
+
+    Args:
+        percentile (float): Optional. Hedge once a request is slower than this percentile of recent requests to the same endpoint group. Defaults to 95.
+        min_delay (float): Optional. Lower bound of the hedging delay in seconds. Defaults to 0.05.
+        max_delay (float): Optional. Upper bound of the hedging delay in seconds. Also used until enough requests were seen. Defaults to 1.
+        budget (float): Optional. Hedges earned per GET request. Defaults to 0.05.
+        max_burst (float): Optional. Maximum number of hedges that can be saved up. Defaults to 10.
+        groups (tuple): Optional. Endpoint groups to hedge. Defaults to all groups except `auth`.
+        window (int): Optional. Number of recent response times per group the percentile is computed from. Defaults to 256.
+        max_workers (int): Optional. Threads used to run hedged requests. Requests beyond this are sent without a hedge. Defaults to 32.
+    """
+    def __init__(self,
+                 percentile: float = 95,
+                 min_delay: float = 0.05,
+                 max_delay: float = 1.0,
+                 budget: float = 0.05,
+                 max_burst: float = 10,
+                 groups: tuple = None,
+                 window: int = 256,
+                 max_workers: int = 32):
+
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.max_burst = max_burst
+        self.groups = tuple(groups) if groups is not None else None
+        self.window = window
+        self.max_workers = max_workers
+
+        self._lock = threading.Lock()
+        self._latencies = {}
+        self._delays = {}
+        self._credit = 0.0
+        self._executor = None
+        self._workers = threading.BoundedSemaphore(max_workers)
+
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_exhausted = 0
+        self.saturated = 0
+
+    def applies(self, method: str, group: str, kwargs: dict) -> bool:
+        """
+        Return True if a request may be hedged: a GET that isn't streamed, to one of the hedged groups.
+        """
+        if method.upper() != 'GET' or kwargs.get('stream') or group == const.GROUP_AUTH:
+            return False
+        return self.groups is None or group in self.groups
+
+    def delay(self, group: str) -> float:
+        """
+        Seconds to wait for a response before sending the hedge.
+        """
+        with self._lock:
+            delay = self._delays.get(group)
+            if delay is None:
+                latencies = self._latencies.get(group)
+                if not latencies or len(latencies) < 20:
+                    return self.max_delay
+                ordered = sorted(latencies)
+                delay = ordered[min(int(len(ordered) * self.percentile / 100), len(ordered) - 1)]
+                delay = self._delays[group] = min(max(delay, self.min_delay), self.max_delay)
+            return delay
+
+    def record(self, group: str, duration: float):
+        """
+        Add the response time of a request to its group's window.
+        """
+        with self._lock:
+            latencies = self._latencies.get(group)
+            if latencies is None:
+                latencies = self._latencies[group] = deque(maxlen=self.window)
+            latencies.append(duration)
+            # Recompute the percentile every 16 requests rather than on every request.
+            if len(latencies) % 16 == 0:
+                self._delays.pop(group, None)
+
+    def _take_budget(self) -> bool:
+        with self._lock:
+            if self._credit >= 1:
+                self._credit -= 1
+                self.hedged += 1
+                return True
+            self.budget_exhausted += 1
+            return False
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix='sonetel-hedge'
+                )
+            return self._executor
+
+    def _submit(self, send):
+        """
+        Run ``send()`` on the thread pool if a thread is free. Returns the future, or None if all threads are busy.
+        """
+        if not self._workers.acquire(blocking=False):
+            return None
+
+        def run():
+            try:
+                return send()
+            finally:
+                self._workers.release()
+        try:
+            return self._get_executor().submit(run)
+        except BaseException:
+            self._workers.release()
+            raise
+
+    def run(self, send, group: str):
+        """
+        Call ``send()`` and, if it is slower than the hedging delay, call it a second time. Returns the first
+        response, or raises the first request's exception if both fail.
+        """
+        with self._lock:
+            self.requests += 1
+            self._credit = min(self._credit + self.budget, self.max_burst)
+
+        started = monotonic()
+        primary = self._submit(send)
+        if primary is None:
+            with self._lock:
+                self.saturated += 1
+            try:
+                return send()
+            finally:
+                self.record(group, monotonic() - started)
+        primary.add_done_callback(lambda _: self.record(group, monotonic() - started))
+
+        try:
+            return primary.result(timeout=self.delay(group))
+        except concurrent.futures.TimeoutError:
+            pass
+
+        if not self._take_budget():
+            return primary.result()
+
+        hedge = self._submit(send)
+        if hedge is None:
+            # No thread is free for the hedge: give the budget back.
+            with self._lock:
+                self._credit += 1
+                self.hedged -= 1
+                self.saturated += 1
+            return primary.result()
+        pending = {primary, hedge}
+        while pending:
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                if future.exception() is None:
+                    for loser in pending:
+                        if not loser.cancel():
+                            loser.add_done_callback(_discard)
+                    if future is hedge:
+                        with self._lock:
+                            self.hedge_wins += 1
+                    return future.result()
+        return primary.result()
+
+    def stats(self) -> dict:
+        """
+        Number of hedgeable requests, hedges sent, hedges that won, hedges skipped because the budget was used up
+        and requests sent without a hedge because every thread was busy.
+        """
+        with self._lock:
+            return {
+                'requests': self.requests,
+                'hedged': self.hedged,
+                'hedge_wins': self.hedge_wins,
+                'budget_exhausted': self.budget_exhausted,
+                'saturated': self.saturated,
+            }
+
+
+def _discard(future):
+    """
+    Release the connection of a response nobody is waiting for.
+    """
+    if not future.cancelled() and future.exception() is None:
+        future.result().close()
@@ -0,0 +1,187 @@
+"""
+# Hooks
+
+Listen to the lifecycle of every request sent by the package, for logging, tracing or metrics. A listener is a
+callable that receives an `Event`. See `sonetel.metrics` for a built-in listener that aggregates latency histograms
+and error rates.
+
+Events:
+
+* `before_send` - An attempt is about to be sent. `bytes` is the size of the request body.
+* `after_response` - A response was received. Carries the status code, the size of the response body and the
+  duration of the attempt.
+* `error` - An attempt raised an exception, e.g. a connection error or a timeout.
+* `retry` - A failed or throttled attempt will be sent again. `duration` is the wait before the next attempt.
+* `token_refresh` - `Auth.refresh()` finished. `error` is set if the refresh failed.
+* `circuit_state` - The circuit breaker of an endpoint group changed state. `state` is the new state and the other
+  fields describe the request that caused the change. See `sonetel.breaker`.
+
+Responses served from the response cache don't send a request and don't emit events.
+
+When no listener is subscribed, the transport only checks `hooks.active` and no events are created.
+
+Examples:
+    >>> from sonetel import hooks
+    >>> def log(event):
+    ...     print(event.method, event.endpoint, event.status, event.duration)
+    >>> hooks.subscribe(hooks.AFTER_RESPONSE, log)
+    >>> Account(access_token=token).get()
+    GET /account/{account_id} 200 0.084
+    >>> hooks.unsubscribe(hooks.AFTER_RESPONSE, log)
+
+"""
+import threading
+from functools import lru_cache
+from urllib.parse import urlsplit
+from . import _constants as const
+
+BEFORE_SEND = const.EVENT_BEFORE_SEND
+AFTER_RESPONSE = const.EVENT_AFTER_RESPONSE
+ERROR = const.EVENT_ERROR
+RETRY = const.EVENT_RETRY
+TOKEN_REFRESH = const.EVENT_TOKEN_REFRESH
+CIRCUIT_STATE = const.EVENT_CIRCUIT_STATE
+EVENTS = (BEFORE_SEND, AFTER_RESPONSE, ERROR, RETRY, TOKEN_REFRESH, CIRCUIT_STATE)
+
+# True while at least one listener is subscribed. Checked before any event is created.
+active = False
+
+# Event name -> tuple of listeners. Tuples are replaced, never modified, so they can be iterated without a lock.
+_listeners = {}
+_lock = threading.Lock()
+
+# The path segment that follows one of these segments is an ID.
+_ID_SEGMENTS = {
+    'account': '{account_id}',
+    'phonenumbersubscription': '{number}',
+    'user': '{user_id}',
+    'voiceapp': '{app_id}',
+    'call-recording': '{recording_id}',
+}
+
+
+@lru_cache(maxsize=1024)
+def endpoint_template(url: str) -> str:
+    """
+    Return the path of an API URL with the IDs replaced by placeholders, e.g.
+    ``/account/{account_id}/phonenumbersubscription/{number}``.
+    """
+    path = urlsplit(url).path
+    template = []
+    previous = None
+    for segment in path.split('/'):
+        if not segment:
+            continue
+        if previous in _ID_SEGMENTS:
+            template.append(_ID_SEGMENTS[previous])
+            previous = None
+        else:
+            template.append(segment)
+            previous = segment
+    template = '/' + '/'.join(template)
+    if path.endswith('/') and template != '/':
+        template += '/'
+    return template
+
+
+class Event:
+    """
+    A request lifecycle event.
+
+    Attributes:
+        name (str): The event name, e.g. ``after_response``.
+        method (str): The HTTP method.
+        endpoint (str): The endpoint template, see `endpoint_template()`.
+        url (str): The full URL of the request.
+        group (str): The endpoint group, see `sonetel.transport.endpoint_group()`.
+        attempt (int): The attempt number, starting at 1.
+        status (int): The response status code, if a response was received.
+        bytes (int): The size of the request body (`before_send`) or of the response body.
+        duration (float): The duration of the attempt in seconds, or the wait before the next attempt for `retry`.
+        error (Exception): The exception, for `error` events and failed retries or token refreshes.
+        state (str): The new circuit state, for `circuit_state` events.
+    """
+    __slots__ = ('name', 'method', 'endpoint', 'url', 'group', 'attempt', 'status', 'bytes', 'duration', 'error',
+                 'state')
+
+    def __init__(self, name: str, method: str, url: str, group: str = None, attempt: int = 1, status: int = None,
+                 bytes: int = None, duration: float = None, error: Exception = None,  # pylint: disable=redefined-builtin
+                 state: str = None):
+        self.name = name
+        self.method = method.upper()
+        self.endpoint = endpoint_template(url)
+        self.url = url
+        self.group = group
+        self.attempt = attempt
+        self.status = status
+        self.bytes = bytes
+        self.duration = duration
+        self.error = error
+        self.state = state
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={getattr(self, name)!r}' for name in self.__slots__ if name != 'url')
+        return f'Event({fields})'
+
+
+def subscribe(event: str, listener):
+    """
+    Call ``listener`` with an `Event` every time ``event`` happens. Returns the listener.
+
+    Exceptions raised by a listener are ignored, so a broken listener never fails a request.
+    """
+    global active  # pylint: disable=global-statement
+    if event not in EVENTS:
+        raise ValueError(f'unknown event: {event}')
+    with _lock:
+        _listeners[event] = _listeners.get(event, ()) + (listener,)
+        active = True
+    return listener
+
+
+def unsubscribe(event: str, listener):
+    """
+    Stop calling ``listener`` for ``event``.
+    """
+    global active  # pylint: disable=global-statement
+    with _lock:
+        listeners = tuple(item for item in _listeners.get(event, ()) if item != listener)
+        if listeners:
+            _listeners[event] = listeners
+        else:
+            _listeners.pop(event, None)
+        active = bool(_listeners)
+
+
+def clear():
+    """
+    Remove all listeners.
+    """
+    global active  # pylint: disable=global-statement
+    with _lock:
+        _listeners.clear()
+        active = False
+
+
+def emit(name: str, method: str, url: str, **fields):
+    """
+    Send an event to its listeners. Does nothing if nobody listens to ``name``.
+
+    Args:
+        name (str): The event name.
+        method (str): The HTTP method.
+        url (str): The URL of the request.
+        **fields: The other `Event` attributes.
+    """
+    listeners = _listeners.get(name)
+    if not listeners:
+        return
+    if fields.get('group') is None:
+        from .transport import endpoint_group  # pylint: disable=import-outside-toplevel
+        fields['group'] = endpoint_group(url)
+    event = Event(name, method, url, **fields)
+    for listener in listeners:
+        try:
+            listener(event)
+        except Exception:  # pylint: disable=broad-except
+            pass
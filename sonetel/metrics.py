@@ -0,0 +1,198 @@
+"""
+# Metrics
+
+Aggregate the request events from `sonetel.hooks` into per-endpoint latency histograms, request and error counts,
+retries and response sizes, and export them in the Prometheus text format.
+
+Requests are grouped by HTTP method and endpoint template, so all numbers share one series, e.g.
+``GET /account/{account_id}/phonenumbersubscription/{number}``. A request counts as an error if it raised an
+exception or was answered with a status code of 400 or above.
+
+Examples:
+    >>> from sonetel.metrics import Metrics
+    >>> metrics = Metrics().attach()
+    >>> Account(access_token=token).get()
+    >>> metrics.stats()['GET /account/{account_id}']['error_rate']
+    0.0
+    >>> print(metrics.prometheus())
+    # HELP sonetel_request_duration_seconds Duration of Sonetel API requests.
+    # TYPE sonetel_request_duration_seconds histogram
+    sonetel_request_duration_seconds_bucket{method="GET",endpoint="/account/{account_id}",le="0.005"} 0
+    ...
+
+"""
+import threading
+from bisect import bisect_left
+from . import hooks
+
+# Upper bounds, in seconds, of the request duration histogram buckets.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class _Series:
+    """
+    Counters of one method and endpoint.
+    """
+    __slots__ = ('buckets', 'sum', 'count', 'statuses', 'errors', 'retries', 'bytes')
+
+    def __init__(self, buckets: int):
+        self.buckets = [0] * (buckets + 1)
+        self.sum = 0.0
+        self.count = 0
+        self.statuses = {}
+        self.errors = 0
+        self.retries = 0
+        self.bytes = 0
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(**labels) -> str:
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + '}'
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metrics:
+    """
+    Request metrics aggregator. Call `attach()` to start collecting.
+
+    Args:
+        buckets (tuple): Optional. Upper bounds of the duration histogram buckets in seconds. Defaults to `DEFAULT_BUCKETS`.
+        prefix (str): Optional. Prefix of the exported metric names. Defaults to ``sonetel``.
+    """
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS, prefix: str = 'sonetel'):
+        self.bucket_bounds = tuple(sorted(buckets))
+        self.prefix = prefix
+
+        self._lock = threading.Lock()
+        self._series = {}
+        self._token_refreshes = {'success': 0, 'failed': 0}
+
+    def attach(self):
+        """
+        Subscribe to the request events. Returns the aggregator.
+        """
+        for event in (hooks.AFTER_RESPONSE, hooks.ERROR, hooks.RETRY, hooks.TOKEN_REFRESH):
+            hooks.subscribe(event, self.record)
+        return self
+
+    def detach(self):
+        """
+        Stop collecting. The metrics collected so far are kept.
+        """
+        for event in (hooks.AFTER_RESPONSE, hooks.ERROR, hooks.RETRY, hooks.TOKEN_REFRESH):
+            hooks.unsubscribe(event, self.record)
+
+    def _get_series(self, event) -> _Series:
+        key = (event.method, event.endpoint)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = _Series(len(self.bucket_bounds))
+        return series
+
+    def record(self, event):
+        """
+        Add an event to the metrics.
+        """
+        with self._lock:
+            if event.name == hooks.TOKEN_REFRESH:
+                self._token_refreshes['failed' if event.error is not None else 'success'] += 1
+                return
+
+            series = self._get_series(event)
+            if event.name == hooks.RETRY:
+                series.retries += 1
+                return
+
+            if event.duration is not None:
+                series.buckets[bisect_left(self.bucket_bounds, event.duration)] += 1
+                series.sum += event.duration
+            series.count += 1
+            status = 'exception' if event.name == hooks.ERROR else str(event.status)
+            series.statuses[status] = series.statuses.get(status, 0) + 1
+            if event.name == hooks.ERROR or (event.status or 0) >= 400:
+                series.errors += 1
+            if event.bytes:
+                series.bytes += event.bytes
+
+    def reset(self):
+        """
+        Discard all collected metrics.
+        """
+        with self._lock:
+            self._series = {}
+            self._token_refreshes = {'success': 0, 'failed': 0}
+
+    def stats(self) -> dict:
+        """
+        Metrics per ``"METHOD endpoint"``: number of requests, errors, error rate, retries, response bytes, the count
+        per status code and the duration histogram, mapping the upper bound of each bucket to a count. Token
+        refreshes are counted under ``token_refreshes``.
+        """
+        with self._lock:
+            result = {}
+            for (method, endpoint), series in self._series.items():
+                result[f'{method} {endpoint}'] = {
+                    'requests': series.count,
+                    'errors': series.errors,
+                    'error_rate': series.errors / series.count if series.count else 0.0,
+                    'retries': series.retries,
+                    'bytes': series.bytes,
+                    'statuses': dict(series.statuses),
+                    'latency': dict(zip(self.bucket_bounds + (float('inf'),), series.buckets)),
+                    'latency_sum': series.sum,
+                }
+            result['token_refreshes'] = dict(self._token_refreshes)
+            return result
+
+    def prometheus(self) -> str:
+        """
+        Return the metrics in the Prometheus text exposition format.
+        """
+        name = self.prefix
+        with self._lock:
+            series = sorted(self._series.items())
+            lines = [
+                f'# HELP {name}_request_duration_seconds Duration of Sonetel API requests.',
+                f'# TYPE {name}_request_duration_seconds histogram',
+            ]
+            for (method, endpoint), item in series:
+                cumulative = 0
+                for bound, count in zip(self.bucket_bounds + ('+Inf',), item.buckets):
+                    cumulative += count
+                    labels = _labels(method=method, endpoint=endpoint, le=bound)
+                    lines.append(f'{name}_request_duration_seconds_bucket{labels} {cumulative}')
+                labels = _labels(method=method, endpoint=endpoint)
+                lines.append(f'{name}_request_duration_seconds_sum{labels} {_number(item.sum)}')
+                lines.append(f'{name}_request_duration_seconds_count{labels} {item.count}')
+
+            lines += [
+                f'# HELP {name}_requests_total Sonetel API requests by status code.',
+                f'# TYPE {name}_requests_total counter',
+            ]
+            for (method, endpoint), item in series:
+                for status, count in sorted(item.statuses.items()):
+                    lines.append(f'{name}_requests_total{_labels(method=method, endpoint=endpoint, status=status)} {count}')
+
+            for metric, help_text, attribute in (
+                    ('request_errors_total', 'Failed Sonetel API requests.', 'errors'),
+                    ('request_retries_total', 'Retried Sonetel API requests.', 'retries'),
+                    ('response_bytes_total', 'Bytes received from the Sonetel API.', 'bytes'),
+            ):
+                lines += [f'# HELP {name}_{metric} {help_text}', f'# TYPE {name}_{metric} counter']
+                for (method, endpoint), item in series:
+                    labels = _labels(method=method, endpoint=endpoint)
+                    lines.append(f'{name}_{metric}{labels} {getattr(item, attribute)}')
+
+            lines += [
+                f'# HELP {name}_token_refreshes_total Access token refreshes.',
+                f'# TYPE {name}_token_refreshes_total counter',
+            ]
+            for result, count in sorted(self._token_refreshes.items()):
+                lines.append(f'{name}_token_refreshes_total{_labels(result=result)} {count}')
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,269 @@
+"""
+# Models
+
+Compact, typed records for API responses. They are an optional alternative to the plain dicts returned by default:
+pass `typed=True` to `Account.get()`, `PhoneNumber.get()`, `Recording.get()`, `Recording.iter()`, `User.get()` or
+`VoiceApp.get()`.
+
+Records use ``__slots__`` instead of a per-record dict, and fields that aren't declared on the class, as well as
+nested objects such as `voice_call_details` and `file_access_details`, are kept as a tuple of values until they are
+accessed. Lists are returned as a `ModelList`, which stores the records column by column and creates a record object
+only when it is accessed. Large lists take well under half the memory of the equivalent dicts.
+
+Examples:
+    >>> recordings = Recording(access_token=token).get(typed=True)['response']
+    >>> recordings[0].call_recording_id
+    'REd2jiyro9azqj'
+    >>> recordings[0].file_access_details
+    Record({'file_download_url': 'https://...'})
+    >>> recordings[0].to_dict()
+    {...}
+
+"""
+from collections.abc import Sequence
+from sys import intern
+
+# Key tuples are shared between all records with the same keys.
+_KEYS = {}
+
+
+class _Packed(tuple):
+    """
+    A dict stored as ``(keys, value, value, ...)``, where ``keys`` is a shared tuple.
+    """
+    __slots__ = ()
+
+
+def _pack(data: dict) -> _Packed:
+    keys = tuple(data)
+    keys = _KEYS.setdefault(keys, tuple(intern(k) if isinstance(k, str) else k for k in keys))
+    return _Packed((keys, *(_compact(value) for value in data.values())))
+
+
+def _compact(value):
+    if isinstance(value, dict):
+        return _pack(value)
+    if isinstance(value, list):
+        return tuple(_compact(item) for item in value)
+    return value
+
+
+def _materialize(value):
+    if isinstance(value, _Packed):
+        return Record(value)
+    if isinstance(value, tuple):
+        return [_materialize(item) for item in value]
+    return value
+
+
+def _plain(value):
+    if isinstance(value, _Packed):
+        return {key: _plain(item) for key, item in zip(value[0], value[1:])}
+    if isinstance(value, tuple):
+        return [_plain(item) for item in value]
+    return value
+
+
+_EMPTY = _Packed(((),))
+
+
+class Record:
+    """
+    A response object. Fields are read as attributes or with ``record['field']``.
+    """
+    __slots__ = ('_packed',)
+
+    def __init__(self, data):
+        self._packed = data if isinstance(data, _Packed) else _pack(data)
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        packed = self._packed
+        try:
+            return _materialize(packed[packed[0].index(name) + 1])
+        except ValueError:
+            raise AttributeError(name) from None
+
+    def __getitem__(self, name):
+        try:
+            return getattr(self, name)
+        except AttributeError:
+            raise KeyError(name) from None
+
+    def get(self, name, default=None):
+        return getattr(self, name, default)
+
+    def to_dict(self) -> dict:
+        """
+        Return the record as a plain dict, in the shape the API returned it.
+        """
+        return _plain(self._packed)
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __repr__(self):
+        return f'{type(self).__name__}({self.to_dict()!r})'
+
+
+class Model(Record):
+    """
+    Base class for typed records. Fields named in ``_fields`` get their own slot; everything else, including
+    nested objects, is packed into a tuple and materialized on access.
+    """
+    __slots__ = ()
+    _fields = ()
+
+    def __init__(self, data: dict):  # pylint: disable=super-init-not-called
+        rest = {}
+        fields = self._fields
+        for key, value in data.items():
+            if key in fields:
+                object.__setattr__(self, key, value)
+            else:
+                rest[key] = value
+        for key in fields:
+            if key not in data:
+                object.__setattr__(self, key, None)
+        self._packed = _pack(rest) if rest else _EMPTY
+
+    def to_dict(self) -> dict:
+        data = {key: getattr(self, key) for key in self._fields}
+        data.update(_plain(self._packed))
+        return data
+
+    @classmethod
+    def from_list(cls, items):
+        """
+        Convert a list of dicts to a `ModelList`. Anything that isn't a list (e.g. 'No entries found') is returned unchanged.
+        """
+        if not isinstance(items, list):
+            return items
+        return ModelList(cls, items)
+
+    @classmethod
+    def from_response(cls, response):
+        """
+        Convert the ``response`` of an API result dict to records, leaving failed results as they are.
+        """
+        if not isinstance(response, dict) or response.get('status') != 'success':
+            return response
+        body = response.get('response')
+        if isinstance(body, dict):
+            body = cls(body)
+        else:
+            body = cls.from_list(body)
+        return dict(response, response=body)
+
+
+_MISSING = object()
+
+
+def _flatten(data: dict, prefix: tuple = ()):
+    """
+    Yield (path, value) pairs for the leaves of a nested dict.
+    """
+    for key, value in data.items():
+        if isinstance(value, dict) and value:
+            yield from _flatten(value, prefix + (key,))
+        else:
+            yield prefix + (key,), _compact(value)
+
+
+class ModelList(Sequence):
+    """
+    A read-only list of records, stored column by column: one list per field, including the fields of nested
+    objects. Record objects are only created when they are accessed.
+    """
+    __slots__ = ('_model', '_columns', '_length')
+
+    def __init__(self, model, items: list):
+        self._model = model
+        self._columns = {}
+        self._length = 0
+        for item in items:
+            for path, value in _flatten(item):
+                column = self._columns.get(path)
+                if column is None:
+                    column = self._columns[path] = [_MISSING] * self._length
+                column.append(value)
+            self._length += 1
+            for column in self._columns.values():
+                if len(column) < self._length:
+                    column.append(_MISSING)
+
+    def __len__(self):
+        return self._length
+
+    def _item(self, index: int) -> dict:
+        data = {}
+        for path, column in self._columns.items():
+            value = column[index]
+            if value is _MISSING:
+                continue
+            target = data
+            for key in path[:-1]:
+                target = target.setdefault(key, {})
+            target[path[-1]] = _plain(value)
+        return data
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('ModelList index out of range')
+        return self._model(self._item(index))
+
+    def to_list(self) -> list:
+        """
+        Return the records as a list of plain dicts.
+        """
+        return [self._item(index) for index in range(self._length)]
+
+    def __repr__(self):
+        return f'ModelList({self._model.__name__}, {len(self)} records)'
+
+
+class AccountModel(Model):
+    """
+    A Sonetel account.
+    """
+    _fields = ('account_id', 'name', 'currency', 'credit_balance', 'language', 'country')
+    __slots__ = _fields
+
+
+class PhoneNumberSubscriptionModel(Model):
+    """
+    A phone number subscription in the account.
+    """
+    _fields = ('phnum', 'connect_to_type', 'connect_to', 'country', 'status')
+    __slots__ = _fields
+
+
+class RecordingModel(Model):
+    """
+    A call recording. `voice_call_details` and `file_access_details` are materialized on access.
+    """
+    _fields = ('call_recording_id', 'account_id', 'created_date', 'expiry_date', 'type')
+    __slots__ = _fields
+
+
+class UserModel(Model):
+    """
+    A user in the account.
+    """
+    _fields = ('user_id', 'account_id', 'email', 'user_fname', 'user_lname', 'type', 'status')
+    __slots__ = _fields
+
+
+class VoiceAppModel(Model):
+    """
+    A voice app.
+    """
+    _fields = ('app_id', 'account_id', 'name', 'app_type', 'status')
+    __slots__ = _fields
@@ -2,10 +2,11 @@
 Add and manage phone numbers in your Sonetel account.
 """
 import re
-from json import dumps
+from .codec import dumps
 from . import utilities as util
 from . import _constants as const
 from . import exceptions as e
+from . import models
 
 
 def is_e164(number: str) -> bool:
@@ -33,13 +34,14 @@ class PhoneNumber(util.Resource):
         self._url = f'{const.API_URI_BASE}{const.API_ENDPOINT_ACCOUNT}{self._accountid}' \
                     f'{const.API_ENDPOINT_NUMBERSUBSCRIPTION}'
 
-    def get(self, e164only: bool = True, number: str = '') -> dict:
+    def get(self, e164only: bool = True, number: str = '', typed: bool = False) -> dict:
         """
         List all the phone numbers present in the account.
 
         :param e164only: Optional. Boolean. Only return a list of phone numbers if set to True.
         Set to True by default.
         :param number: Optional. String. If you only want information about one of your numbers, pass it as a string.
+        :param typed: Optional. Boolean. Return `PhoneNumberSubscriptionModel` records instead of dicts when e164only is False.
 
         **DOCS**: https://docs.sonetel.com/docs/sonetel-documentation/YXBpOjE2MjQ3MzI4-phone-numbers
 
@@ -60,7 +62,15 @@ class PhoneNumber(util.Resource):
                     message=f'"{number}" is not a valid e164 number'
                 )
 
-        api_response = util.send_api_request(token=self._token, uri=url)
+        api_response = util.send_api_request(token=self._token, uri=url, raw=False)
+        response = self._format_numbers(api_response, e164only)
+        return models.PhoneNumberSubscriptionModel.from_response(response) if typed and not e164only else response
+
+    @staticmethod
+    def _format_numbers(api_response: dict, e164only: bool) -> dict:
+        """
+        Shape the API response for get().
+        """
         response = api_response['response']
 
         # No numbers are found
@@ -182,3 +192,127 @@ class PhoneNumber(util.Resource):
             method='put',
             body=dumps(body)
         )
+
+    def add_many(self, numbers: list, max_workers: int = 8) -> dict:
+        """
+        Buy several phone numbers at once. All numbers are checked before any request is sent, and the requests
+        run concurrently.
+
+        :param numbers: The phone numbers to purchase.
+        :param max_workers: The maximum number of requests sent at the same time. Defaults to 8.
+        :return: Dict with the results per number, split into ``succeeded``, ``invalid`` and ``failed``, and the
+            ``duplicates``: inputs repeating an earlier number, which are not sent.
+        """
+        return self._run_many(*self._prepare_many(numbers, self._add_job), max_workers)
+
+    def delete_many(self, numbers: list, max_workers: int = 8) -> dict:
+        """
+        Remove several numbers from the account at once. The numbers are removed immediately and cannot be recovered.
+
+        :param numbers: The phone numbers to remove.
+        :param max_workers: The maximum number of requests sent at the same time. Defaults to 8.
+        :return: Dict with the results per number, split into ``succeeded``, ``invalid`` and ``failed``, and the
+            ``duplicates``: inputs repeating an earlier number, which are not sent.
+        """
+        return self._run_many(*self._prepare_many(numbers, self._delete_job), max_workers)
+
+    def update_many(self, updates: list, max_workers: int = 8) -> dict:
+        """
+        Update the call forwarding settings of several numbers at once.
+
+        :param updates: A list of ``(number, connect_to_type, connect_to)`` tuples.
+        :param max_workers: The maximum number of requests sent at the same time. Defaults to 8.
+        :return: Dict with the results per number, split into ``succeeded``, ``invalid`` and ``failed``, and the
+            ``duplicates``: updates repeating an earlier number, which are not sent.
+        """
+        return self._run_many(*self._prepare_many(updates, self._update_job), max_workers)
+
+    def _add_job(self, number) -> tuple:
+        number = str(number)
+        if not is_e164(number):
+            return number, util.prepare_error(
+                code=const.ERR_NUM_NOT_E164,
+                message=f'"{number}" is not a valid e164 number'
+            )
+        return number, (number, self._url, 'post', dumps({"phnum": number}))
+
+    def _delete_job(self, number) -> tuple:
+        number = str(number)
+        if not is_e164(number):
+            return number, util.prepare_error(
+                code=const.ERR_NUM_NOT_E164,
+                message=f'"{number}" is not a valid e164 number'
+            )
+        return number, (number, f'{self._url}{number}', 'delete', None)
+
+    def _update_job(self, update: tuple) -> tuple:
+        number, connect_to_type, connect_to = update
+        number = str(number)
+        if not is_e164(number):
+            return number, util.prepare_error(
+                code=const.ERR_NUM_NOT_E164,
+                message=f'"{number}" is not a valid e164 number'
+            )
+        if not connect_to or connect_to_type not in const.CONST_CONNECT_TO_TYPES:
+            return number, util.prepare_error(
+                code=const.ERR_NUM_UPDATE_EMPTY,
+                message=f'invalid connect_to_type or connect_to value - {connect_to_type}, {connect_to}'
+            )
+        body = {
+            "connect_to_type": connect_to_type,
+            "connect_to": connect_to
+        }
+        return number, (number, f'{self._url}{number}', 'put', dumps(body))
+
+    @staticmethod
+    def _prepare_many(items: list, job) -> tuple:
+        """
+        Check every input once with ``job`` and split the inputs into the ``(number, url, method, body)`` requests
+        to send, the invalid inputs and the duplicates. Only the first input for a number is used.
+        """
+        jobs = []
+        invalid = {}
+        duplicates = []
+        seen = set()
+        for item in items:
+            number, result = job(item)
+            if number in seen:
+                duplicates.append(item)
+                continue
+            seen.add(number)
+            if isinstance(result, dict):
+                invalid[number] = result
+            else:
+                jobs.append(result)
+        return jobs, invalid, duplicates
+
+    @staticmethod
+    def _sort_results(jobs: list, results: list, invalid: dict, duplicates: list) -> dict:
+        succeeded = {}
+        failed = {}
+        for (number, _, _, _), result in zip(jobs, results):
+            if isinstance(result, dict) and result.get('status') == 'success':
+                succeeded[number] = result
+            else:
+                failed[number] = result
+
+        return {
+            'status': 'success' if not invalid and not failed else 'failed',
+            'response': {
+                'succeeded': succeeded,
+                'invalid': invalid,
+                'failed': failed,
+                'duplicates': duplicates
+            }
+        }
+
+    def _run_many(self, jobs: list, invalid: dict, duplicates: list, max_workers: int) -> dict:
+        """
+        Send the prepared ``(number, url, method, body)`` requests concurrently and sort the results.
+        """
+        def send(job):
+            _, url, method, body = job
+            return util.send_api_request(token=self._token, uri=url, method=method, body=body, raw=False)
+
+        results = util.map_concurrently(send, jobs, max_workers=max_workers)
+        return self._sort_results(jobs, results, invalid, duplicates)
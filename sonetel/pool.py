@@ -0,0 +1,244 @@
+"""
+# Client pool
+
+Work with many Sonetel accounts from one process. Register the credentials of each account once; the pool signs in
+to an account the first time it is used and keeps its `Auth` instance and resource objects in an LRU of at most
+``max_accounts`` accounts, so memory stays bounded no matter how many accounts are registered. Accounts that were
+evicted sign in again when they are next used.
+
+All accounts share the process-wide transport and its connection pool. Tokens are refreshed lazily, when a request
+finds the token about to expire, instead of by one background timer per account.
+
+The fan-out helpers run the same operation across many accounts concurrently and return the results by account ID.
+
+Examples:
+    >>> from sonetel.pool import ClientPool
+    >>> pool = ClientPool(max_accounts=500)
+    >>> pool.add('1234', 'user@example.com', 'password')
+    >>> pool.add('5678', 'admin@example.org', 'password')
+    >>> pool.get_balance(currency=True)['response']['succeeded']
+    {'1234': '12.34 USD', '5678': '1.00 EUR'}
+    >>> pool.resource('1234', 'PhoneNumber').get()
+    {'status': 'success', 'response': ['+46101234567']}
+
+"""
+import threading
+from collections import OrderedDict
+from importlib import import_module
+from . import exceptions as e
+from . import utilities as util
+
+# Resource class name -> module, as in the package's lazy imports.
+_RESOURCES = {
+    'Account': '.account',
+    'Call': '.calls',
+    'PhoneNumber': '.phonenumber',
+    'Recording': '.recording',
+    'User': '.users',
+    'VoiceApp': '.voiceapps',
+}
+
+
+class _Client:
+    """
+    The signed-in state of one account: its `Auth` instance and the resource objects created for it.
+    """
+    __slots__ = ('auth', 'resources')
+
+    def __init__(self, auth):
+        self.auth = auth
+        self.resources = {}
+
+
+class ClientPool:
+    """
+    Pool of signed-in Sonetel accounts, keyed by account ID.
+
+    Args:
+        max_accounts (int): Optional. Maximum number of accounts kept signed in. The least recently used account is
+            signed out when another one is needed. Defaults to 1000.
+        max_workers (int): Optional. Number of accounts the fan-out helpers work on concurrently. Defaults to 16.
+        refresh_lead_time (int): Optional. Refresh an account's access token this many seconds before it expires. Defaults to 300.
+        token_store (FileTokenStore): Optional. Share the tokens with other processes, see `sonetel.tokenstore`.
+    """
+    def __init__(self, max_accounts: int = 1000, max_workers: int = 16, refresh_lead_time: int = 300,
+                 token_store=None):
+        self.max_accounts = max_accounts
+        self.max_workers = max_workers
+        self.refresh_lead_time = refresh_lead_time
+        self.token_store = token_store
+
+        self._lock = threading.Lock()
+        self._credentials = {}
+        self._clients = OrderedDict()
+
+        self.sign_ins = 0
+        self.evictions = 0
+
+    def add(self, account_id: str, username: str, password: str):
+        """
+        Register the credentials of an account. Nothing is sent until the account is used.
+        """
+        with self._lock:
+            self._credentials[str(account_id)] = (username, password, threading.Lock())
+            self._evict(str(account_id))
+
+    def remove(self, account_id: str):
+        """
+        Forget an account and sign it out.
+        """
+        with self._lock:
+            self._credentials.pop(str(account_id), None)
+            self._evict(str(account_id))
+
+    def accounts(self) -> list:
+        """
+        Return the IDs of all registered accounts.
+        """
+        with self._lock:
+            return list(self._credentials)
+
+    def _evict(self, account_id: str):
+        client = self._clients.pop(account_id, None)
+        if client is not None:
+            client.auth.close()
+
+    def _client(self, account_id: str) -> _Client:
+        account_id = str(account_id)
+        with self._lock:
+            client = self._clients.get(account_id)
+            if client is not None:
+                self._clients.move_to_end(account_id)
+                return client
+            if account_id not in self._credentials:
+                raise e.AuthException(f'unknown account: {account_id}')
+            username, password, sign_in_lock = self._credentials[account_id]
+
+        # Sign in outside the pool lock, so other accounts aren't blocked. The account's own lock makes
+        # concurrent callers share one sign-in.
+        with sign_in_lock:
+            with self._lock:
+                client = self._clients.get(account_id)
+            if client is not None:
+                return client
+
+            from .auth import Auth  # pylint: disable=import-outside-toplevel
+            auth = Auth(username, password, refresh_lead_time=self.refresh_lead_time, background_refresh=False,
+                        token_store=self.token_store)
+            signed_in = str(auth.get_decoded_token()['acc_id'])
+            if signed_in != account_id:
+                raise e.AuthException(f'the credentials for account {account_id} belong to account {signed_in}')
+
+            client = _Client(auth)
+            with self._lock:
+                self.sign_ins += 1
+                self._clients[account_id] = client
+                while len(self._clients) > self.max_accounts:
+                    _, evicted = self._clients.popitem(last=False)
+                    evicted.auth.close()
+                    self.evictions += 1
+            return client
+
+    def auth(self, account_id: str):
+        """
+        Return the `Auth` instance of an account, signing in if needed.
+        """
+        return self._client(account_id).auth
+
+    def resource(self, account_id: str, resource: str):
+        """
+        Return a resource object of an account, e.g. ``pool.resource('1234', 'PhoneNumber')``. Resource objects are
+        created once per signed-in account and use the account's `Auth` instance, so their token never goes stale.
+
+        Args:
+            account_id (str): The account ID.
+            resource (str): The resource class name: `Account`, `Call`, `PhoneNumber`, `Recording`, `User` or `VoiceApp`.
+        """
+        if resource not in _RESOURCES:
+            raise ValueError(f'unknown resource: {resource}')
+        client = self._client(account_id)
+        obj = client.resources.get(resource)
+        if obj is None:
+            cls = getattr(import_module(_RESOURCES[resource], __package__), resource)
+            obj = client.resources[resource] = cls(access_token=client.auth)
+        return obj
+
+    def map(self, func, account_ids: list = None, max_workers: int = None) -> dict:
+        """
+        Call ``func(account_id)`` for many accounts concurrently.
+
+        Args:
+            func (callable): Called with each account ID.
+            account_ids (list): Optional. The accounts to work on. Defaults to all registered accounts.
+            max_workers (int): Optional. Number of accounts worked on concurrently. Defaults to ``self.max_workers``.
+
+        Returns:
+            dict: ``{'status', 'response': {'succeeded', 'failed'}}``, both mapping account IDs to results. Failed
+            results are error dicts; exceptions are returned as error dicts too.
+        """
+        account_ids = [str(account_id) for account_id in (account_ids if account_ids is not None else self.accounts())]
+
+        def run(account_id):
+            try:
+                return func(account_id)
+            except Exception as err:  # pylint: disable=broad-except
+                return {'status': 'failed', 'error': type(err).__name__, 'message': err}
+
+        results = util.map_concurrently(run, account_ids, max_workers=max_workers or self.max_workers)
+
+        succeeded = {}
+        failed = {}
+        for account_id, result in zip(account_ids, results):
+            if isinstance(result, dict) and result.get('status') == 'failed':
+                failed[account_id] = result
+            else:
+                succeeded[account_id] = result
+
+        return {
+            'status': 'success' if not failed else 'failed',
+            'response': {
+                'succeeded': succeeded,
+                'failed': failed
+            }
+        }
+
+    def call(self, resource: str, method: str, *args, account_ids: list = None, **kwargs) -> dict:
+        """
+        Call the same resource method for many accounts concurrently, e.g. ``pool.call('User', 'get', all_users=True)``.
+        Returns the results like `map()`.
+        """
+        return self.map(lambda account_id: getattr(self.resource(account_id, resource), method)(*args, **kwargs),
+                        account_ids=account_ids)
+
+    def get_balance(self, currency: bool = False, account_ids: list = None) -> dict:
+        """
+        Get the prepaid balance of many accounts. See `Account.get_balance()`.
+        """
+        return self.call('Account', 'get_balance', currency=currency, account_ids=account_ids)
+
+    def get_phone_numbers(self, e164only: bool = True, account_ids: list = None) -> dict:
+        """
+        Get the phone numbers of many accounts. See `PhoneNumber.get()`.
+        """
+        return self.call('PhoneNumber', 'get', e164only=e164only, account_ids=account_ids)
+
+    def stats(self) -> dict:
+        """
+        Number of registered and signed-in accounts, sign-ins and evictions.
+        """
+        with self._lock:
+            return {
+                'accounts': len(self._credentials),
+                'signed_in': len(self._clients),
+                'sign_ins': self.sign_ins,
+                'evictions': self.evictions,
+            }
+
+    def close(self):
+        """
+        Sign out all accounts. The credentials stay registered.
+        """
+        with self._lock:
+            for client in self._clients.values():
+                client.auth.close()
+            self._clients.clear()
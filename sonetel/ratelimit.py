@@ -0,0 +1,212 @@
+"""
+# Rate limiting
+
+Client-side token bucket rate limiting for the transport. Limits are set per endpoint group, for example
+`callback` or `numbers`, so a burst of callbacks can't starve other API calls of the server's request budget.
+
+When the API responds with 429 or 503, the `Retry-After` header pauses the whole endpoint group and the request
+is queued and sent again, instead of failing.
+
+Examples:
+    >>> from sonetel import transport
+    >>> from sonetel.ratelimit import RateLimiter
+    >>> limiter = RateLimiter({'callback': (5, 10), 'numbers': (2, 2)})
+    >>> transport.configure(rate_limiter=limiter)
+    >>> limiter.stats()['callback']
+    {'rate': 5, 'burst': 10, 'queue_depth': 0, 'requests': 0, 'waited': 0, 'total_wait': 0.0, 'max_wait': 0.0}
+
+"""
+import threading
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from time import monotonic, sleep
+from . import exceptions as e
+
+
+def parse_retry_after(value: str, default: float = 1.0) -> float:
+    """
+    Parse a ``Retry-After`` header value, given either in seconds or as an HTTP date. Returns seconds to wait.
+    """
+    if not value:
+        return default
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket. Callers queue in ``acquire()`` until a token is available.
+
+    Args:
+        rate (float): Tokens added per second. ``None`` means no limit.
+        burst (int): Optional. Bucket size, i.e. the number of requests that can be sent at once. Defaults to ``rate``.
+    """
+    def __init__(self, rate: float = None, burst: int = None):
+        self.rate = rate
+        self.burst = burst if burst is not None else max(int(rate or 1), 1)
+
+        self._lock = threading.Lock()
+        self._tokens = float(self.burst)
+        self._updated = monotonic()
+        self._paused_until = 0.0
+
+        self.queue_depth = 0
+        self.requests = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _reserve(self, now: float) -> float:
+        """
+        Take a token, possibly in advance. Returns the number of seconds the caller has to wait for it.
+        """
+        if self.rate:
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        else:
+            delay = 0.0
+        return max(delay, self._paused_until - now)
+
+    def _take(self, timeout: float) -> float:
+        """
+        Take a token and count the request. Returns the number of seconds the caller has to wait for it.
+        """
+        with self._lock:
+            delay = self._reserve(monotonic())
+            if timeout is not None and delay > timeout:
+                if self.rate:
+                    self._tokens += 1
+                raise e.DeadlineExceededException(
+                    f'the rate limit wait of {delay:.3f}s is longer than the remaining budget'
+                )
+            self.requests += 1
+            if delay > 0:
+                self.queue_depth += 1
+        return delay
+
+    def _waited(self, delay: float):
+        with self._lock:
+            self.queue_depth -= 1
+            self.waited += 1
+            self.total_wait += delay
+            self.max_wait = max(self.max_wait, delay)
+
+    def acquire(self, timeout: float = None) -> float:
+        """
+        Wait for a token. Returns the number of seconds spent waiting.
+
+        Raises `DeadlineExceededException`, without taking a token, if the wait would be longer than ``timeout``.
+        """
+        delay = self._take(timeout)
+        if delay <= 0:
+            return 0.0
+
+        try:
+            sleep(delay)
+        finally:
+            self._waited(delay)
+        return delay
+
+    async def acquire_async(self, timeout: float = None) -> float:
+        """
+        Like `acquire()`, but waits with ``asyncio.sleep()`` so the event loop keeps running.
+        """
+        import asyncio  # pylint: disable=import-outside-toplevel
+
+        delay = self._take(timeout)
+        if delay <= 0:
+            return 0.0
+
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self._waited(delay)
+        return delay
+
+    def pause(self, seconds: float):
+        """
+        Hold back all requests for ``seconds``, e.g. after a response with a ``Retry-After`` header.
+        """
+        with self._lock:
+            self._paused_until = max(self._paused_until, monotonic() + seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'rate': self.rate,
+                'burst': self.burst,
+                'queue_depth': self.queue_depth,
+                'requests': self.requests,
+                'waited': self.waited,
+                'total_wait': self.total_wait,
+                'max_wait': self.max_wait,
+            }
+
+
+class RateLimiter:
+    """
+    A token bucket per endpoint group.
+
+    Args:
+        limits (dict): Optional. Maps an endpoint group (`auth`, `callback`, `numbers`, `recordings`, `users`,
+            `voiceapps`, `account`) to a ``(rate, burst)`` tuple. Groups without a limit are only held back by
+            ``Retry-After`` responses.
+        max_throttle_retries (int): Optional. How many times a request answered with 429 or 503 is queued and sent again. Defaults to 5.
+        max_retry_after (float): Optional. Upper bound in seconds for a single ``Retry-After`` wait. Defaults to 60.
+    """
+    def __init__(self, limits: dict = None, max_throttle_retries: int = 5, max_retry_after: float = 60.0):
+        self.max_throttle_retries = max_throttle_retries
+        self.max_retry_after = max_retry_after
+
+        self._lock = threading.Lock()
+        self._buckets = {}
+        for group, (rate, burst) in (limits or {}).items():
+            self._buckets[group] = TokenBucket(rate, burst)
+
+    def bucket(self, group: str) -> TokenBucket:
+        """
+        Return the bucket of an endpoint group, creating an unlimited one if needed.
+        """
+        bucket = self._buckets.get(group)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.setdefault(group, TokenBucket())
+        return bucket
+
+    def acquire(self, group: str, timeout: float = None) -> float:
+        """
+        Wait until a request to the endpoint group may be sent. Returns the number of seconds spent waiting.
+        Raises `DeadlineExceededException` if the wait would be longer than ``timeout``.
+        """
+        return self.bucket(group).acquire(timeout=timeout)
+
+    async def acquire_async(self, group: str, timeout: float = None) -> float:
+        """
+        Async version of `acquire()`, used by the async client.
+        """
+        return await self.bucket(group).acquire_async(timeout=timeout)
+
+    def throttled(self, group: str, retry_after: str = None) -> float:
+        """
+        Pause the endpoint group after a 429 or 503 response. Returns the pause in seconds.
+        """
+        seconds = min(parse_retry_after(retry_after), self.max_retry_after)
+        self.bucket(group).pause(seconds)
+        return seconds
+
+    def stats(self) -> dict:
+        """
+        Queue depth and wait time statistics per endpoint group.
+        """
+        return {group: bucket.stats() for group, bucket in list(self._buckets.items())}
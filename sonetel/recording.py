@@ -2,8 +2,48 @@
 Manage call recordings
 """
 # Import Packages.
+import datetime
+import hashlib
+import json
+import os
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import copy_context
+from urllib.parse import urlsplit
 from . import utilities as util
 from . import _constants as const
+from . import exceptions as e
+from . import models
+
+DATE_FORMAT = '%Y%m%dT%H:%M:%SZ'
+
+
+def _date_windows(start_time: str, end_time: str, window: datetime.timedelta):
+    """
+    Split the range between two timestamps into consecutive windows. Yields (start, end) timestamp pairs.
+    """
+    start = datetime.datetime.strptime(start_time, DATE_FORMAT)
+    end = datetime.datetime.strptime(end_time, DATE_FORMAT)
+    while start < end:
+        window_end = min(start + window, end)
+        yield start.strftime(DATE_FORMAT), window_end.strftime(DATE_FORMAT)
+        start = window_end
+
+
+def _download_url(recording: dict) -> str:
+    """
+    Return the file download URL from a recording fetched with file_access_details.
+    """
+    details = recording.get('file_access_details') or {}
+    return details.get('file_download_url') or details.get('download_url') or details.get('url')
+
+
+def _sha256(path: str, chunk_size: int) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
 
 class Recording(util.Resource):
     """
@@ -19,7 +59,8 @@ class Recording(util.Resource):
             end_time: str = None,
             file_access_details: bool = False,
             voice_call_details: bool = False,
-            rec_id: str = None
+            rec_id: str = None,
+            typed: bool = False
             ):
         """
         Get a list of all the call recordings or a single recording.
@@ -33,8 +74,36 @@ class Recording(util.Resource):
         :param rec_id: The unique recording ID. If not included, returns all the recordings.
         :param file_access_details: Boolean. Include the details needed to download recordings.
         :param voice_call_details: Boolean. Include the details of the voice calls.
+        :param typed: Boolean. Return `RecordingModel` records instead of dicts.
+        """
+        url = self._get_url(
+            start_time=start_time,
+            end_time=end_time,
+            file_access_details=file_access_details,
+            voice_call_details=voice_call_details,
+            rec_id=rec_id
+        )
+        response = util.send_api_request(token=self._token, uri=url, method='get', raw=False if typed else None)
+        return models.RecordingModel.from_response(response) if typed else response
+
+    def _get_decoded(self, start_time: str = None, end_time: str = None, file_access_details: bool = False,
+                     voice_call_details: bool = False, rec_id: str = None):
+        """
+        Like get(), but always returns the decoded response, also inside `codec.raw_responses()`.
         """
+        url = self._get_url(
+            start_time=start_time,
+            end_time=end_time,
+            file_access_details=file_access_details,
+            voice_call_details=voice_call_details,
+            rec_id=rec_id
+        )
+        return util.send_api_request(token=self._token, uri=url, method='get', raw=False)
 
+    def _get_url(self, start_time, end_time, file_access_details, voice_call_details, rec_id) -> str:
+        """
+        Build the request URL for get().
+        """
         url = self._url
         field_prefix = '&'
 
@@ -60,7 +129,239 @@ class Recording(util.Resource):
         if len(fields) > 0:
             url += f'{field_prefix}fields=' + ','.join(fields)
 
-        return util.send_api_request(token=self._token, uri=url, method='get')
+        return url
+
+    def iter(self,
+             start_time: str,
+             end_time: str,
+             window: datetime.timedelta = datetime.timedelta(days=1),
+             parallelism: int = 4,
+             file_access_details: bool = False,
+             voice_call_details: bool = False,
+             typed: bool = False
+             ):
+        """
+        Iterate over the recordings created between two timestamps, oldest first.
+
+        The range is split into windows that are fetched with up to ``parallelism`` concurrent requests. Only the
+        windows being fetched are held in memory, however long the range is. The requests run in the context of
+        this call, so a latency budget or priority in effect here applies to them.
+
+        :param start_time: The start timestamp in the format YYYYMMDDTHH:MM:SSZ.
+        :param end_time: The end timestamp in the format YYYYMMDDTHH:MM:SSZ.
+        :param window: A timedelta or number of seconds. The length of the range fetched with one request. Defaults to one day.
+        :param parallelism: The maximum number of windows fetched at the same time. Defaults to 4.
+        :param file_access_details: Boolean. Include the details needed to download recordings.
+        :param voice_call_details: Boolean. Include the details of the voice calls.
+        :param typed: Boolean. Yield `RecordingModel` records instead of dicts.
+        :returns: A generator of recordings.
+        """
+        if not (util.is_valid_date(start_time) and util.is_valid_date(end_time)
+                and util.date_diff(start_time, end_time)):
+            raise e.RecordingException('start_time and end_time must be valid timestamps and start_time must be before end_time')
+
+        if not isinstance(window, datetime.timedelta):
+            window = datetime.timedelta(seconds=window)
+        if window.total_seconds() <= 0:
+            raise e.RecordingException('window must be positive')
+
+        return self._iter_windows(
+            windows=_date_windows(start_time, end_time, window),
+            parallelism=max(parallelism, 1),
+            file_access_details=file_access_details,
+            voice_call_details=voice_call_details,
+            typed=typed,
+            context=copy_context()
+        )
+
+    def _iter_windows(self, windows, parallelism: int, file_access_details: bool, voice_call_details: bool,
+                      typed: bool, context):
+        pending = deque()
+        previous_ids = set()
+
+        def fetch(window_start, window_end):
+            return window_start, window_end, self._get_decoded(
+                start_time=window_start,
+                end_time=window_end,
+                file_access_details=file_access_details,
+                voice_call_details=voice_call_details
+            )
+
+        wrap = models.RecordingModel if typed else None
+        with ThreadPoolExecutor(max_workers=parallelism) as pool:
+            try:
+                for window_start, window_end in windows:
+                    pending.append(pool.submit(context.copy().run, fetch, window_start, window_end))
+                    if len(pending) > parallelism:
+                        previous_ids = yield from self._window_items(pending.popleft().result(), previous_ids, wrap)
+                while pending:
+                    previous_ids = yield from self._window_items(pending.popleft().result(), previous_ids, wrap)
+            finally:
+                for future in pending:
+                    future.cancel()
+
+    @staticmethod
+    def _window_items(result: tuple, previous_ids: set, wrap=None):
+        """
+        Yield the recordings of one window in created date order, skipping recordings already yielded by the
+        previous window (windows share their boundary timestamp). Each recording is passed through ``wrap``, if
+        given. Returns the IDs of the window.
+        """
+        window_start, window_end, response = result
+        if not isinstance(response, dict) or response.get('status') != 'success':
+            raise e.RecordingException(f'Unable to fetch recordings between {window_start} and {window_end}: {response}')
+
+        recordings = response.get('response')
+        if not isinstance(recordings, list):
+            return set()
+
+        recordings.sort(key=lambda rec: rec.get('created_date') or '')
+        ids = set()
+        for rec in recordings:
+            rec_id = rec.get('call_recording_id')
+            ids.add(rec_id)
+            if rec_id is None or rec_id not in previous_ids:
+                yield rec if wrap is None else wrap(rec)
+        return ids
+
+    def download(self, rec_id: str = None, path: str = None, recording: dict = None, chunk_size: int = 65536) -> dict:
+        """
+        Download a recording file to disk.
+
+        The file is streamed to ``<path>.part`` in chunks and renamed to ``path`` when complete. If a ``.part`` file
+        is left over from an interrupted download, only the missing bytes are requested with an HTTP Range header.
+
+        :param rec_id: The ID of the recording to download. Not needed if ``recording`` is passed.
+        :param path: The file to write. Defaults to the recording ID plus the file extension of the download URL, in the current directory.
+        :param recording: Optional. A recording fetched with file_access_details, e.g. from iter(). Saves one API request.
+        :param chunk_size: Optional. Number of bytes read and written at a time. Defaults to 64 KiB.
+        :returns: Dict with the recording ID, path, size in bytes and SHA-256 checksum of the file.
+        """
+        import requests  # pylint: disable=import-outside-toplevel
+        from . import transport  # pylint: disable=import-outside-toplevel
+
+        if recording is None:
+            if not rec_id:
+                return util.prepare_error(
+                    code=const.ERR_RECORDING_ID_EMPTY,
+                    message='rec_id or recording is required to download a recording'
+                )
+            result = self._get_decoded(rec_id=rec_id, file_access_details=True)
+            if not isinstance(result, dict) or not isinstance(result.get('response'), dict):
+                return {'status': 'failed', 'error': 'RecordingNotFound', 'message': result}
+            recording = result['response']
+
+        rec_id = rec_id or recording.get('call_recording_id')
+        url = _download_url(recording)
+        if not url:
+            return {'status': 'failed', 'error': 'NoDownloadUrl', 'message': f'no download URL for recording {rec_id}'}
+
+        if not path:
+            path = f'{rec_id}{os.path.splitext(urlsplit(url).path)[1]}'
+        part = f'{path}.part'
+
+        headers = {"User-Agent": f'Sonetel Python Package - v{const.PKG_VERSION}'}
+        offset = os.path.getsize(part) if os.path.exists(part) else 0
+        if offset:
+            headers['Range'] = f'bytes={offset}-'
+
+        try:
+            with transport.get_transport().request(
+                method='get',
+                url=url,
+                headers=headers,
+                stream=True,
+            ) as r:
+                if r.status_code == 416:
+                    # The partial file is already complete.
+                    pass
+                else:
+                    r.raise_for_status()
+                    mode = 'ab' if offset and r.status_code == 206 else 'wb'
+                    with open(part, mode) as file:
+                        for chunk in r.iter_content(chunk_size=chunk_size):
+                            file.write(chunk)
+        except e.DeadlineExceededException as err:
+            return {'status': 'failed', 'error': 'DeadlineExceeded', 'message': err}
+        except e.CircuitOpenException as err:
+            return {'status': 'failed', 'error': 'CircuitOpen', 'message': err}
+        except requests.exceptions.HTTPError as err:
+            return {'status': 'failed', 'error': 'HTTPError', 'message': err.response.text}
+        except requests.exceptions.RequestException as err:
+            return {'status': 'failed', 'error': 'RequestException', 'message': err}
+
+        os.replace(part, path)
+        return {
+            'status': 'success',
+            'response': {
+                'call_recording_id': rec_id,
+                'path': path,
+                'size': os.path.getsize(path),
+                'sha256': _sha256(path, chunk_size),
+            }
+        }
+
+    def download_many(self,
+                      recordings,
+                      directory: str = '.',
+                      max_workers: int = 8,
+                      manifest: str = 'manifest.json',
+                      chunk_size: int = 65536) -> dict:
+        """
+        Download many recording files in parallel and write a manifest. The downloads run in the context of this
+        call, so a latency budget or priority in effect here applies to them.
+
+        :param recordings: An iterable of recording IDs, or of recordings fetched with file_access_details (for example from iter()).
+        :param directory: The directory to save the files in. Created if needed. Defaults to the current directory.
+        :param max_workers: The maximum number of files downloaded at the same time. Defaults to 8.
+        :param manifest: The name of the JSON manifest written to the directory, listing the path, size and SHA-256 checksum of every file. Set to None to skip it.
+        :param chunk_size: Number of bytes read and written at a time. Defaults to 64 KiB.
+        :returns: Dict with the manifest entries of the downloaded files and the errors of those that failed.
+        """
+        os.makedirs(directory, exist_ok=True)
+        max_workers = max(max_workers, 1)
+        context = copy_context()
+
+        def fetch(item):
+            if not isinstance(item, dict):
+                result = self._get_decoded(rec_id=item, file_access_details=True)
+                if not isinstance(result, dict) or not isinstance(result.get('response'), dict):
+                    return item, {'status': 'failed', 'error': 'RecordingNotFound', 'message': result}
+                item = result['response']
+
+            rec_id = item.get('call_recording_id')
+            url = _download_url(item) or ''
+            path = os.path.join(directory, f'{rec_id}{os.path.splitext(urlsplit(url).path)[1]}')
+            return rec_id, self.download(rec_id=rec_id, recording=item, path=path, chunk_size=chunk_size)
+
+        files = []
+        errors = {}
+
+        def collect(future):
+            rec_id, result = future.result()
+            if result.get('status') == 'success':
+                files.append(result['response'])
+            else:
+                errors[rec_id] = result
+
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            for item in recordings:
+                pending.append(pool.submit(context.copy().run, fetch, item))
+                if len(pending) >= 2 * max_workers:
+                    collect(pending.popleft())
+            while pending:
+                collect(pending.popleft())
+
+        if manifest:
+            with open(os.path.join(directory, manifest), 'w', encoding='utf-8') as file:
+                json.dump({'files': files, 'errors': {k: str(v) for k, v in errors.items()}}, file, indent=2)
+
+        return {
+            'status': 'success' if not errors else 'failed',
+            'response': files,
+            'errors': errors
+        }
 
     def delete(self, rec_id: str) -> dict:
         """
@@ -0,0 +1,156 @@
+"""
+# Retries
+
+Retry policy for the transport: exponential backoff with full jitter, a maximum number of attempts and a total
+deadline for all attempts of one request.
+
+Whether a failed request is retried depends on its HTTP method:
+
+* `GET`, `PUT` and `DELETE` are idempotent and are retried on connection errors, timeouts and 502/504 responses.
+* `POST` (for example `Call.callback()` or `PhoneNumber.add()`) is only retried if the connection could not be
+  established, because the server never saw the request. A POST that timed out may already have been processed.
+
+Examples:
+    >>> from sonetel import transport
+    >>> from sonetel.retry import RetryPolicy
+    >>> transport.configure(retry_policy=RetryPolicy(max_attempts=5, deadline=20))
+    >>> transport.get_transport().retry_policy.stats()['retries']
+    {}
+
+"""
+import random
+import sys
+import threading
+from bisect import bisect_left
+import requests
+from urllib3.exceptions import NewConnectionError, ConnectTimeoutError
+
+# Upper bounds, in seconds, of the attempt latency histogram buckets.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, float('inf'))
+
+
+def _aiohttp():
+    # An aiohttp error can only exist once aiohttp has been imported. Don't import it for sync users.
+    return sys.modules.get('aiohttp')
+
+
+def is_connect_error(err: Exception) -> bool:
+    """
+    Return True if the request failed before a connection to the server was established.
+    """
+    aiohttp = _aiohttp()
+    if aiohttp is not None and isinstance(err, aiohttp.ClientError):
+        return isinstance(err, (aiohttp.ClientConnectorError, getattr(aiohttp, 'ConnectionTimeoutError', ())))
+    if isinstance(err, requests.exceptions.ConnectTimeout):
+        return True
+    if not isinstance(err, requests.exceptions.ConnectionError):
+        return False
+
+    # requests wraps urllib3's MaxRetryError, which carries the underlying error as ``reason``.
+    reason = err.args[0] if err.args else None
+    reason = getattr(reason, 'reason', reason)
+    return isinstance(reason, (NewConnectionError, ConnectTimeoutError))
+
+
+def is_transient_error(err: Exception) -> bool:
+    """
+    Return True if the request failed with a connection error or a timeout, which may succeed when sent again.
+    """
+    if isinstance(err, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    aiohttp = _aiohttp()
+    if aiohttp is None:
+        return False
+    import asyncio  # pylint: disable=import-outside-toplevel
+    return isinstance(err, (aiohttp.ClientConnectionError, asyncio.TimeoutError))
+
+
+class RetryPolicy:
+    """
+    Retry policy with exponential backoff and full jitter.
+
+    Args:
+        max_attempts (int): Optional. Maximum number of attempts, including the first one. Defaults to 3.
+        backoff_base (float): Optional. Backoff of the first retry in seconds, doubled for every further retry. Defaults to 0.2.
+        backoff_max (float): Optional. Upper bound of the backoff in seconds. Defaults to 5.
+        deadline (float): Optional. Don't start another attempt once this many seconds have passed since the first one. Defaults to 30.
+        idempotent_methods (tuple): Optional. HTTP methods that are safe to retry after any transient error. Defaults to GET, PUT and DELETE.
+        retry_statuses (tuple): Optional. Response status codes that are retried for idempotent methods. Defaults to 502 and 504.
+    """
+    def __init__(self,
+                 max_attempts: int = 3,
+                 backoff_base: float = 0.2,
+                 backoff_max: float = 5.0,
+                 deadline: float = 30.0,
+                 idempotent_methods: tuple = ('GET', 'PUT', 'DELETE'),
+                 retry_statuses: tuple = (502, 504)):
+
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.deadline = deadline
+        self.idempotent_methods = tuple(m.upper() for m in idempotent_methods)
+        self.retry_statuses = tuple(retry_statuses)
+
+        self._lock = threading.Lock()
+        self._retries = {}
+        self._latency = {}
+
+    def is_idempotent(self, method: str) -> bool:
+        return method.upper() in self.idempotent_methods
+
+    def should_retry(self, method: str, attempt: int, elapsed: float,
+                     err: Exception = None, status_code: int = None) -> bool:
+        """
+        Decide whether a failed attempt should be retried.
+
+        Args:
+            method (str): The HTTP method of the request.
+            attempt (int): The number of attempts made so far.
+            elapsed (float): Seconds since the first attempt started.
+            err (Exception): Optional. The exception raised by the attempt.
+            status_code (int): Optional. The status code of the response, if one was received.
+        """
+        if attempt >= self.max_attempts or elapsed >= self.deadline:
+            return False
+
+        if err is not None:
+            if is_connect_error(err):
+                return True
+            return self.is_idempotent(method) and is_transient_error(err)
+
+        return self.is_idempotent(method) and status_code in self.retry_statuses
+
+    def backoff(self, attempt: int, elapsed: float = 0.0) -> float:
+        """
+        Seconds to wait before the next attempt, using full jitter. Never runs past the deadline.
+        """
+        ceiling = min(self.backoff_max, self.backoff_base * 2 ** (attempt - 1))
+        return min(random.uniform(0, ceiling), max(self.deadline - elapsed, 0.0))
+
+    def record_attempt(self, group: str, duration: float):
+        """
+        Add the duration of one attempt to the latency histogram of its endpoint group.
+        """
+        with self._lock:
+            histogram = self._latency.get(group)
+            if histogram is None:
+                histogram = self._latency[group] = [0] * len(LATENCY_BUCKETS)
+            histogram[bisect_left(LATENCY_BUCKETS, duration)] += 1
+
+    def record_retry(self, group: str):
+        with self._lock:
+            self._retries[group] = self._retries.get(group, 0) + 1
+
+    def stats(self) -> dict:
+        """
+        Retry counts and attempt latency histograms per endpoint group. Histograms map the upper bound of each
+        bucket in seconds to the number of attempts that fell into that bucket.
+        """
+        with self._lock:
+            return {
+                'retries': dict(self._retries),
+                'latency': {
+                    group: dict(zip(LATENCY_BUCKETS, counts)) for group, counts in self._latency.items()
+                },
+            }
@@ -0,0 +1,199 @@
+"""
+# Scheduler
+
+Share a limited number of concurrent requests between priority classes, so a background sweep of recordings or
+users can't hold every connection while a callback waits. Requests queue per class and free slots are handed out
+by weighted fair queuing: with the default weights, interactive requests get eight slots and mutations four for every
+slot given to bulk reads, but no class is starved while it has requests waiting.
+
+Classes:
+
+* `interactive` - Call control and single-resource reads: `Call.callback()`, `Account.get()`, `User.get(userid=...)`,
+  `Recording.get(rec_id=...)`, and token requests.
+* `mutation` - POST, PUT and DELETE requests, e.g. `PhoneNumber.update()` or `User.add()`.
+* `bulk` - Reads of whole collections: `Recording.get()`, `User.get(all_users=True)`, `PhoneNumber.get()` and `VoiceApp.get()`.
+
+Override the class of a call with `priority()` or `Resource.with_priority()`.
+
+Examples:
+    >>> from sonetel import transport
+    >>> from sonetel.scheduler import Scheduler, priority
+    >>> transport.configure(pool_maxsize=16, scheduler=Scheduler(max_concurrency=16))
+    >>> with priority('bulk'):
+    ...     Account(access_token=auth).get()
+    >>> transport.get_transport().scheduler.stats()['interactive']['wait_p99']
+    0.0
+
+"""
+import threading
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import monotonic
+from . import _constants as const
+from . import exceptions as e
+
+INTERACTIVE = const.PRIORITY_INTERACTIVE
+MUTATION = const.PRIORITY_MUTATION
+BULK = const.PRIORITY_BULK
+
+DEFAULT_WEIGHTS = {INTERACTIVE: 8, MUTATION: 4, BULK: 1}
+
+_priority = ContextVar('sonetel_priority', default=None)
+
+
+@contextmanager
+def priority(name: str):
+    """
+    Schedule the requests sent in this block with the priority class ``name``.
+    """
+    token = _priority.set(name)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def classify(method: str, url: str, group: str) -> str:
+    """
+    Return the default priority class of a request.
+    """
+    if group in (const.GROUP_CALLBACK, const.GROUP_AUTH):
+        return INTERACTIVE
+    if method.upper() != 'GET':
+        return MUTATION
+
+    from .transport import resource_prefix  # pylint: disable=import-outside-toplevel
+    path = url.split('?', 1)[0]
+    collection = group not in (const.GROUP_ACCOUNT, const.GROUP_OTHER) and resource_prefix(path) == path
+    return BULK if collection else INTERACTIVE
+
+
+class _Waiter:
+    __slots__ = ('event', 'granted')
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+
+
+class _Class:
+    """
+    Queue and wait statistics of one priority class.
+    """
+    __slots__ = ('weight', 'queue', 'vtime', 'requests', 'waited', 'total_wait', 'max_wait', 'waits')
+
+    def __init__(self, weight: float):
+        self.weight = weight
+        self.queue = deque()
+        self.vtime = 0.0
+        self.requests = 0
+        self.waited = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.waits = deque(maxlen=1024)
+
+
+def _percentile(values, percent: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(int(len(values) * percent / 100), len(values) - 1)]
+
+
+class Scheduler:
+    """
+    Weighted fair queuing of requests over a shared concurrency limit.
+
+    Args:
+        max_concurrency (int): Optional. Maximum number of requests in flight. Defaults to 10, the transport's default pool size.
+        weights (dict): Optional. Maps a priority class to its share of the slots. Defaults to `DEFAULT_WEIGHTS`.
+    """
+    def __init__(self, max_concurrency: int = 10, weights: dict = None):
+        self.max_concurrency = max_concurrency
+        self._lock = threading.Lock()
+        self._classes = {name: _Class(weight) for name, weight in (weights or DEFAULT_WEIGHTS).items()}
+        self._in_flight = 0
+        self._vtime = 0.0
+
+    def priority_of(self, method: str, url: str, group: str) -> str:
+        """
+        The priority class of a request: the one set with `priority()`, or the default from `classify()`.
+        """
+        name = _priority.get() or classify(method, url, group)
+        if name not in self._classes:
+            raise ValueError(f'unknown priority class: {name}')
+        return name
+
+    def _start(self, cls: _Class):
+        """
+        Count a request as in flight and advance its class's virtual time.
+        """
+        self._in_flight += 1
+        cls.vtime = max(cls.vtime, self._vtime) + 1 / cls.weight
+        self._vtime = min((c.vtime for c in self._classes.values() if c.queue), default=cls.vtime)
+
+    def _dispatch(self):
+        while self._in_flight < self.max_concurrency:
+            waiting = [c for c in self._classes.values() if c.queue]
+            if not waiting:
+                return
+            cls = min(waiting, key=lambda c: max(c.vtime, self._vtime) + 1 / c.weight)
+            waiter = cls.queue.popleft()
+            waiter.granted = True
+            self._start(cls)
+            waiter.event.set()
+
+    def acquire(self, name: str, timeout: float = None) -> float:
+        """
+        Wait for a slot for a request of priority class ``name``. Returns the number of seconds spent waiting.
+        Raises `DeadlineExceededException` if no slot is free within ``timeout`` seconds.
+        """
+        cls = self._classes[name]
+        with self._lock:
+            cls.requests += 1
+            if self._in_flight < self.max_concurrency and not any(c.queue for c in self._classes.values()):
+                self._start(cls)
+                cls.waits.append(0.0)
+                return 0.0
+            waiter = _Waiter()
+            cls.queue.append(waiter)
+
+        queued = monotonic()
+        waiter.event.wait(None if timeout is None else max(timeout, 0.0))
+        waited = monotonic() - queued
+        with self._lock:
+            if not waiter.granted:
+                cls.queue.remove(waiter)
+                raise e.DeadlineExceededException('the latency budget was used up waiting for a request slot')
+            cls.waited += 1
+            cls.total_wait += waited
+            cls.max_wait = max(cls.max_wait, waited)
+            cls.waits.append(waited)
+        return waited
+
+    def release(self):
+        """
+        Free the slot of a finished request.
+        """
+        with self._lock:
+            self._in_flight -= 1
+            self._dispatch()
+
+    def stats(self) -> dict:
+        """
+        Queue depth and wait times per priority class, in seconds.
+        """
+        with self._lock:
+            return {
+                name: {
+                    'weight': cls.weight,
+                    'queued': len(cls.queue),
+                    'requests': cls.requests,
+                    'waited': cls.waited,
+                    'total_wait': cls.total_wait,
+                    'max_wait': cls.max_wait,
+                    'wait_p50': _percentile(cls.waits, 50),
+                    'wait_p99': _percentile(cls.waits, 99),
+                } for name, cls in self._classes.items()
+            }
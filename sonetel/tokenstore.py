@@ -0,0 +1,212 @@
+"""
+# Token store
+
+Share access and refresh tokens between processes. Pass a `FileTokenStore` to `Auth` and a process that starts
+while another one holds a valid token reuses it instead of sending its own password grant. A file lock makes sure
+only one process creates or refreshes the token at a time; the others wait and pick up the result. A fleet of
+workers then makes one auth request per token lifetime instead of one per worker.
+
+Tokens are stored per username and auth endpoint, encrypted with Fernet (AES-128-CBC with an HMAC-SHA256
+signature). A passphrase is stretched with PBKDF2 and a random salt that is kept in the header of the token file;
+the key is derived once per salt and store, and stores that share a directory adopt the salt they find there.
+Install the optional dependency with `pip install sonetel[store]`.
+
+Examples:
+    >>> from sonetel import Auth
+    >>> from sonetel.tokenstore import FileTokenStore
+    >>> store = FileTokenStore('/var/run/myapp/sonetel-tokens', key=os.environ['SONETEL_TOKEN_STORE_KEY'])
+    >>> auth = Auth('username', 'password', token_store=store)
+
+"""
+import base64
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from . import exceptions as e
+
+try:
+    from cryptography.fernet import Fernet, InvalidToken
+except ImportError:  # pragma: no cover
+    Fernet = InvalidToken = None
+
+if os.name == 'nt':  # pragma: no cover
+    import msvcrt
+else:
+    import fcntl
+
+KEY_ENV_VAR = 'SONETEL_TOKEN_STORE_KEY'
+DEFAULT_PATH = os.path.join(os.path.expanduser('~'), '.sonetel', 'tokens')
+
+# Token files encrypted with a passphrase start with this marker and the salt, separated by '$'.
+_SALT_HEADER = b'sonetel-salt'
+_PBKDF2_ITERATIONS = 200000
+
+
+def _is_fernet_key(key: bytes) -> bool:
+    try:
+        return len(base64.urlsafe_b64decode(key)) == 32
+    except ValueError:
+        return False
+
+
+def _derive_key(passphrase: bytes, salt: bytes) -> bytes:
+    derived = hashlib.pbkdf2_hmac('sha256', passphrase, salt, _PBKDF2_ITERATIONS)
+    return base64.urlsafe_b64encode(derived)
+
+
+@contextmanager
+def _locked(path: str):
+    """
+    Hold an exclusive lock on ``path`` for the duration of the block. Blocks until the lock is free.
+    """
+    with open(path, 'a+b') as file:
+        if os.name == 'nt':  # pragma: no cover
+            file.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(file.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    # LK_LOCK gives up after 10 attempts one second apart. Keep waiting, like flock does.
+                    continue
+        else:
+            fcntl.flock(file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == 'nt':  # pragma: no cover
+                file.seek(0)
+                msvcrt.locking(file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(file.fileno(), fcntl.LOCK_UN)
+
+
+class FileTokenStore:
+    """
+    Encrypted token store in a local directory, shared by all processes that use the same directory and key.
+
+    Args:
+        path (str): Optional. Directory for the token files. Created with owner-only permissions if missing.
+            Defaults to ``~/.sonetel/tokens``.
+        key (str): Optional. Encryption key: a Fernet key from `generate_key()` or any passphrase. A passphrase is
+            stretched with PBKDF2 the first time the store reads or writes a token. Defaults to the
+            ``SONETEL_TOKEN_STORE_KEY`` environment variable.
+    """
+    def __init__(self, path: str = DEFAULT_PATH, key: str = None):
+        if Fernet is None:
+            raise e.SonetelException(
+                'cryptography is required for the token store. Install it with "pip install cryptography".'
+            )
+        key = key if key is not None else os.environ.get(KEY_ENV_VAR)
+        if not key:
+            raise e.SonetelException(f'an encryption key is required. Pass "key" or set {KEY_ENV_VAR}.')
+
+        if isinstance(key, str):
+            key = key.encode()
+
+        self.path = path
+        if _is_fernet_key(key):
+            self._passphrase = None
+            self._fernet = Fernet(key)
+        else:
+            self._passphrase = key
+            self._fernet = None
+        self._salt = None
+        self._derived = {}
+        os.makedirs(path, mode=0o700, exist_ok=True)
+
+    @staticmethod
+    def generate_key() -> str:
+        """
+        Return a new random encryption key.
+        """
+        return Fernet.generate_key().decode()
+
+    @staticmethod
+    def key_for(username: str, auth_uri: str) -> str:
+        """
+        Return the name under which the tokens of ``username`` are stored. Usernames are hashed so that they
+        don't appear in file names.
+        """
+        return hashlib.sha256(f'{auth_uri}|{username}'.encode()).hexdigest()
+
+    def _file(self, name: str, suffix: str) -> str:
+        return os.path.join(self.path, name + suffix)
+
+    def _fernet_for(self, salt: bytes):
+        """
+        The Fernet instance for a passphrase and salt, deriving the key the first time the salt is seen.
+        """
+        fernet = self._derived.get(salt)
+        if fernet is None:
+            fernet = self._derived[salt] = Fernet(_derive_key(self._passphrase, salt))
+        return fernet
+
+    def _encrypt(self, data: bytes) -> bytes:
+        if self._passphrase is None:
+            return self._fernet.encrypt(data)
+        if self._salt is None:
+            self._salt = os.urandom(16)
+        salt = self._salt
+        return b'$'.join((_SALT_HEADER, base64.urlsafe_b64encode(salt), self._fernet_for(salt).encrypt(data)))
+
+    def _decrypt(self, data: bytes) -> bytes:
+        if not data.startswith(_SALT_HEADER + b'$'):
+            if self._passphrase is not None:
+                raise ValueError('the token file was not written with a passphrase')
+            return self._fernet.decrypt(data)
+        if self._passphrase is None:
+            raise ValueError('the token file was written with a passphrase')
+        _, salt, token = data.split(b'$', 2)
+        salt = base64.urlsafe_b64decode(salt)
+        data = self._fernet_for(salt).decrypt(token)
+        # Write with the same salt from now on, so that the stores sharing the file derive a single key.
+        self._salt = salt
+        return data
+
+    @contextmanager
+    def lock(self, name: str):
+        """
+        Hold the lock for ``name`` across processes.
+        """
+        with _locked(self._file(name, '.lock')):
+            yield
+
+    def load(self, name: str) -> dict:
+        """
+        Return the stored tokens, or None if there are none or they can't be decrypted.
+        """
+        try:
+            with open(self._file(name, '.token'), 'rb') as file:
+                return json.loads(self._decrypt(file.read()))
+        except (OSError, ValueError, InvalidToken):
+            return None
+
+    def save(self, name: str, tokens: dict):
+        """
+        Store tokens. The file is replaced atomically, so readers never see a partial write.
+        """
+        data = self._encrypt(json.dumps(tokens).encode())
+        # A unique, owner-only temp file per call, so concurrent writers in any process or thread don't collide.
+        fd, temp = tempfile.mkstemp(dir=self.path, prefix=f'{name}.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as file:
+                file.write(data)
+            os.replace(temp, self._file(name, '.token'))
+        except BaseException:
+            try:
+                os.remove(temp)
+            except OSError:
+                pass
+            raise
+
+    def delete(self, name: str):
+        """
+        Remove the stored tokens.
+        """
+        try:
+            os.remove(self._file(name, '.token'))
+        except FileNotFoundError:
+            pass
@@ -0,0 +1,523 @@
+"""
+# Transport
+
+The transport layer sends every HTTP request made by the package. By default a single, process-wide
+`Transport` is shared by `Account`, `PhoneNumber`, `Call`, `User`, `VoiceApp`, `Recording` and `Auth`,
+so TCP and TLS connections to the Sonetel API are kept alive and reused between calls.
+
+Concurrent GET requests for the same URL with the same token are coalesced: the first one is sent and the others
+wait for it and receive the same response. Unlike the response cache, this never returns data that is older than
+the request.
+
+It contains the following functions:
+
+* `get_transport()` - Get the shared transport, creating it on first use.
+* `set_transport()` - Replace the shared transport with your own instance.
+* `configure()` - Create a new shared transport with the given pool settings.
+* `endpoint_group()` - Get the endpoint group a URL belongs to.
+
+"""
+import threading
+from contextlib import ExitStack
+from time import monotonic, sleep
+from typing import Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from . import _constants as const
+from . import deadline
+from . import exceptions as e
+from . import hooks
+from .cache import ResponseCache
+from .ratelimit import RateLimiter
+from .retry import RetryPolicy
+
+# Checked in order: the number and user endpoints are nested below the account endpoint.
+_ENDPOINT_GROUPS = (
+    (const.API_ENDPOINT_CALLBACK, const.GROUP_CALLBACK),
+    (const.API_ENDPOINT_NUMBERSUBSCRIPTION, const.GROUP_NUMBERS),
+    (const.API_ENDPOINT_CALL_RECORDING, const.GROUP_RECORDINGS),
+    (const.API_ENDPOINT_USER, const.GROUP_USERS),
+    (const.API_ENDPOINT_VOICEAPP, const.GROUP_VOICEAPPS),
+    (const.API_ENDPOINT_ACCOUNT, const.GROUP_ACCOUNT),
+)
+
+
+def endpoint_group(url: str) -> str:
+    """
+    Return the endpoint group (`auth`, `callback`, `numbers`, `recordings`, `users`, `voiceapps`, `account`
+    or `other`) of an API URL.
+    """
+    if url.startswith(const.API_URI_AUTH):
+        return const.GROUP_AUTH
+    for endpoint, group in _ENDPOINT_GROUPS:
+        if endpoint in url:
+            return group
+    return const.GROUP_OTHER
+
+
+def resource_prefix(url: str) -> str:
+    """
+    Return the URL prefix of the resource collection a URL belongs to, e.g. the phone number subscription list for
+    the URL of a single number. Cached responses under this prefix are invalidated when the resource changes.
+    """
+    url = url.split('?', 1)[0]
+    for endpoint, group in _ENDPOINT_GROUPS:
+        if group == const.GROUP_ACCOUNT:
+            break
+        index = url.find(endpoint)
+        if index != -1:
+            return url[:index + len(endpoint)]
+    return url
+
+
+def _exceeds_budget(delay: float) -> bool:
+    """
+    Return True if waiting ``delay`` seconds would leave no budget for another attempt.
+    """
+    left = deadline.remaining()
+    return left is not None and delay >= left
+
+
+def _body_size(data) -> Optional[int]:
+    if data is None:
+        return 0
+    if isinstance(data, (str, bytes)):
+        return len(data)
+    return None
+
+
+def _response_size(response, stream: bool = False) -> Optional[int]:
+    """
+    Size of the response body. Streamed bodies are not read, so the Content-Length header is used instead.
+    """
+    if not stream:
+        return len(response.content)
+    length = response.headers.get('Content-Length')
+    return int(length) if length and length.isdigit() else None
+
+
+class _PoolAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that reports every new connection opened by its pools.
+    """
+    def __init__(self, on_new_connection, **kwargs):
+        self._on_new_connection = on_new_connection
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, connections, maxsize, block=False, **pool_kwargs):
+        super().init_poolmanager(connections, maxsize, block=block, **pool_kwargs)
+
+        on_new_connection = self._on_new_connection
+
+        class CountingHTTPConnectionPool(HTTPConnectionPool):
+            def _new_conn(self):
+                on_new_connection()
+                return super()._new_conn()
+
+        class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+            def _new_conn(self):
+                on_new_connection()
+                return super()._new_conn()
+
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': CountingHTTPConnectionPool,
+            'https': CountingHTTPSConnectionPool,
+        }
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state.pop('_on_new_connection', None)
+        return state
+
+
+class _Flight:
+    """
+    A GET request in flight, shared by all callers that asked for the same URL with the same token.
+    """
+    __slots__ = ('done', 'response', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.response = None
+        self.error = None
+
+
+class Transport:
+    """
+    Thread-safe HTTP transport backed by a pooled, keep-alive ``requests.Session``.
+
+    Examples:
+        >>> from sonetel import transport
+        >>> transport.configure(pool_connections=4, pool_maxsize=32, keepalive_timeout=30)
+        >>> transport.get_transport().stats()
+        {'requests': 0, 'new_connections': 0, 'pool_hits': 0, 'coalesced': 0}
+
+    Args:
+        pool_connections (int): Optional. Number of hosts to keep connection pools for. Defaults to 10.
+        pool_maxsize (int): Optional. Maximum number of connections kept per host. Defaults to 10.
+        keepalive_timeout (float): Optional. Seconds the transport may sit idle before its connection pools are reset.
+            Defaults to 60.
+        pool_block (bool): Optional. Wait for a free connection instead of opening an extra one when a pool is full. Defaults to False.
+        rate_limiter (RateLimiter): Optional. Per endpoint group rate limits. Defaults to a `RateLimiter` without
+            limits, which only honours ``Retry-After`` on 429 and 503 responses.
+        retry_policy (RetryPolicy): Optional. When and how often failed requests are retried. Defaults to `RetryPolicy()`.
+        cache (ResponseCache): Optional. Cache GET responses. Disabled by default.
+        coalesce (bool): Optional. Concurrent GET requests for the same URL with the same token share one request
+            and all receive its response. Defaults to True.
+        hedge_policy (HedgePolicy): Optional. Send a second request when a GET is slower than usual. The hedge uses the
+            scheduler and concurrency limiter slot of the request it hedges. Disabled by default.
+        timeouts (Timeouts): Optional. Connect and read timeouts per endpoint group, used when a request doesn't pass
+            ``timeout``. Defaults to `Timeouts()`: 10 seconds to connect and 60 seconds to read.
+        scheduler (Scheduler): Optional. Share a concurrency limit between priority classes with weighted fair
+            queuing. Disabled by default.
+        circuit_breaker (CircuitBreaker): Optional. Fail requests at once while their endpoint group keeps failing.
+            Disabled by default.
+        concurrency_limiter (AdaptiveLimiter): Optional. Limit the requests in flight per endpoint group, adapting
+            the limit to the observed latency. Disabled by default.
+    """
+    def __init__(self,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 10,
+                 keepalive_timeout: float = 60.0,
+                 pool_block: bool = False,
+                 rate_limiter: RateLimiter = None,
+                 retry_policy: RetryPolicy = None,
+                 cache: ResponseCache = None,
+                 coalesce: bool = True,
+                 hedge_policy=None,
+                 timeouts: deadline.Timeouts = None,
+                 scheduler=None,
+                 circuit_breaker=None,
+                 concurrency_limiter=None):
+
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.keepalive_timeout = keepalive_timeout
+        self.rate_limiter = rate_limiter if rate_limiter is not None else RateLimiter()
+        self.retry_policy = retry_policy if retry_policy is not None else RetryPolicy()
+        self.cache = cache
+        self.coalesce = coalesce
+        self.hedge_policy = hedge_policy
+        self.timeouts = timeouts if timeouts is not None else deadline.Timeouts()
+        self.scheduler = scheduler
+        self.circuit_breaker = circuit_breaker
+        self.concurrency_limiter = concurrency_limiter
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._new_connections = 0
+        self._coalesced = 0
+        self._flights = {}
+        self._last_used = monotonic()
+
+        self._adapter = _PoolAdapter(
+            on_new_connection=self._count_new_connection,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self._session = requests.Session()
+        self._session.mount('https://', self._adapter)
+        self._session.mount('http://', self._adapter)
+
+    def _count_new_connection(self):
+        with self._lock:
+            self._new_connections += 1
+
+    def _expire_idle(self):
+        """
+        Reset the connection pools when no request has been sent for longer than the keep-alive timeout.
+
+        Idle time is tracked for the transport as a whole, not per connection, so every pooled connection has been
+        idle at least that long and the whole pool is dropped. Connections are opened again on demand.
+        """
+        now = monotonic()
+        with self._lock:
+            idle = now - self._last_used
+            self._last_used = now
+            self._requests += 1
+        if self.keepalive_timeout is not None and idle > self.keepalive_timeout:
+            self._adapter.poolmanager.clear()
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send an HTTP request over the pooled session.
+
+        The request waits for the rate limit of its endpoint group. A 429 or 503 response pauses the group for the
+        time given in ``Retry-After`` and the request is sent again, up to ``rate_limiter.max_throttle_retries`` times.
+        Other transient failures are retried as decided by ``retry_policy``. If a ``cache`` is set, GET responses
+        are served from it and successful changes invalidate the affected entries. Identical concurrent GET requests
+        share one request, see ``coalesce``.
+
+        Args:
+            method (str): The HTTP method to use.
+            url (str): The URL to send the request to.
+            **kwargs: Passed on to ``requests.Session.request`` (headers, data, auth, timeout, ...).
+
+        Returns:
+            requests.Response: The response. If the last attempt raised an exception, it is raised here.
+        """
+        group = endpoint_group(url)
+        cache = self.cache
+
+        if cache is None or not cache.cacheable(group):
+            return self._fetch(method, url, group, kwargs)
+
+        if method.upper() != 'GET':
+            response = self._send(method, url, group, **kwargs)
+            if response.ok:
+                cache.invalidate(resource_prefix(url))
+            return response
+
+        key = (url, (kwargs.get('headers') or {}).get('Authorization'))
+        response, revalidate = cache.get(key, group)
+        if response is None:
+            response = self._fetch(method, url, group, kwargs)
+            if response.status_code == 200:
+                cache.set(key, response)
+        elif revalidate:
+            threading.Thread(target=self._revalidate, args=(key, method, url, group, kwargs), daemon=True).start()
+        return response
+
+    def _fetch(self, method: str, url: str, group: str, kwargs: dict) -> requests.Response:
+        """
+        Send a request. Concurrent GET requests for the same URL and token wait for the first one and share its
+        response, or its exception.
+        """
+        if not self.coalesce or method.upper() != 'GET' or kwargs.get('stream'):
+            return self._send(method, url, group, **kwargs)
+
+        key = (url, (kwargs.get('headers') or {}).get('Authorization'))
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+            else:
+                self._coalesced += 1
+
+        if not leader:
+            left = deadline.remaining()
+            if not flight.done.wait(None if left is None else max(left, 0.0)):
+                raise e.DeadlineExceededException('the latency budget was used up waiting for an identical request')
+            if flight.error is not None:
+                raise flight.error
+            return flight.response
+
+        try:
+            flight.response = self._send(method, url, group, **kwargs)
+            return flight.response
+        except BaseException as err:
+            flight.error = err
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+
+    def _revalidate(self, key, method: str, url: str, group: str, kwargs: dict):
+        """
+        Refresh a stale cache entry in the background. Any failure, including an open circuit or a spent budget,
+        releases the entry so that a later request can revalidate it again.
+        """
+        response = None
+        try:
+            response = self._send(method, url, group, **kwargs)
+        except (requests.exceptions.RequestException, e.SonetelException):
+            pass
+        finally:
+            if response is not None and response.status_code == 200:
+                self.cache.set(key, response)
+            else:
+                self.cache.revalidation_failed(key)
+
+    def _request(self, method: str, url: str, group: str, kwargs: dict) -> requests.Response:
+        """
+        Send the request over the session, hedged if the hedge policy applies, and report the outcome to the
+        circuit breaker and the concurrency limiter.
+        """
+        hedge = self.hedge_policy
+        breaker = self.circuit_breaker
+        limiter = self.concurrency_limiter
+        sent = monotonic()
+        try:
+            if hedge is None or not hedge.applies(method, group, kwargs):
+                response = self._session.request(method=method, url=url, **kwargs)
+            else:
+                response = hedge.run(lambda: self._session.request(method=method, url=url, **kwargs), group)
+        except requests.exceptions.RequestException as err:
+            duration = monotonic() - sent
+            if breaker is not None:
+                breaker.record(method, url, group, duration, failed=True)
+            if limiter is not None and isinstance(err, requests.exceptions.Timeout):
+                limiter.record(group, duration, dropped=True)
+            raise
+        duration = monotonic() - sent
+        if breaker is not None:
+            breaker.record(method, url, group, duration, failed=response.status_code >= 500)
+        if limiter is not None:
+            limiter.record(group, duration, dropped=response.status_code in (429, 503))
+        return response
+
+    def _attempt(self, method: str, url: str, group: str, kwargs: dict, priority: str = None) -> requests.Response:
+        """
+        Send one attempt. With a concurrency limiter or a scheduler, the attempt first waits for a slot of its
+        endpoint group or priority class and holds it until the response headers have arrived.
+        """
+        limiter = self.concurrency_limiter
+        scheduler = self.scheduler
+        if limiter is None and scheduler is None:
+            return self._request(method, url, group, kwargs)
+
+        with ExitStack() as slots:
+            waited = False
+            if limiter is not None:
+                waited = limiter.acquire(group, timeout=deadline.remaining())
+                slots.callback(limiter.release, group)
+            if scheduler is not None:
+                waited = scheduler.acquire(priority, timeout=deadline.remaining()) or waited
+                slots.callback(scheduler.release)
+            if waited:
+                kwargs['timeout'] = deadline.cap(kwargs['timeout'])
+            return self._request(method, url, group, kwargs)
+
+    def _send(self, method: str, url: str, group: str, **kwargs) -> requests.Response:
+        """
+        Send a request, waiting for the rate limiter and retrying as needed. Every step is bounded by the latency
+        budget of the call, if there is one. An attempt fails at once, before any wait, if the circuit of its
+        endpoint group is open.
+        """
+        breaker = self.circuit_breaker
+        limiter = self.rate_limiter
+        policy = self.retry_policy
+        watched = hooks.active
+        timeout = kwargs.pop('timeout', None)
+        if timeout is None:
+            timeout = self.timeouts.for_group(group)
+        priority = None
+        if self.scheduler is not None:
+            priority = self.scheduler.priority_of(method, url, group)
+
+        start = monotonic()
+        attempts = 0
+        throttled = 0
+        while True:
+            if breaker is not None:
+                breaker.before(method, url, group)
+            limiter.acquire(group, timeout=deadline.remaining())
+            kwargs['timeout'] = deadline.cap(timeout)
+            self._expire_idle()
+
+            attempts += 1
+            if watched:
+                hooks.emit(hooks.BEFORE_SEND, method, url, group=group, attempt=attempts,
+                           bytes=_body_size(kwargs.get('data')))
+            sent = monotonic()
+            try:
+                response = self._attempt(method, url, group, kwargs, priority)
+            except requests.exceptions.RequestException as err:
+                duration = monotonic() - sent
+                policy.record_attempt(group, duration)
+                if watched:
+                    hooks.emit(hooks.ERROR, method, url, group=group, attempt=attempts, duration=duration, error=err)
+                elapsed = monotonic() - start
+                if not policy.should_retry(method, attempts, elapsed, err=err):
+                    raise
+                delay = policy.backoff(attempts, elapsed)
+                if _exceeds_budget(delay):
+                    raise
+                policy.record_retry(group)
+                if watched:
+                    hooks.emit(hooks.RETRY, method, url, group=group, attempt=attempts, duration=delay, error=err)
+                sleep(delay)
+                continue
+            duration = monotonic() - sent
+            policy.record_attempt(group, duration)
+            if watched:
+                hooks.emit(hooks.AFTER_RESPONSE, method, url, group=group, attempt=attempts,
+                           status=response.status_code, bytes=_response_size(response, kwargs.get('stream')),
+                           duration=duration)
+
+            if response.status_code in (429, 503) and throttled < limiter.max_throttle_retries:
+                delay = limiter.throttled(group, response.headers.get('Retry-After'))
+                if watched:
+                    hooks.emit(hooks.RETRY, method, url, group=group, attempt=attempts,
+                               status=response.status_code, duration=delay)
+                response.close()
+                attempts -= 1
+                throttled += 1
+                continue
+
+            elapsed = monotonic() - start
+            if policy.should_retry(method, attempts, elapsed, status_code=response.status_code):
+                delay = policy.backoff(attempts, elapsed)
+                if _exceeds_budget(delay):
+                    return response
+                policy.record_retry(group)
+                response.close()
+                if watched:
+                    hooks.emit(hooks.RETRY, method, url, group=group, attempt=attempts,
+                               status=response.status_code, duration=delay)
+                sleep(delay)
+                continue
+
+            return response
+
+    def stats(self) -> dict:
+        """
+        Connection reuse counters.
+
+        Returns:
+            dict: The number of requests sent, new connections opened, requests served from a pooled connection
+            and GET requests that shared the response of an identical request in flight.
+        """
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'new_connections': self._new_connections,
+                'pool_hits': max(self._requests - self._new_connections, 0),
+                'coalesced': self._coalesced,
+            }
+
+    def close(self):
+        """
+        Close all pooled connections.
+        """
+        self._session.close()
+
+
+_transport: Transport = None
+_transport_lock = threading.Lock()
+
+
+def get_transport() -> Transport:
+    """
+    Return the process-wide transport, creating it with default settings on first use.
+    """
+    global _transport  # pylint: disable=global-statement
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = Transport()
+    return _transport
+
+
+def set_transport(transport) -> None:
+    """
+    Replace the process-wide transport. Any object with a compatible ``request()`` method can be used.
+    """
+    global _transport  # pylint: disable=global-statement
+    with _transport_lock:
+        previous, _transport = _transport, transport
+    if previous is not None and previous is not transport:
+        previous.close()
+
+
+def configure(**kwargs) -> Transport:
+    """
+    Create a new process-wide transport. Accepts the same arguments as `Transport`.
+    """
+    transport = Transport(**kwargs)
+    set_transport(transport)
+    return transport
@@ -1,10 +1,11 @@
 """
 Users
 """
-from json import dumps
+from .codec import dumps
 from . import utilities as util
 from . import _constants as const
 from . import exceptions as e
+from . import models
 
 class User(util.Resource):
     """
@@ -18,7 +19,7 @@ class User(util.Resource):
         super().__init__(access_token=access_token)
         self._url = f'{const.API_URI_BASE}{const.API_ENDPOINT_ACCOUNT}{self._accountid}{const.API_ENDPOINT_USER}'
 
-    def get(self, all_users: bool = False, userid: str = ''):
+    def get(self, all_users: bool = False, userid: str = '', typed: bool = False):
         """
         Fetch details about all users or a specific user.
 
@@ -26,8 +27,21 @@ class User(util.Resource):
 
         :param all_users: Boolean. Optional. Get a list of all the users in the account. Defaults to False.
         :param userid: String. Optional. ID of a specific user to get the information for.
+        :param typed: Boolean. Optional. Return `UserModel` records instead of dicts. Defaults to False.
         """
 
+        url = self._get_url(all_users=all_users, userid=userid)
+
+        if not util.is_valid_token(self._decoded_token):
+            return False
+
+        response = util.send_api_request(token=self._token, uri=url, method='get', raw=False if typed else None)
+        return models.UserModel.from_response(response) if typed else response
+
+    def _get_url(self, all_users: bool, userid: str) -> str:
+        """
+        Build the request URL for get().
+        """
         url = self._url
 
         if userid:
@@ -35,10 +49,7 @@ class User(util.Resource):
         elif not all_users:
             url += self._userid
 
-        return util.send_api_request(
-            token=self._token,
-            uri=url,
-            method='get') if util.is_valid_token(self._decoded_token) else False
+        return url
 
     def add(self,
             email: str,
@@ -58,7 +69,32 @@ class User(util.Resource):
         Defaults to regular.
         """
 
-        # Checks
+        error = self._check_new_user(email=email, f_name=f_name, l_name=l_name, password=password)
+        if error:
+            return error
+
+        # Request
+        url = self._url
+        body = {
+            "user_fname": f_name,
+            "user_lname": l_name,
+            "email": email,
+            "password": password,
+            "type": user_type
+        }
+
+        return util.send_api_request(
+            token=self._token,
+            uri=url,
+            method='post',
+            body=dumps(body)
+        )
+
+    @staticmethod
+    def _check_new_user(email: str, f_name: str, l_name: str, password: str):
+        """
+        Validate the details of a new user. Returns an error dict, or None if the details are valid.
+        """
         if not password:
             return util.prepare_error(
                 code=const.ERR_USER_DETAIL_EMPTY,
@@ -83,22 +119,7 @@ class User(util.Resource):
                 message='last name cannot be empty'
             )
 
-        # Request
-        url = self._url
-        body = {
-            "user_fname": f_name,
-            "user_lname": l_name,
-            "email": email,
-            "password": password,
-            "type": user_type
-        }
-
-        return util.send_api_request(
-            token=self._token,
-            uri=url,
-            method='post',
-            body=dumps(body)
-        )
+        return None
 
     def delete(self, userid: str):
         """
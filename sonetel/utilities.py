@@ -2,36 +2,123 @@
 Utilities for internal use
 """
 from time import time
+from functools import lru_cache
 import datetime
-import jwt
-import requests
 from . import _constants as const
+from . import codec
 from . import exceptions as e
 
 class Resource:
     """
     Base recource class for Sonetel API
+
+    ``access_token`` is either an access token string or a token provider such as an `Auth` instance.
+    With a token provider the current token is read for every request, so the resource never goes stale.
+
+    Every public method has a ``submit_`` variant, e.g. ``submit_get()``, that returns a `concurrent.futures.Future`.
     """
-    def __init__(self, access_token: str):
+    def __init__(self, access_token):
 
         if not access_token:
             raise e.AuthException("access_token is a required parameter.")
-        self._token: str = access_token
-        self._decoded_token = decode_token(self._token)
-        self._accountid: str = self._decoded_token['acc_id']
-        self._userid: str = self._decoded_token['user_id']
+        self._token = access_token
+        decoded_token = self._decoded_token
+        self._accountid: str = decoded_token['acc_id']
+        self._userid: str = decoded_token['user_id']
 
-        if not is_valid_token(self._decoded_token):
+        if isinstance(access_token, str) and not is_valid_token(decoded_token):
             raise e.AuthException("Token has expired")
 
+    @property
+    def _decoded_token(self) -> dict:
+        """
+        The claims of the current access token.
+        """
+        token = self._token if isinstance(self._token, str) else self._token.get_access_token()
+        return decode_token(token)
+
+    def within(self, seconds: float):
+        """
+        Return a view of this resource whose methods each run with a latency budget of ``seconds``, e.g.
+        ``account.within(0.5).get()``. See `sonetel.deadline`.
+        """
+        from .deadline import budget  # pylint: disable=import-outside-toplevel
+        return ContextView(self, lambda: budget(seconds))
+
+    def with_priority(self, priority: str):
+        """
+        Return a view of this resource whose requests are scheduled with ``priority``, e.g.
+        ``recording.with_priority('bulk').get()``. See `sonetel.scheduler`.
+        """
+        from .scheduler import priority as scheduled  # pylint: disable=import-outside-toplevel
+        return ContextView(self, lambda: scheduled(priority))
+
+    def __getattr__(self, name):
+        # ``submit_<method>`` runs the public method on the shared executor, see sonetel.futures.
+        if name.startswith('submit_'):
+            method = getattr(self, name[len('submit_'):], None)
+            if callable(method) and not name[len('submit_'):].startswith('_'):
+                # pylint: disable=import-outside-toplevel
+                from inspect import iscoroutinefunction
+                from . import futures
+                if iscoroutinefunction(method):
+                    raise AttributeError(f'{name!r} is not available for coroutine methods; use asyncio instead')
+
+                def submit(*args, **kwargs):
+                    return futures.submit(method, *args, **kwargs)
+                submit.__name__ = name
+                submit.__doc__ = f'Run `{method.__name__}()` on the shared executor and return a Future.'
+                return submit
+        raise AttributeError(f'{type(self).__name__!r} object has no attribute {name!r}')
+
+
+class ContextView:
+    """
+    A view of a resource whose methods each run inside the context manager returned by ``context()``.
+    Used by `Resource.within()` and `Resource.with_priority()`; views can be stacked.
+    """
+    __slots__ = ('_resource', '_context')
+
+    def __init__(self, resource, context):
+        self._resource = resource
+        self._context = context
+
+    def __getattr__(self, name):
+        attr = getattr(self._resource, name)
+        if not callable(attr):
+            return attr
+        context = self._context
+
+        from inspect import iscoroutinefunction  # pylint: disable=import-outside-toplevel
+        if iscoroutinefunction(attr):
+            async def run_async(*args, **kwargs):
+                with context():
+                    return await attr(*args, **kwargs)
+            return run_async
+
+        def run(*args, **kwargs):
+            with context():
+                return attr(*args, **kwargs)
+        return run
+
+    def within(self, seconds: float):
+        from .deadline import budget  # pylint: disable=import-outside-toplevel
+        return ContextView(self, lambda: budget(seconds))
+
+    def with_priority(self, priority: str):
+        from .scheduler import priority as scheduled  # pylint: disable=import-outside-toplevel
+        return ContextView(self, lambda: scheduled(priority))
+
+
 # Static methods
 
-def is_valid_token(decoded_token: dict) -> bool:
+def is_valid_token(decoded_token: dict, leeway: int = 60) -> bool:
     """
     Return True if token hasn't expired. Accepts a decoded token.
+    Tokens that expire within ``leeway`` seconds are treated as expired.
+    Use an `Auth` instance as the token provider to have expiring tokens refreshed automatically.
     """
-    # TODO: If token has expired, try to refresh it
-    return decoded_token['exp'] - int(time()) > 60
+    return decoded_token['exp'] - int(time()) > leeway
 
 def is_valid_date(date_text):
     """
@@ -52,10 +139,14 @@ def date_diff(start, end):
     end_date = datetime.datetime.strptime(end, '%Y%m%dT%H:%M:%SZ').strftime('%s')
     return int(end_date) - int(start_date) > 0
 
+@lru_cache(maxsize=1024)
 def decode_token(token) -> dict:
     """
-    Decode the JWT token
+    Decode the JWT token. The most recently used tokens are cached, so the returned dict is shared and
+    must not be modified.
     """
+    # jwt (and cryptography) are imported on first use to keep "import sonetel" fast.
+    import jwt  # pylint: disable=import-outside-toplevel
     return jwt.decode(
         token,
         audience='api.sonetel.com',
@@ -67,41 +158,69 @@ def send_api_request(token: str,
                      uri: str,
                      method: str = 'GET',
                      body: str = None,
-                     body_type: str = const.CONTENT_TYPE_GENERAL) -> dict:
+                     body_type: str = const.CONTENT_TYPE_GENERAL,
+                     raw: bool = None) -> dict:
     """
     Send an API request to Sonetel.
 
-    :param token: Required. String. The access token.
+    If ``token`` is a token provider such as an `Auth` instance, the current access token is read from it and a
+    401 response triggers one token refresh and retry.
+
+    :param token: Required. String or token provider. The access token.
     :param uri: Required. String. The API endpoint to send the request to.
     :param method: Optional. String. The HTTP method to use. Defaults to GET.
     :param body: Optional. String. The body of the request. Defaults to None.
     :param body_type: Optional. String. The content type of the body. Defaults to application/json.
-    :return: A dictionary containing the response.
+    :param raw: Optional. Boolean. Return the undecoded response body. Defaults to True inside `codec.raw_responses()`.
+        Methods that read the response themselves pass False.
+    :return: A dictionary containing the response, or the undecoded response body if ``raw`` is set.
     """
 
+    # requests is imported on first use to keep "import sonetel" fast.
+    import requests  # pylint: disable=import-outside-toplevel
+    from . import transport  # pylint: disable=import-outside-toplevel
+
     # Checks
     if not token:
         raise e.SonetelException('"token" is a required parameter')
     if not uri:
         raise e.SonetelException('"uri" is a required parameter')
 
-    # Prepare the request Header
-    request_header = {
-        "Authorization": "Bearer " + token,
-        "Content-Type": body_type,
-        "User-Agent": f'Sonetel Python Package - v{const.PKG_VERSION}'
-    }
-
-    # Send the request
+    # Send the request. The timeouts are set per endpoint group by the transport.
     try:
-        r = requests.request(
+        provider = None
+        if not isinstance(token, str):
+            provider = token
+            token = provider.get_access_token()
+
+        # Prepare the request Header
+        request_header = {
+            "Authorization": "Bearer " + token,
+            "Content-Type": body_type,
+            "User-Agent": f'Sonetel Python Package - v{const.PKG_VERSION}'
+        }
+
+        r = transport.get_transport().request(
             method=method,
             url=uri,
             headers=request_header,
             data=body,
-            timeout=60
         )
+
+        # The token was rejected: refresh it once and try again.
+        if r.status_code == 401 and provider is not None:
+            request_header["Authorization"] = "Bearer " + provider.refresh(stale_token=token)
+            r = transport.get_transport().request(
+                method=method,
+                url=uri,
+                headers=request_header,
+                data=body,
+            )
         r.raise_for_status()
+    except e.DeadlineExceededException as err:
+        return {'status': 'failed', 'error': 'DeadlineExceeded', 'message': err}
+    except e.CircuitOpenException as err:
+        return {'status': 'failed', 'error': 'CircuitOpen', 'message': err}
     except requests.exceptions.HTTPError as err:
         return {'status': 'failed', 'error': 'HTTPError', 'message': err.response.text}
     except requests.exceptions.ConnectionError as err:
@@ -111,7 +230,9 @@ def send_api_request(token: str,
 
     # pylint: disable=no-member
     if r.status_code == requests.codes.ok:
-        return r.json()
+        if raw is None:
+            raw = codec.is_raw()
+        return r.content if raw else codec.loads(r.content)
 
     r.raise_for_status()
 
@@ -124,3 +245,20 @@ def prepare_error(code: int, message: str) -> dict:
         'code': code,
         'message': message
     }
+
+def map_concurrently(func, items: list, max_workers: int = 8) -> list:
+    """
+    Call ``func`` on every item using up to ``max_workers`` threads. Returns the results in the order of ``items``.
+    """
+    # pylint: disable=import-outside-toplevel
+    from concurrent.futures import ThreadPoolExecutor
+    from contextvars import copy_context
+
+    items = list(items)
+    if not items:
+        return []
+    # Run every item in a copy of the caller's context, so latency budgets and raw_responses() carry over.
+    # Helpers that read the results pass raw=False to send_api_request.
+    context = copy_context()
+    with ThreadPoolExecutor(max_workers=max(min(max_workers, len(items)), 1)) as pool:
+        return list(pool.map(lambda item: context.copy().run(func, item), items))
@@ -3,6 +3,7 @@ Voice apps
 """
 from . import _constants as const
 from . import exceptions as e
+from . import models
 from . import utilities as util
 
 
@@ -18,16 +19,18 @@ class VoiceApp(util.Resource):
         super().__init__(access_token=access_token)
         self._url = f"{const.API_URI_BASE}{const.API_ENDPOINT_ACCOUNT}{self._accountid}{const.API_ENDPOINT_VOICEAPP}"
 
-    def get(self, app_id: str = None):
+    def get(self, app_id: str = None, typed: bool = False):
         """
         Get voice apps. Specify the app_id to get a specific voice app or leave it blank to get all voice apps in the Sonetel account.
 
         :param app_id: Optional. The ID of the voice app to get. Defaults to None.
+        :param typed: Optional. Return `VoiceAppModel` records instead of dicts. Defaults to False.
         """
         if app_id:
             self._url = f"{self._url}/{app_id}"
 
-        return util.send_api_request(token=self._token, uri=self._url)
+        response = util.send_api_request(token=self._token, uri=self._url, raw=False if typed else None)
+        return models.VoiceAppModel.from_response(response) if typed else response
 
     def delete(self, app_id: str):
         """
@@ -0,0 +1,33 @@
+"""
+Shared fixtures for the offline tests
+"""
+from urllib.parse import parse_qs
+
+import pytest
+
+from sonetel import _constants as const
+from sonetel import hooks, transport
+from tests.local_server import LocalServer, make_token
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """
+    A LocalServer that the API and token endpoints point at, behind a fresh transport. The token
+    route hands out a new access token per grant and records the grant types in ``server.grants``.
+    Test modules add routes through ``server.routes`` or override this fixture to extend it.
+    """
+    grants = []
+
+    def token_route(handler):
+        grants.append(parse_qs(handler.body.decode())['grant_type'][0])
+        return 200, {'access_token': make_token(jti=str(len(grants))), 'refresh_token': 'refresh'}, {}
+
+    with LocalServer({('POST', '/oauth/token'): token_route}) as local:
+        local.grants = grants
+        monkeypatch.setattr(const, 'API_URI_AUTH', f'{local.url}/oauth/token')
+        monkeypatch.setattr(const, 'API_URI_BASE', local.url)
+        transport.set_transport(transport.Transport())
+        yield local
+    hooks.clear()
+    transport.set_transport(transport.Transport())
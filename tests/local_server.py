@@ -0,0 +1,78 @@
+"""
+A minimal local HTTP server used by the offline tests.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import time
+
+import jwt
+
+
+def make_token(lifetime: int = 3600, **claims) -> str:
+    """
+    Create an unsigned-looking test access token with the claims the resource classes read.
+    """
+    payload = {
+        'aud': 'api.sonetel.com',
+        'acc_id': '1234',
+        'user_id': '5678',
+        'exp': int(time()) + lifetime,
+    }
+    payload.update(claims)
+    return jwt.encode(payload, 'sonetel-python-offline-test-secret', algorithm='HS256')
+
+
+class LocalServer:
+    """
+    Serve canned JSON responses on localhost. ``routes`` maps ``(method, path)`` to a callable
+    that receives the request handler and returns ``(status, body, headers)``.
+    """
+
+    def __init__(self, routes=None):
+        self.routes = routes or {}
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _handle(self):
+                length = int(self.headers.get('Content-Length') or 0)
+                self.body = self.rfile.read(length) if length else b''
+                server.requests.append((self.command, self.path))
+                route = server.routes.get((self.command, self.path.split('?')[0]))
+                if route is None:
+                    status, body, headers = 200, {'status': 'success', 'response': []}, {}
+                else:
+                    status, body, headers = route(self)
+                payload = body if isinstance(body, bytes) else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                for key, value in headers.items():
+                    self.send_header(key, value)
+                self.end_headers()
+                try:
+                    self.wfile.write(payload)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client gave up, e.g. after a read timeout.
+                    pass
+
+            do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+            def log_message(self, *args):
+                pass
+
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self._httpd.daemon_threads = True
+        self.url = f'http://127.0.0.1:{self._httpd.server_address[1]}'
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._httpd.shutdown()
+        self._httpd.server_close()
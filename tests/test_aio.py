@@ -0,0 +1,176 @@
+"""
+Offline tests for the async client
+"""
+import asyncio
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from sonetel import _constants as const
+from sonetel import aio
+from sonetel import exceptions as e
+from sonetel.retry import RetryPolicy
+from tests.local_server import make_token
+
+
+@pytest.fixture
+def server(server):
+    aio.set_async_transport(aio.AsyncTransport(limit=10))
+    yield server
+
+
+def test_concurrent_requests(server):
+    server.routes[('GET', '/account/1234/phonenumbersubscription/')] = \
+        lambda h: (200, {'status': 'success', 'response': [{'phnum': '+46101234567'}]}, {})
+
+    async def main():
+        numbers = aio.AsyncPhoneNumber(access_token=make_token())
+        results = await asyncio.gather(*(numbers.get() for _ in range(50)))
+        await aio.get_async_transport().close()
+        return results
+
+    results = asyncio.run(main())
+    assert len(results) == 50
+    assert all(r == {'status': 'success', 'response': ['+46101234567']} for r in results)
+
+
+def test_validation_matches_sync(server):
+    async def main():
+        numbers = aio.AsyncPhoneNumber(access_token=make_token())
+        return await numbers.add('not-a-number')
+
+    result = asyncio.run(main())
+    assert result['code'] == const.ERR_NUM_NOT_E164
+    assert server.requests == []
+
+
+def test_http_error(server):
+    server.routes[('DELETE', '/call-recording/abc')] = lambda h: (404, {'detail': 'Invalid recording id'}, {})
+
+    async def main():
+        result = await aio.AsyncRecording(access_token=make_token()).delete('abc')
+        await aio.get_async_transport().close()
+        return result
+
+    result = asyncio.run(main())
+    assert result['status'] == 'failed'
+    assert result['error'] == 'HTTPError'
+
+
+def test_throttling_and_retries(server):
+    statuses = [503, 502, 200]
+    server.routes[('GET', '/account//1234')] = \
+        lambda h: (statuses.pop(0), {'status': 'success', 'response': {}}, {'Retry-After': '0'})
+    policy = RetryPolicy(backoff_base=0.01)
+    aio.set_async_transport(aio.AsyncTransport(retry_policy=policy))
+
+    async def main():
+        result = await aio.AsyncAccount(access_token=make_token()).get()
+        await aio.get_async_transport().close()
+        return result
+
+    assert asyncio.run(main())['status'] == 'success'
+    assert len(server.requests) == 3
+    assert policy.stats()['retries'] == {'account': 1}
+
+
+def test_missing_aiohttp(server, monkeypatch):
+    monkeypatch.setattr(aio, 'aiohttp', None)
+    auth = aio.AsyncAuth('user@example.com', 'password', background_refresh=False)
+
+    with pytest.raises(e.SonetelException):
+        asyncio.run(aio.AsyncAccount(access_token=make_token()).get())
+    with pytest.raises(e.SonetelException):
+        asyncio.run(auth.create_token())
+    assert server.requests == []
+
+
+def test_concurrent_gets_are_coalesced(server):
+    async def main():
+        numbers = aio.AsyncPhoneNumber(access_token=make_token())
+        results = await asyncio.gather(*(numbers.get() for _ in range(50)))
+        await aio.get_async_transport().close()
+        return results
+
+    results = asyncio.run(main())
+    assert len(results) == 50
+    assert len(server.requests) == 1
+    assert aio.get_async_transport().coalesced == 49
+
+
+def test_recording_iter(server):
+    def recordings(handler):
+        query = parse_qs(urlsplit(handler.path).query)
+        day = query['created_date_min'][0][:8]
+        return 200, {'status': 'success', 'response': [
+            {'call_recording_id': f'RE{day}b', 'created_date': f'{day}T12:00:00Z'},
+            {'call_recording_id': f'RE{day}a', 'created_date': f'{day}T06:00:00Z'},
+        ]}, {}
+    server.routes[('GET', '/call-recording')] = recordings
+
+    async def main():
+        recording = aio.AsyncRecording(access_token=make_token())
+        ids = [rec.call_recording_id async for rec in recording.iter(
+            '20230101T00:00:00Z', '20230104T00:00:00Z', parallelism=2, typed=True)]
+        await aio.get_async_transport().close()
+        return ids
+
+    assert asyncio.run(main()) == ['RE20230101a', 'RE20230101b', 'RE20230102a', 'RE20230102b',
+                                   'RE20230103a', 'RE20230103b']
+    assert len(server.requests) == 3
+
+
+def test_recording_download(server, tmp_path):
+    audio = b'audio' * 1000
+    server.routes[('GET', '/files/RE1.mp3')] = lambda h: (200, audio, {})
+    server.routes[('GET', '/call-recording/RE1')] = lambda h: (200, {'status': 'success', 'response': {
+        'call_recording_id': 'RE1',
+        'file_access_details': {'file_download_url': f'{server.url}/files/RE1.mp3'},
+    }}, {})
+
+    async def main():
+        recording = aio.AsyncRecording(access_token=make_token())
+        single = await recording.within(5).download(rec_id='RE1', path=str(tmp_path / 'one.mp3'))
+        many = await recording.download_many(['RE1'], directory=str(tmp_path / 'many'))
+        return single, many
+
+    single, many = asyncio.run(main())
+    assert single['response']['size'] == len(audio)
+    assert (tmp_path / 'one.mp3').read_bytes() == audio
+    assert [f['size'] for f in many['response']] == [len(audio)]
+
+
+def test_phonenumber_add_many(server):
+    server.routes[('POST', '/account/1234/phonenumbersubscription/')] = \
+        lambda h: (400, {'status': 'failed'}, {}) if b'46102' in h.body else (200, {'status': 'success'}, {})
+
+    async def main():
+        numbers = aio.AsyncPhoneNumber(access_token=make_token())
+        result = await numbers.add_many(['+46101234567', '+46102234567', 'abc', '+46101234567'], max_workers=2)
+        await aio.get_async_transport().close()
+        return result
+
+    result = asyncio.run(main())
+    assert list(result['response']['succeeded']) == ['+46101234567']
+    assert list(result['response']['failed']) == ['+46102234567']
+    assert list(result['response']['invalid']) == ['abc']
+    assert result['response']['duplicates'] == ['+46101234567']
+    assert len(server.requests) == 2
+
+
+def test_typed_responses(server):
+    server.routes[('GET', '/account//1234')] = \
+        lambda h: (200, {'status': 'success', 'response': {'account_id': '1234', 'name': 'ACME'}}, {})
+    server.routes[('GET', '/account/1234/user/')] = \
+        lambda h: (200, {'status': 'success', 'response': [{'user_id': '5678', 'email': 'a@example.com'}]}, {})
+
+    async def main():
+        token = make_token()
+        account = await aio.AsyncAccount(access_token=token).get(typed=True)
+        users = await aio.AsyncUser(access_token=token).get(all_users=True, typed=True)
+        await aio.get_async_transport().close()
+        return account, users
+
+    account, users = asyncio.run(main())
+    assert account['response'].name == 'ACME'
+    assert users['response'][0].email == 'a@example.com'
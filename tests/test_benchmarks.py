@@ -0,0 +1,23 @@
+"""
+Smoke test for the offline benchmark suite
+"""
+import json
+
+from sonetel import _constants as const
+from benchmarks import run
+
+
+def test_benchmarks_write_json(tmp_path, monkeypatch):
+    monkeypatch.setattr(const, 'API_URI_BASE', const.API_URI_BASE)
+    monkeypatch.setattr(const, 'API_URI_AUTH', const.API_URI_AUTH)
+    output = tmp_path / 'results.json'
+    run.main(['--only', 'overhead', 'throughput', 'memory', '--iterations', '3', '--calls', '4',
+              '--concurrency', '1', '2', '--recordings', '50', '--users', '20', '--latency', '0',
+              '--output', str(output)])
+
+    results = json.loads(output.read_text())
+    assert set(results) == {'meta', 'overhead', 'throughput', 'memory'}
+    assert results['meta']['server_requests'] > 0
+    assert 'overhead_us' in results['overhead']['Account.get']
+    assert results['throughput']['Call.callback']['2'] > 0
+    assert results['memory']['Recording.get']['records'] == 50
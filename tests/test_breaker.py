@@ -0,0 +1,121 @@
+"""
+Offline tests for the circuit breaker
+"""
+import time
+
+import pytest
+
+from sonetel import _constants as const
+from sonetel import exceptions as e
+from sonetel import hooks, transport
+from sonetel import Account, Auth
+from sonetel.breaker import CircuitBreaker
+from sonetel.ratelimit import RateLimiter
+from sonetel.retry import RetryPolicy
+from tests.local_server import LocalServer, make_token
+
+URL = f'{const.API_URI_BASE}/account/1234'
+
+
+def test_opens_on_failure_rate():
+    breaker = CircuitBreaker(window=10, min_calls=4, failure_rate=0.5)
+    for failed in (False, True, False):
+        breaker.before('GET', URL, 'account')
+        breaker.record('GET', URL, 'account', 0.01, failed)
+    assert breaker.state('account') == 'closed'
+
+    breaker.record('GET', URL, 'account', 0.01, True)
+    assert breaker.state('account') == 'open'
+    with pytest.raises(e.CircuitOpenException):
+        breaker.before('GET', URL, 'account')
+    assert breaker.stats()['account']['rejected'] == 1
+
+    # Other groups and groups without a circuit are not affected.
+    breaker.before('GET', URL, 'users')
+    breaker.before('GET', URL, 'other')
+
+
+def test_opens_on_slow_calls():
+    breaker = CircuitBreaker(window=10, min_calls=2, slow_call_rate=1.0, slow_call_duration=0.5)
+    breaker.record('GET', URL, 'account', 1.0, False)
+    breaker.record('GET', URL, 'account', 1.0, False)
+    assert breaker.state('account') == 'open'
+
+
+def test_half_open_probes():
+    breaker = CircuitBreaker(window=10, min_calls=1, open_duration=0.05, probes=2)
+    breaker.record('GET', URL, 'account', 0.01, True)
+    time.sleep(0.06)
+
+    breaker.before('GET', URL, 'account')
+    breaker.before('GET', URL, 'account')
+    assert breaker.state('account') == 'half_open'
+    with pytest.raises(e.CircuitOpenException):
+        breaker.before('GET', URL, 'account')
+
+    breaker.record('GET', URL, 'account', 0.01, False)
+    breaker.record('GET', URL, 'account', 0.01, True)
+    assert breaker.state('account') == 'open'
+
+    time.sleep(0.06)
+    for _ in range(2):
+        breaker.before('GET', URL, 'account')
+        breaker.record('GET', URL, 'account', 0.01, False)
+    assert breaker.state('account') == 'closed'
+    assert breaker.stats()['account']['opened'] == 2
+
+
+@pytest.fixture
+def server(server):
+    server.routes[('GET', '/account//1234')] = lambda h: (500, {'status': 'failed'}, {})
+    yield server
+
+
+def test_transport_fails_fast(server):
+    events = []
+    hooks.subscribe(hooks.CIRCUIT_STATE, events.append)
+    transport.configure(circuit_breaker=CircuitBreaker(min_calls=3), retry_policy=RetryPolicy(max_attempts=1))
+    account = Account(access_token=make_token())
+
+    for _ in range(3):
+        assert account.get()['error'] == 'HTTPError'
+    result = account.get()
+    assert result['error'] == 'CircuitOpen'
+    assert isinstance(result['message'], e.CircuitOpenException)
+    assert len(server.requests) == 3
+    assert [(event.group, event.state) for event in events] == [('account', 'open')]
+
+
+def test_open_auth_circuit_fails_token_requests(monkeypatch):
+    token_route = lambda h: (200, {'access_token': make_token(), 'refresh_token': 'refresh'}, {})
+    with LocalServer({('POST', '/oauth/token'): token_route}) as local:
+        monkeypatch.setattr(const, 'API_URI_AUTH', f'{local.url}/oauth/token')
+        auth = Auth('user@example.com', 'password', background_refresh=False)
+
+        breaker = CircuitBreaker(min_calls=1)
+        breaker.record('POST', const.API_URI_AUTH, 'auth', 0.01, True)
+        transport.configure(circuit_breaker=breaker)
+        try:
+            assert auth.create_token()['error'] == 'CircuitOpen'
+
+            scheduled = []
+            monkeypatch.setattr(auth, '_schedule_refresh', lambda delay=None: scheduled.append(delay))
+            auth._background_refresh(auth.get_access_token())
+            assert len(scheduled) == 1
+            assert len(local.requests) == 1
+        finally:
+            transport.set_transport(transport.Transport())
+
+
+def test_open_circuit_skips_rate_limit(server):
+    breaker = CircuitBreaker(min_calls=1)
+    breaker.record('GET', URL, 'account', 0.01, True)
+    t = transport.configure(circuit_breaker=breaker, rate_limiter=RateLimiter({'account': (1, 1)}))
+    account = Account(access_token=make_token())
+
+    started = time.monotonic()
+    for _ in range(3):
+        assert account.get()['error'] == 'CircuitOpen'
+    assert time.monotonic() - started < 0.5
+    assert t.stats()['requests'] == 0
+    assert server.requests == []
@@ -0,0 +1,72 @@
+"""
+Offline tests for the response cache
+"""
+import time
+
+from sonetel import transport
+from sonetel.breaker import CircuitBreaker
+from sonetel.cache import ResponseCache
+from tests.local_server import LocalServer
+
+NUMBERS = '/account/1234/phonenumbersubscription/'
+
+
+def test_cache_hit_and_invalidation():
+    cache = ResponseCache()
+    t = transport.Transport(cache=cache)
+    with LocalServer() as server:
+        url = f'{server.url}{NUMBERS}'
+        for _ in range(3):
+            assert t.request('get', url, timeout=5).json()['status'] == 'success'
+        assert len(server.requests) == 1
+
+        t.request('delete', f'{url}+46101234567', timeout=5)
+        t.request('get', url, timeout=5)
+        assert len(server.requests) == 3
+
+    assert cache.stats()['hits'] == 2
+    assert cache.stats()['invalidations'] == 1
+    t.close()
+
+
+def test_stale_while_revalidate():
+    cache = ResponseCache(ttl={'numbers': 0.3}, stale_while_revalidate=10)
+    t = transport.Transport(cache=cache)
+    with LocalServer() as server:
+        url = f'{server.url}{NUMBERS}'
+        first = t.request('get', url, timeout=5)
+        time.sleep(0.35)
+        assert t.request('get', url, timeout=5) is first
+        time.sleep(0.1)
+        assert t.request('get', url, timeout=5) is not first
+    assert cache.stats()['stale_hits'] == 1
+    assert len(server.requests) == 2
+    t.close()
+
+
+def test_failed_revalidation_releases_entry():
+    cache = ResponseCache(ttl={'numbers': 0.1}, stale_while_revalidate=10)
+    breaker = CircuitBreaker(min_calls=1)
+    t = transport.Transport(cache=cache, circuit_breaker=breaker)
+    with LocalServer() as server:
+        url = f'{server.url}{NUMBERS}'
+        first = t.request('get', url, timeout=5)
+        time.sleep(0.15)
+        breaker.record('GET', url, 'numbers', 0.0, failed=True)
+        assert t.request('get', url, timeout=5) is first
+        time.sleep(0.1)
+
+        # The open circuit failed the revalidation. The next stale hit tries again.
+        breaker.reset()
+        assert t.request('get', url, timeout=5) is first
+        time.sleep(0.1)
+    assert len(server.requests) == 2
+    t.close()
+
+
+def test_lru_eviction():
+    cache = ResponseCache(max_entries=2)
+    for i in range(3):
+        cache.set((f'/voiceapp/{i}', None), object())
+    assert cache.stats()['evictions'] == 1
+    assert cache.get(('/voiceapp/0', None), 'voiceapps')[0] is None
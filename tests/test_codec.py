@@ -0,0 +1,44 @@
+"""
+Offline tests for the JSON codec
+"""
+import json
+
+from sonetel import codec
+from sonetel import Account, PhoneNumber, Recording
+from tests.local_server import make_token
+
+
+def test_codecs_round_trip():
+    previous = codec.name
+    try:
+        for name in codec.CODECS:
+            codec.set_codec(name)
+            assert codec.loads(codec.dumps({'a': [1, 'b']})) == {'a': [1, 'b']}
+        codec.set_codec(encoder=json.dumps, decoder=json.loads)
+        assert codec.name == 'custom'
+    finally:
+        codec.set_codec(previous)
+
+
+def test_raw_responses(server):
+    recording = Recording(access_token=make_token())
+    assert recording.get() == {'status': 'success', 'response': []}
+    with codec.raw_responses():
+        assert json.loads(recording.get()) == {'status': 'success', 'response': []}
+        assert isinstance(recording.get(), bytes)
+
+
+def test_helpers_decode_inside_raw_responses(server):
+    account = {'status': 'success', 'response': {'credit_balance': '1.23', 'currency': 'USD'}}
+    numbers = {'status': 'success', 'response': [{'phnum': '+46101234567'}]}
+    server.routes[('GET', '/account//1234')] = lambda h: (200, account, {})
+    server.routes[('GET', '/account/1234/phonenumbersubscription/')] = lambda h: (200, numbers, {})
+    token = make_token()
+
+    with codec.raw_responses():
+        assert Account(access_token=token).get_balance(currency=True) == '1.23 USD'
+        assert PhoneNumber(access_token=token).get()['response'] == ['+46101234567']
+        result = PhoneNumber(access_token=token).add_many(['+46101234567', '+46101234568'])
+        assert result['status'] == 'success'
+        assert len(result['response']['succeeded']) == 2
+        assert isinstance(Account(access_token=token).get(), bytes)
@@ -0,0 +1,94 @@
+"""
+Offline tests for the adaptive concurrency limiter
+"""
+import threading
+import time
+
+import pytest
+
+from sonetel import exceptions as e
+from sonetel import transport
+from sonetel import Call
+from sonetel.concurrency import AdaptiveLimiter
+from sonetel.dialer import Dialer
+from sonetel.ratelimit import RateLimiter
+from tests.local_server import make_token
+
+
+def test_limit_grows_while_latency_is_stable():
+    limiter = AdaptiveLimiter(initial_limit=2, max_limit=4)
+    for _ in range(50):
+        limiter.acquire('callback')
+        limiter.acquire('callback')
+        limiter.record('callback', 0.01)
+        limiter.record('callback', 0.01)
+        limiter.release('callback')
+        limiter.release('callback')
+    assert limiter.limit('callback') == 4
+    assert limiter.limit('numbers') == 2
+
+
+def test_limit_drops_on_latency_and_throttling():
+    limiter = AdaptiveLimiter(initial_limit=10, decrease=0.5)
+    limiter.record('numbers', 0.01)
+    limiter.record('numbers', 0.1)
+    assert limiter.limit('numbers') == 5
+    # At most one decrease per round trip.
+    limiter.record('numbers', 0.1)
+    assert limiter.limit('numbers') == 5
+
+    limiter.record('users', 0.0, dropped=True)
+    assert limiter.limit('users') == 5
+    assert limiter.stats()['users']['drops'] == 1
+
+
+def test_acquire_waits_for_a_slot():
+    limiter = AdaptiveLimiter(initial_limit=1)
+    assert limiter.acquire('account') is False
+    with pytest.raises(e.DeadlineExceededException):
+        limiter.acquire('account', timeout=0.05)
+
+    threading.Timer(0.05, limiter.release, args=('account',)).start()
+    assert limiter.acquire('account', timeout=1) is True
+    assert limiter.stats()['account']['waiting'] == 0
+
+
+@pytest.fixture
+def server(server):
+    lock = threading.Lock()
+    active = [0]
+
+    def callback(handler):
+        with lock:
+            active[0] += 1
+            server.peak = max(server.peak, active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return 200, {'status': 'success'}, {}
+
+    server.peak = 0
+    server.routes[('POST', '/make-calls/call/call-back')] = callback
+    yield server
+
+
+def test_dialer_is_limited(server):
+    limiter = AdaptiveLimiter(initial_limit=2, max_limit=2)
+    transport.configure(concurrency_limiter=limiter)
+    pairs = [(f'agent{i}', f'+100{i}') for i in range(12)]
+    stats = Dialer(Call(make_token()), rate=1000, max_in_flight=8).run(pairs)
+
+    assert stats['placed'] == 12
+    assert server.peak <= 2
+    assert limiter.stats()['callback']['in_flight'] == 0
+
+
+def test_throttled_responses_cut_the_limit(server):
+    replies = iter([(429, {}, {'Retry-After': '0'})] + [(200, {'status': 'success'}, {})] * 2)
+    server.routes[('POST', '/make-calls/call/call-back')] = lambda h: next(replies)
+    limiter = AdaptiveLimiter(initial_limit=8, decrease=0.5)
+    transport.configure(concurrency_limiter=limiter, rate_limiter=RateLimiter())
+
+    assert Call(make_token()).callback('agent', '+1001')['status'] == 'success'
+    assert limiter.limit('callback') == 4
+    assert limiter.stats()['callback']['drops'] == 1
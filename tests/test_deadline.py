@@ -0,0 +1,74 @@
+"""
+Offline tests for latency budgets and per-group timeouts
+"""
+import time
+
+import pytest
+import requests
+
+from sonetel import deadline, futures, transport
+from sonetel import exceptions as e
+from sonetel import Account, Auth
+from sonetel.ratelimit import RateLimiter
+from sonetel.retry import RetryPolicy
+from tests.local_server import make_token
+
+
+def slow(handler):
+    time.sleep(0.5)
+    return 200, {'status': 'success', 'response': {}}, {}
+
+
+@pytest.fixture
+def server(server):
+    server.routes[('GET', '/account//1234')] = slow
+    yield server
+
+
+def test_budget_fails_fast(server):
+    account = Account(access_token=make_token())
+    started = time.monotonic()
+    result = account.within(0.2).get()
+    assert result['status'] == 'failed'
+    assert time.monotonic() - started < 0.45
+    assert len(server.requests) == 1
+
+
+def test_rate_limit_wait_respects_budget(server):
+    transport.configure(rate_limiter=RateLimiter({'account': (0.5, 1)}))
+    server.routes[('GET', '/account//1234')] = lambda h: (200, {'status': 'success', 'response': {}}, {})
+    account = Account(access_token=make_token())
+    assert account.get()['status'] == 'success'
+    with deadline.budget(0.5):
+        result = account.get()
+    assert result['error'] == 'DeadlineExceeded'
+    assert len(server.requests) == 1
+
+
+def test_group_timeouts(server):
+    t = transport.Transport(timeouts=deadline.Timeouts(groups={'account': (1, 0.1)}),
+                            retry_policy=RetryPolicy(max_attempts=1))
+    with pytest.raises(requests.exceptions.ReadTimeout):
+        t.request('get', f'{server.url}/account//1234')
+    assert t.request('get', f'{server.url}/account//1234', timeout=2).status_code == 200
+
+
+def test_budgets_nest_and_follow_futures():
+    assert deadline.remaining() is None
+    with deadline.budget(10):
+        with deadline.budget(0.5):
+            assert deadline.remaining() <= 0.5
+            assert 0 < futures.submit(deadline.remaining).result() <= 0.5
+        with deadline.budget(20):
+            assert deadline.remaining() <= 10
+    assert deadline.remaining() is None
+
+
+def test_refresh_waits_within_budget(server):
+    auth = Auth('user@example.com', 'password', background_refresh=False)
+    auth._refresh_lock.acquire()
+    try:
+        with deadline.budget(0.1), pytest.raises(e.DeadlineExceededException):
+            auth.refresh()
+    finally:
+        auth._refresh_lock.release()
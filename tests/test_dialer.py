@@ -0,0 +1,57 @@
+"""
+Offline tests for the callback dialer
+"""
+import json
+from time import monotonic
+
+import pytest
+
+from sonetel import Call
+from sonetel.dialer import Dialer
+from tests.local_server import make_token
+
+
+@pytest.fixture
+def server(server):
+    calls = []
+
+    def callback(handler):
+        body = json.loads(handler.body)
+        calls.append((body['call1'], monotonic()))
+        if body['call2'] == '+1999':
+            return 400, {'status': 'failed'}, {}
+        return 200, {'status': 'success'}, {}
+
+    server.calls = calls
+    server.routes[('POST', '/make-calls/call/call-back')] = callback
+    yield server
+
+
+def test_dialer_paces_destinations_and_resumes(server, tmp_path):
+    state = str(tmp_path / 'campaign.state')
+    pairs = [('agent1', '+1001'), ('agent1', '+1002'), ('agent2', '+1003'), ('agent2', '+1999')]
+
+    stats = Dialer(Call(make_token()), rate=100, max_in_flight=4, per_destination_interval=0.2,
+                   state_file=state).run(pairs)
+
+    assert (stats['placed'], stats['failed']) == (3, 1)
+    agent1 = [t for num, t in server.calls if num == 'agent1']
+    assert agent1[1] - agent1[0] >= 0.15
+    assert [num for num, _ in server.calls[:2]] == ['agent1', 'agent2']
+
+    stats = Dialer(Call(make_token()), rate=100, state_file=state).run(pairs)
+    assert (stats['placed'], stats['failed'], stats['skipped']) == (0, 1, 3)
+
+
+def test_dialer_dedupes_pairs_and_stops_on_progress_error(server):
+    pairs = [('agent1', '+1001'), ('agent1', '+1001'), ('agent2', '+1002')]
+    stats = Dialer(Call(make_token()), rate=100).run(pairs)
+    assert (stats['placed'], stats['duplicates']) == (2, 1)
+
+    def on_progress(stats):
+        raise ValueError('broken listener')
+
+    pairs = [(f'agent{i}', f'+100{i}') for i in range(20)]
+    with pytest.raises(ValueError):
+        Dialer(Call(make_token()), rate=20, max_in_flight=1, on_progress=on_progress).run(pairs)
+    assert len(server.calls) < 2 + 20
@@ -0,0 +1,71 @@
+"""
+Offline tests for the futures API
+"""
+import concurrent.futures
+import threading
+import time
+
+import pytest
+
+from sonetel import futures, transport
+from sonetel import PhoneNumber, User
+from tests.local_server import make_token
+
+
+@pytest.fixture
+def server(server):
+    transport.set_transport(transport.Transport(pool_maxsize=8))
+    futures.configure()
+    yield server
+
+
+def test_submit_variants(server):
+    def user(handler):
+        user_id = handler.path.rsplit('/', 1)[1]
+        time.sleep(0.05 if user_id == '1' else 0)
+        return 200, {'status': 'success', 'response': {'user_id': user_id}}, {}
+
+    for user_id in range(5):
+        server.routes[('GET', f'/account/1234/user/{user_id}')] = user
+
+    users = User(access_token=make_token())
+    pending = [users.submit_get(userid=str(user_id)) for user_id in range(5)]
+    assert all(isinstance(future, concurrent.futures.Future) for future in pending)
+    assert [r['response']['user_id'] for r in futures.gather(pending)] == ['0', '1', '2', '3', '4']
+    assert futures.get_executor().max_workers == 8
+
+
+def test_gather_exceptions(server):
+    def fail():
+        raise ValueError('boom')
+
+    pending = [futures.submit(lambda: 1), futures.submit(fail)]
+    with pytest.raises(ValueError):
+        futures.gather(pending)
+    results = futures.gather(pending, return_exceptions=True)
+    assert results[0] == 1 and isinstance(results[1], ValueError)
+
+    with pytest.raises(concurrent.futures.TimeoutError):
+        futures.gather([futures.submit(time.sleep, 0.5)], timeout=0.01)
+
+
+def test_submit_is_bounded():
+    executor = futures.BoundedExecutor(max_workers=1, max_pending=2)
+    release = threading.Event()
+    executor.submit(release.wait)
+    executor.submit(release.wait)
+
+    submitted = threading.Event()
+    threading.Thread(target=lambda: (executor.submit(lambda: None), submitted.set()), daemon=True).start()
+    assert not submitted.wait(0.1)
+    release.set()
+    assert submitted.wait(1)
+    executor.shutdown()
+
+
+def test_unknown_and_private_methods():
+    numbers = PhoneNumber(access_token=make_token())
+    with pytest.raises(AttributeError):
+        numbers.submit_nothing()
+    with pytest.raises(AttributeError):
+        numbers.submit__add_job()
@@ -0,0 +1,74 @@
+"""
+Offline tests for hedged requests
+"""
+import threading
+import time
+
+from sonetel import transport
+from sonetel.hedge import HedgePolicy
+from tests.local_server import LocalServer
+
+
+def test_slow_request_is_hedged():
+    calls = []
+
+    def route(handler):
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            time.sleep(1)
+        return 200, {'status': 'success', 'response': len(calls)}, {}
+
+    policy = HedgePolicy(max_delay=0.1, budget=1)
+    t = transport.Transport(hedge_policy=policy)
+    with LocalServer({('GET', '/account/1234'): route}) as server:
+        started = time.monotonic()
+        response = t.request('get', f'{server.url}/account/1234', timeout=5)
+        assert time.monotonic() - started < 0.8
+        assert response.json()['response'] == 2
+    assert policy.stats() == {'requests': 1, 'hedged': 1, 'hedge_wins': 1, 'budget_exhausted': 0, 'saturated': 0}
+
+
+def test_budget_caps_hedges():
+    def route(handler):
+        time.sleep(0.05)
+        return 200, {'status': 'success'}, {}
+
+    policy = HedgePolicy(min_delay=0.001, max_delay=0.001, budget=0.25, max_burst=1)
+    t = transport.Transport(hedge_policy=policy, coalesce=False)
+    with LocalServer({('GET', '/account/1234'): route, ('POST', '/account/1234'): route}) as server:
+        for _ in range(8):
+            t.request('get', f'{server.url}/account/1234', timeout=5)
+        t.request('post', f'{server.url}/account/1234', timeout=5)
+        assert len(server.requests) == 8 + policy.hedged + 1
+    assert policy.stats()['requests'] == 8
+    assert policy.hedged == 2
+    assert policy.budget_exhausted == 6
+
+
+def test_delay_follows_percentile():
+    policy = HedgePolicy(percentile=90, min_delay=0.01, max_delay=1)
+    assert policy.delay('account') == 1
+    for i in range(100):
+        policy.record('account', i / 1000)
+    assert policy.delay('account') == 0.09
+    assert not policy.applies('GET', 'auth', {})
+    assert not policy.applies('GET', 'recordings', {'stream': True})
+
+
+def test_busy_pool_does_not_cap_concurrency():
+    def route(handler):
+        time.sleep(0.2)
+        return 200, {'status': 'success'}, {}
+
+    policy = HedgePolicy(max_workers=2, budget=0)
+    t = transport.Transport(hedge_policy=policy, coalesce=False, pool_maxsize=8)
+    with LocalServer({('GET', '/account/1234'): route}) as server:
+        threads = [threading.Thread(target=t.request, args=('get', f'{server.url}/account/1234'))
+                   for _ in range(8)]
+        started = time.monotonic()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert time.monotonic() - started < 0.5
+    assert policy.stats()['saturated'] == 6
@@ -0,0 +1,104 @@
+"""
+Offline tests for request hooks and metrics
+"""
+import pytest
+
+from sonetel import hooks, transport
+from sonetel import Account, Auth
+from sonetel.metrics import Metrics
+from sonetel.retry import RetryPolicy
+from tests.local_server import make_token
+
+
+@pytest.fixture
+def server(server):
+    transport.set_transport(transport.Transport(retry_policy=RetryPolicy(backoff_base=0.01)))
+    yield server
+
+
+def test_endpoint_template():
+    assert hooks.endpoint_template('https://x/account//1234') == '/account/{account_id}'
+    assert hooks.endpoint_template('https://x/account/1234/phonenumbersubscription/%2B4610') == \
+        '/account/{account_id}/phonenumbersubscription/{number}'
+    assert hooks.endpoint_template('https://x/account/1234/user/') == '/account/{account_id}/user/'
+    assert hooks.endpoint_template('https://x/call-recording?created_date_min=1') == '/call-recording'
+
+
+def test_no_events_without_listeners(server, monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError('event created without listeners')
+
+    monkeypatch.setattr(hooks, 'Event', fail)
+    assert not hooks.active
+    assert Account(access_token=make_token()).get()['status'] == 'success'
+
+
+def test_request_events(server):
+    events = []
+    for name in hooks.EVENTS:
+        hooks.subscribe(name, events.append)
+
+    calls = iter([(502, {}, {}), (200, {'status': 'success', 'response': {'name': 'ACME'}}, {})])
+    server.routes[('GET', '/account//1234')] = lambda h: next(calls)
+    Account(access_token=make_token()).get()
+
+    assert [event.name for event in events] == [
+        'before_send', 'after_response', 'retry', 'before_send', 'after_response'
+    ]
+    response = events[-1]
+    assert (response.method, response.endpoint, response.group, response.status, response.attempt) == \
+        ('GET', '/account/{account_id}', 'account', 200, 2)
+    assert response.bytes > 0 and response.duration > 0
+
+    hooks.unsubscribe(hooks.BEFORE_SEND, events.append)
+    events.clear()
+    Auth('user@example.com', 'password', background_refresh=False).refresh()
+    assert [event.name for event in events] == ['after_response', 'after_response', 'token_refresh']
+    assert events[-1].error is None
+
+
+def test_broken_listener_does_not_fail_requests(server):
+    hooks.subscribe(hooks.AFTER_RESPONSE, lambda event: 1 / 0)
+    assert Account(access_token=make_token()).get()['status'] == 'success'
+
+
+def test_metrics(server):
+    metrics = Metrics(buckets=(0.5, 5.0)).attach()
+    server.routes[('GET', '/account//1234')] = lambda h: (404, {'status': 'failed'}, {})
+    account = Account(access_token=make_token())
+    account.get()
+    account.get()
+    server.routes[('GET', '/account//1234')] = lambda h: (200, {'status': 'success', 'response': {}}, {})
+    account.get()
+    metrics.detach()
+    account.get()
+
+    stats = metrics.stats()['GET /account/{account_id}']
+    assert stats['requests'] == 3
+    assert stats['errors'] == 2
+    assert stats['error_rate'] == pytest.approx(2 / 3)
+    assert stats['statuses'] == {'404': 2, '200': 1}
+    assert sum(stats['latency'].values()) == 3
+
+    text = metrics.prometheus()
+    assert '# TYPE sonetel_request_duration_seconds histogram' in text
+    assert 'sonetel_request_duration_seconds_bucket{method="GET",endpoint="/account/{account_id}",le="+Inf"} 3' in text
+    assert 'sonetel_requests_total{method="GET",endpoint="/account/{account_id}",status="404"} 2' in text
+    assert 'sonetel_request_errors_total{method="GET",endpoint="/account/{account_id}"} 2' in text
+
+
+def test_async_request_events(server):
+    import asyncio
+    from sonetel import aio
+
+    events = []
+    hooks.subscribe(hooks.AFTER_RESPONSE, events.append)
+
+    async def main():
+        aio.set_async_transport(aio.AsyncTransport(limit=10))
+        await aio.AsyncAccount(access_token=make_token()).get()
+        await aio.get_async_transport().close()
+
+    asyncio.run(main())
+    assert [(event.method, event.endpoint, event.status) for event in events] == \
+        [('GET', '/account/{account_id}', 200)]
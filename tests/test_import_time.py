@@ -0,0 +1,32 @@
+"""
+Guard the import time of the package: `import sonetel` must not load requests, PyJWT or cryptography, and
+importing a resource class must stay within the time budget.
+"""
+import subprocess
+import sys
+
+import pytest
+
+from benchmarks.run import import_time_us
+
+# Cumulative import time budget, in microseconds, for the sonetel modules loaded by one resource class.
+IMPORT_BUDGET_US = 60000
+HEAVY_MODULES = ('requests', 'jwt', 'cryptography', 'urllib3')
+RESOURCES = ('Account', 'Auth', 'Call', 'PhoneNumber', 'Recording', 'User', 'VoiceApp')
+
+
+def test_import_sonetel_is_light():
+    statement = 'import sys, sonetel; print(",".join(m for m in %r if m in sys.modules))' % (HEAVY_MODULES,)
+    loaded = subprocess.run([sys.executable, '-c', statement], capture_output=True, text=True, check=True)
+    assert loaded.stdout.strip() == ''
+
+
+def test_codec_is_chosen_on_first_use():
+    statement = 'import sys; from sonetel import Account; print("orjson" in sys.modules)'
+    loaded = subprocess.run([sys.executable, '-c', statement], capture_output=True, text=True, check=True)
+    assert loaded.stdout.strip() == 'False'
+
+
+@pytest.mark.parametrize('resource', RESOURCES)
+def test_resource_import_budget(resource):
+    assert import_time_us(f'from sonetel import {resource}') < IMPORT_BUDGET_US
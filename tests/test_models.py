@@ -0,0 +1,60 @@
+"""
+Offline tests for the typed response models
+"""
+import tracemalloc
+
+from sonetel import models
+
+
+def recording(i):
+    return {
+        'call_recording_id': f'RE{i}',
+        'account_id': 1234,
+        'created_date': '20230101T00:00:00Z',
+        'expiry_date': '20240101T00:00:00Z',
+        'type': 'voice_call',
+        'voice_call_details': {'from': '+46101234567', 'to': '+12125551234', 'duration': i},
+        'file_access_details': {'file_download_url': f'https://example.com/RE{i}.mp3', 'expiry': 3600},
+    }
+
+
+def allocated(build):
+    tracemalloc.start()
+    data = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    assert data
+    return size
+
+
+def test_models_use_less_than_half_the_memory():
+    raw = [recording(i) for i in range(5000)]
+    dict_size = allocated(lambda: [dict(r, voice_call_details=dict(r['voice_call_details']),
+                                        file_access_details=dict(r['file_access_details'])) for r in raw])
+    model_size = allocated(lambda: models.RecordingModel.from_list(raw))
+    assert model_size < dict_size / 2
+
+
+def test_model_access_and_round_trip():
+    rec = models.RecordingModel(recording(1))
+    assert rec.call_recording_id == 'RE1'
+    assert rec['type'] == 'voice_call'
+    assert rec.file_access_details.file_download_url == 'https://example.com/RE1.mp3'
+    assert rec.to_dict() == recording(1)
+
+
+def test_from_response_leaves_failures_alone():
+    failed = {'status': 'failed', 'error': 'HTTPError'}
+    assert models.UserModel.from_response(failed) is failed
+    result = models.UserModel.from_response({'status': 'success', 'response': {'user_id': '1', 'extra': [1, {'a': 2}]}})
+    assert result['response'].user_id == '1'
+    assert result['response'].extra[1].a == 2
+
+
+def test_model_list_round_trip():
+    raw = [recording(i) for i in range(3)] + [{'call_recording_id': 'RE9', 'new_field': {}}]
+    records = models.RecordingModel.from_list(raw)
+    assert len(records) == 4
+    assert records[-1].new_field.to_dict() == {}
+    assert records[1].voice_call_details.duration == 1
+    assert records.to_list() == raw
@@ -0,0 +1,36 @@
+"""
+Offline tests for the bulk phone number methods
+"""
+from sonetel import _constants as const
+from sonetel import PhoneNumber
+from tests.local_server import make_token
+
+
+def test_add_many(server):
+    server.routes[('POST', '/account/1234/phonenumbersubscription/')] = \
+        lambda h: (400, {'status': 'failed'}, {}) if b'46102' in h.body else (200, {'status': 'success'}, {})
+
+    result = PhoneNumber(access_token=make_token()).add_many(['+46101234567', '+46102234567', 'abc'])
+
+    assert list(result['response']['succeeded']) == ['+46101234567']
+    assert list(result['response']['failed']) == ['+46102234567']
+    assert result['response']['invalid']['abc']['code'] == const.ERR_NUM_NOT_E164
+    assert len(server.requests) == 2
+
+
+def test_update_many_validates_up_front(server):
+    result = PhoneNumber(access_token=make_token()).update_many([
+        ('+46101234567', 'user', '5678'),
+        ('+46101234568', 'fax', '5678'),
+    ])
+    assert list(result['response']['succeeded']) == ['+46101234567']
+    assert result['response']['invalid']['+46101234568']['code'] == const.ERR_NUM_UPDATE_EMPTY
+    assert server.requests == [('PUT', '/account/1234/phonenumbersubscription/+46101234567')]
+
+
+def test_duplicates_are_sent_once(server):
+    result = PhoneNumber(access_token=make_token()).delete_many(['+46101234567', 'abc', '+46101234567', 'abc'])
+    assert list(result['response']['succeeded']) == ['+46101234567']
+    assert list(result['response']['invalid']) == ['abc']
+    assert result['response']['duplicates'] == ['+46101234567', 'abc']
+    assert len(server.requests) == 1
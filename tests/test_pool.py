@@ -0,0 +1,70 @@
+"""
+Offline tests for the multi-account client pool
+"""
+from urllib.parse import parse_qs
+
+import pytest
+
+from sonetel import transport
+from sonetel.pool import ClientPool
+from tests.local_server import make_token
+
+ACCOUNTS = {'a@example.com': '1001', 'b@example.com': '1002', 'c@example.com': '1003'}
+
+
+@pytest.fixture
+def server(server):
+    sign_ins = []
+
+    def token_route(handler):
+        username = parse_qs(handler.body.decode())['username'][0]
+        sign_ins.append(username)
+        return 200, {'access_token': make_token(acc_id=ACCOUNTS[username]), 'refresh_token': 'refresh'}, {}
+
+    server.routes[('POST', '/oauth/token')] = token_route
+    for account_id in ACCOUNTS.values():
+        server.routes[('GET', f'/account//{account_id}')] = \
+            lambda h, a=account_id: (200, {'status': 'success', 'response': {'credit_balance': a, 'currency': 'USD'}}, {})
+
+    server.sign_ins = sign_ins
+    transport.set_transport(transport.Transport(coalesce=False))
+    yield server
+
+
+def test_fan_out(server):
+    pool = ClientPool()
+    for username, account_id in ACCOUNTS.items():
+        pool.add(account_id, username, 'password')
+    pool.add('9999', 'a@example.com', 'password')
+
+    result = pool.get_balance(currency=True)
+    assert result['response']['succeeded'] == {'1001': '1001 USD', '1002': '1002 USD', '1003': '1003 USD'}
+    assert result['response']['failed']['9999']['error'] == 'AuthException'
+    assert result['status'] == 'failed'
+
+    pool.get_balance(account_ids=['1001', '1002', '1003'])
+    assert sorted(server.sign_ins) == ['a@example.com', 'a@example.com', 'b@example.com', 'c@example.com']
+
+
+def test_accounts_are_evicted(server):
+    pool = ClientPool(max_accounts=2)
+    for username, account_id in ACCOUNTS.items():
+        pool.add(account_id, username, 'password')
+
+    assert pool.resource('1001', 'Account') is pool.resource('1001', 'Account')
+    pool.resource('1002', 'Account')
+    pool.resource('1003', 'Account')
+    assert pool.stats() == {'accounts': 3, 'signed_in': 2, 'sign_ins': 3, 'evictions': 1}
+
+    assert pool.resource('1001', 'Account').get_balance() == '1001'
+    assert pool.stats()['sign_ins'] == 4
+    pool.close()
+    assert pool.stats()['signed_in'] == 0
+
+
+def test_one_sign_in_per_account(server):
+    pool = ClientPool(max_workers=16)
+    pool.add('1001', 'a@example.com', 'password')
+    result = pool.map(lambda account_id: pool.auth(account_id).get_access_token(), ['1001'] * 16)
+    assert result['status'] == 'success'
+    assert server.sign_ins == ['a@example.com']
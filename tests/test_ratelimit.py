@@ -0,0 +1,50 @@
+"""
+Offline tests for client-side rate limiting
+"""
+from time import monotonic
+
+from sonetel import transport
+from sonetel.ratelimit import RateLimiter, TokenBucket, parse_retry_after
+from tests.local_server import LocalServer
+
+
+def test_token_bucket_paces_requests():
+    bucket = TokenBucket(rate=50, burst=1)
+    start = monotonic()
+    for _ in range(6):
+        bucket.acquire()
+    assert monotonic() - start >= 0.09
+    assert bucket.stats()['waited'] == 5
+
+
+def test_parse_retry_after():
+    assert parse_retry_after('2') == 2.0
+    assert parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT') == 0.0
+    assert parse_retry_after('garbage', default=3) == 3
+
+
+def test_endpoint_group():
+    assert transport.endpoint_group('https://public-api.sonetel.com/make-calls/call/call-back') == 'callback'
+    assert transport.endpoint_group('https://public-api.sonetel.com/account/1/phonenumbersubscription/') == 'numbers'
+    assert transport.endpoint_group('https://public-api.sonetel.com/account/1/user/2') == 'users'
+    assert transport.endpoint_group('https://public-api.sonetel.com/account/1') == 'account'
+
+
+def test_429_is_queued_and_retried():
+    calls = []
+
+    def route(handler):
+        calls.append(monotonic())
+        if len(calls) == 1:
+            return 429, {'status': 'failed'}, {'Retry-After': '0.2'}
+        return 200, {'status': 'success'}, {}
+
+    limiter = RateLimiter({'callback': (100, 10)})
+    t = transport.Transport(rate_limiter=limiter)
+    with LocalServer({('POST', '/make-calls/call/call-back'): route}) as server:
+        response = t.request('post', f'{server.url}/make-calls/call/call-back', timeout=5)
+
+    assert response.status_code == 200
+    assert calls[1] - calls[0] >= 0.2
+    assert limiter.stats()['callback']['waited'] == 1
+    t.close()
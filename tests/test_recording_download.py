@@ -0,0 +1,65 @@
+"""
+Offline tests for Recording.download() and download_many()
+"""
+import hashlib
+import json
+import os
+
+import pytest
+
+from sonetel import transport
+from sonetel import Recording
+from sonetel.scheduler import Scheduler
+from tests.local_server import make_token
+
+AUDIO = bytes(range(256)) * 1000
+
+
+def file_route(handler):
+    start = 0
+    if handler.headers.get('Range'):
+        start = int(handler.headers['Range'].split('=')[1].rstrip('-'))
+        return 206, AUDIO[start:], {}
+    return 200, AUDIO, {}
+
+
+@pytest.fixture
+def server(server):
+    server.routes[('GET', '/files/RE1.mp3')] = file_route
+    server.routes[('GET', '/call-recording/RE1')] = lambda h: (200, {'status': 'success', 'response': {
+        'call_recording_id': 'RE1',
+        'file_access_details': {'file_download_url': f'{server.url}/files/RE1.mp3'},
+    }}, {})
+    yield server
+
+
+def test_download_resumes_partial_file(server, tmp_path):
+    path = tmp_path / 'RE1.mp3'
+    (tmp_path / 'RE1.mp3.part').write_bytes(AUDIO[:1000])
+
+    result = Recording(access_token=make_token()).download(rec_id='RE1', path=str(path))
+
+    assert result['status'] == 'success'
+    assert path.read_bytes() == AUDIO
+    assert result['response']['sha256'] == hashlib.sha256(AUDIO).hexdigest()
+    assert not os.path.exists(f'{path}.part')
+
+
+def test_download_many_writes_manifest(server, tmp_path):
+    result = Recording(access_token=make_token()).download_many(['RE1', 'RE404'], directory=str(tmp_path))
+
+    assert [f['size'] for f in result['response']] == [len(AUDIO)]
+    assert list(result['errors']) == ['RE404']
+    manifest = json.loads((tmp_path / 'manifest.json').read_text())
+    assert manifest['files'][0]['path'] == str(tmp_path / 'RE1.mp3')
+
+
+def test_download_many_runs_in_callers_context(server, tmp_path):
+    scheduler = Scheduler(max_concurrency=4)
+    transport.configure(scheduler=scheduler)
+    recording = Recording(access_token=make_token()).with_priority('bulk')
+    assert recording.download_many(['RE1'], directory=str(tmp_path))['status'] == 'success'
+
+    stats = scheduler.stats()
+    assert stats['bulk']['requests'] == 2
+    assert stats['interactive']['requests'] == 0
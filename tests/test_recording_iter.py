@@ -0,0 +1,66 @@
+"""
+Offline tests for Recording.iter()
+"""
+import datetime
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from sonetel import transport
+from sonetel import Recording
+from sonetel import exceptions as e
+from sonetel.scheduler import Scheduler
+from tests.local_server import make_token
+
+FORMAT = '%Y%m%dT%H:%M:%SZ'
+START = datetime.datetime(2023, 1, 1)
+RECORDINGS = [
+    {'call_recording_id': f'RE{i}', 'created_date': (START + datetime.timedelta(hours=i)).strftime(FORMAT)}
+    for i in range(72)
+]
+
+
+def recordings_route(handler):
+    query = parse_qs(urlsplit(handler.path).query)
+    low, high = query['created_date_min'][0], query['created_date_max'][0]
+    found = [rec for rec in RECORDINGS if low <= rec['created_date'] <= high]
+    return 200, {'status': 'success', 'response': list(reversed(found))}, {}
+
+
+@pytest.fixture
+def server(server):
+    server.routes[('GET', '/call-recording')] = recordings_route
+    yield server
+
+
+def test_iter_yields_all_recordings_in_order(server):
+    recording = Recording(access_token=make_token())
+    result = list(recording.iter('20230101T00:00:00Z', '20230104T00:00:00Z', window=datetime.timedelta(hours=6)))
+
+    assert [rec['call_recording_id'] for rec in result] == [rec['call_recording_id'] for rec in RECORDINGS]
+    assert len(server.requests) == 12
+
+
+def test_iter_typed_skips_boundary_duplicates(server):
+    recording = Recording(access_token=make_token())
+    result = list(recording.iter('20230101T00:00:00Z', '20230104T00:00:00Z', window=datetime.timedelta(hours=6),
+                                 typed=True))
+
+    assert [rec.call_recording_id for rec in result] == [rec['call_recording_id'] for rec in RECORDINGS]
+
+
+def test_iter_runs_in_callers_context(server):
+    scheduler = Scheduler(max_concurrency=4)
+    transport.configure(scheduler=scheduler)
+    recording = Recording(access_token=make_token()).with_priority('interactive')
+    list(recording.iter('20230101T00:00:00Z', '20230104T00:00:00Z'))
+
+    stats = scheduler.stats()
+    assert stats['interactive']['requests'] == 3
+    assert stats['bulk']['requests'] == 0
+
+
+def test_iter_rejects_invalid_range(server):
+    recording = Recording(access_token=make_token())
+    with pytest.raises(e.RecordingException):
+        recording.iter('20230104T00:00:00Z', '20230101T00:00:00Z')
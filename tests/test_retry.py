@@ -0,0 +1,73 @@
+"""
+Offline tests for the retry policy
+"""
+import asyncio
+import socket
+import time
+
+import pytest
+import requests
+
+from sonetel import transport
+from sonetel.retry import RetryPolicy, is_connect_error
+from tests.local_server import LocalServer
+
+
+def unused_url():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return f'http://127.0.0.1:{sock.getsockname()[1]}'
+
+
+def test_backoff_is_bounded():
+    policy = RetryPolicy(backoff_base=1, backoff_max=2, deadline=10)
+    assert all(0 <= policy.backoff(attempt) <= 2 for attempt in range(1, 10))
+    assert policy.backoff(5, elapsed=9.9) <= 0.1 + 1e-9
+
+
+def test_post_is_retried_on_connect_error():
+    policy = RetryPolicy(max_attempts=3, backoff_base=0.01)
+    t = transport.Transport(retry_policy=policy)
+    with pytest.raises(requests.exceptions.ConnectionError) as err:
+        t.request('post', f'{unused_url()}/make-calls/call/call-back', timeout=1)
+    assert is_connect_error(err.value)
+    assert policy.stats()['retries'] == {'callback': 2}
+
+
+def test_async_errors():
+    aiohttp = pytest.importorskip('aiohttp')
+    policy = RetryPolicy()
+    assert policy.should_retry('GET', 1, 0.0, err=aiohttp.ServerDisconnectedError())
+    assert policy.should_retry('GET', 1, 0.0, err=asyncio.TimeoutError())
+    assert not policy.should_retry('POST', 1, 0.0, err=asyncio.TimeoutError())
+    assert not policy.should_retry('GET', 1, 0.0, err=aiohttp.ClientPayloadError())
+
+
+def test_post_is_not_retried_after_read_timeout():
+    policy = RetryPolicy(max_attempts=3, backoff_base=0.01)
+    t = transport.Transport(retry_policy=policy)
+
+    def slow(handler):
+        time.sleep(0.5)
+        return 200, {}, {}
+
+    with LocalServer({('POST', '/make-calls/call/call-back'): slow, ('GET', '/call-recording'): slow}) as server:
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            t.request('post', f'{server.url}/make-calls/call/call-back', timeout=0.1)
+        assert policy.stats()['retries'] == {}
+
+        with pytest.raises(requests.exceptions.ReadTimeout):
+            t.request('get', f'{server.url}/call-recording', timeout=0.1)
+        assert policy.stats()['retries'] == {'recordings': 2}
+    t.close()
+
+
+def test_get_is_retried_on_502():
+    statuses = [502, 200]
+    policy = RetryPolicy(backoff_base=0.01)
+    t = transport.Transport(retry_policy=policy)
+    with LocalServer({('GET', '/voiceapp/'): lambda h: (statuses.pop(0), {}, {})}) as server:
+        assert t.request('get', f'{server.url}/voiceapp/', timeout=5).status_code == 200
+    assert policy.stats()['retries'] == {'voiceapps': 1}
+    assert sum(policy.stats()['latency']['voiceapps'].values()) == 2
+    t.close()
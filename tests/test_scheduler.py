@@ -0,0 +1,78 @@
+"""
+Offline tests for the priority scheduler
+"""
+import threading
+import time
+
+import pytest
+
+from sonetel import _constants as const
+from sonetel import exceptions as e
+from sonetel import scheduler, transport
+from sonetel import Account, Recording
+from sonetel.scheduler import Scheduler
+from tests.local_server import make_token
+
+BASE = const.API_URI_BASE
+
+
+def test_classify():
+    assert scheduler.classify('POST', f'{BASE}{const.API_ENDPOINT_CALLBACK}', 'callback') == 'interactive'
+    assert scheduler.classify('PUT', f'{BASE}/account/1/phonenumbersubscription/+4610', 'numbers') == 'mutation'
+    assert scheduler.classify('GET', f'{BASE}/call-recording?account_id=1', 'recordings') == 'bulk'
+    assert scheduler.classify('GET', f'{BASE}/call-recording/REabc', 'recordings') == 'interactive'
+    assert scheduler.classify('GET', f'{BASE}/account/1/user/', 'users') == 'bulk'
+    assert scheduler.classify('GET', f'{BASE}/account/1', 'account') == 'interactive'
+
+
+def test_weighted_fair_queuing():
+    s = Scheduler(max_concurrency=1, weights={'interactive': 4, 'bulk': 1})
+    s.acquire('bulk')
+    order = []
+
+    def worker(name):
+        s.acquire(name)
+        order.append(name)
+        s.release()
+
+    threads = []
+    for name in ['bulk'] * 4 + ['interactive'] * 4:
+        thread = threading.Thread(target=worker, args=(name,))
+        thread.start()
+        threads.append(thread)
+        time.sleep(0.01)
+    s.release()
+    for thread in threads:
+        thread.join()
+
+    assert order[:5].count('interactive') == 4
+    assert order.count('bulk') == 4
+    stats = s.stats()
+    assert stats['bulk']['requests'] == 5
+    assert stats['bulk']['waited'] == 4
+    assert stats['interactive']['max_wait'] > 0
+    assert stats['interactive']['queued'] == 0
+
+
+def test_acquire_times_out():
+    s = Scheduler(max_concurrency=1)
+    s.acquire('bulk')
+    with pytest.raises(e.DeadlineExceededException):
+        s.acquire('interactive', timeout=0.05)
+    assert s.stats()['interactive']['queued'] == 0
+    s.release()
+    assert s.acquire('interactive') == 0.0
+
+
+def test_transport_tags_requests(server):
+    t = transport.configure(scheduler=Scheduler(max_concurrency=2))
+    token = make_token()
+    assert Recording(access_token=token).get()['status'] == 'success'
+    assert Account(access_token=token).with_priority('bulk').get()['status'] == 'success'
+    with scheduler.priority('mutation'):
+        Account(access_token=token).get()
+    stats = t.scheduler.stats()
+    assert stats['bulk']['requests'] == 2
+    assert stats['mutation']['requests'] == 1
+    assert stats['interactive']['requests'] == 0
+    assert t.stats()['requests'] == 3
@@ -0,0 +1,75 @@
+"""
+Offline tests for automatic token refresh
+"""
+import threading
+
+import sonetel as sntl
+from sonetel import Auth
+from sonetel import utilities as util
+from tests.local_server import make_token
+
+
+def test_single_flight_refresh(server):
+    auth = Auth('user@example.com', 'password', background_refresh=False)
+    stale = auth.get_access_token()
+
+    threads = [threading.Thread(target=auth.refresh, kwargs={'stale_token': stale}) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert server.grants == ['password', 'refresh_token']
+    assert auth.get_access_token() != stale
+
+
+def test_expiring_token_is_refreshed(server, monkeypatch):
+    auth = Auth('user@example.com', 'password', background_refresh=False)
+    exp = auth.get_decoded_token()['exp'] - 3500
+    monkeypatch.setattr(auth, '_tokens', auth._tokens._replace(decoded=dict(auth.get_decoded_token(), exp=exp),
+                                                               created=exp - 3600))
+    auth.get_access_token()
+    assert server.grants == ['password', 'refresh_token']
+
+
+def test_401_refreshes_and_retries(server):
+    auth = Auth('user@example.com', 'password', background_refresh=False)
+    rejected = auth.get_access_token()
+
+    def account_route(handler):
+        if handler.headers['Authorization'] == f'Bearer {rejected}':
+            return 401, {'status': 'failed'}, {}
+        return 200, {'status': 'success', 'response': {}}, {}
+
+    server.routes[('GET', '/account/')] = account_route
+    assert util.send_api_request(token=auth, uri=f'{server.url}/account/')['status'] == 'success'
+    assert server.grants == ['password', 'refresh_token']
+
+
+def test_background_refresh(server):
+    auth = Auth('user@example.com', 'password')
+    assert auth._refresh_delay() > 1700
+    auth._schedule_refresh(delay=0)
+    timer = auth._refresh_timer
+    timer.join(5)
+    assert server.grants == ['password', 'refresh_token']
+    auth.close()
+
+
+def test_resource_follows_provider(server):
+    auth = Auth('user@example.com', 'password', background_refresh=False)
+    account = sntl.Account(access_token=auth)
+    assert account.get_accountid() == '1234'
+
+    auth.refresh()
+    server.routes[('GET', '/account//1234')] = \
+        lambda h: (200, {'status': 'success', 'response': {'auth': h.headers['Authorization']}}, {})
+    assert account.get()['response']['auth'] == f'Bearer {auth.get_access_token()}'
+
+
+def test_decoded_claims_are_cached():
+    token = make_token()
+    util.decode_token.cache_clear()
+    for _ in range(100):
+        sntl.Call(access_token=token)
+    assert util.decode_token.cache_info().misses == 1
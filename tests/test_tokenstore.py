@@ -0,0 +1,79 @@
+"""
+Offline tests for the persistent token store
+"""
+import subprocess
+import sys
+import threading
+
+from sonetel import _constants as const
+from sonetel import Auth
+from sonetel.tokenstore import FileTokenStore
+
+WORKER = '''
+import sys
+from sonetel import _constants as const
+from sonetel import Auth
+from sonetel.tokenstore import FileTokenStore
+const.API_URI_AUTH = sys.argv[1]
+auth = Auth('user@example.com', 'password', background_refresh=False, token_store=FileTokenStore(sys.argv[2], key='secret'))
+print(auth.get_access_token())
+'''
+
+
+def test_tokens_are_encrypted(tmp_path):
+    store = FileTokenStore(str(tmp_path), key=FileTokenStore.generate_key())
+    store.save('name', {'access_token': 'secret-token'})
+    assert b'secret-token' not in (tmp_path / 'name.token').read_bytes()
+    assert store.load('name') == {'access_token': 'secret-token'}
+    assert FileTokenStore(str(tmp_path), key='another key').load('name') is None
+
+
+def test_passphrase_salt_is_random_and_adopted(tmp_path):
+    first = FileTokenStore(str(tmp_path / 'a'), key='secret')
+    second = FileTokenStore(str(tmp_path / 'b'), key='secret')
+    first.save('name', {'access_token': 'one'})
+    second.save('name', {'access_token': 'two'})
+    header = (tmp_path / 'a' / 'name.token').read_bytes().rsplit(b'$', 1)[0]
+    assert header != (tmp_path / 'b' / 'name.token').read_bytes().rsplit(b'$', 1)[0]
+
+    reader = FileTokenStore(str(tmp_path / 'a'), key='secret')
+    assert reader.load('name') == {'access_token': 'one'}
+    reader.save('name', {'access_token': 'three'})
+    assert (tmp_path / 'a' / 'name.token').read_bytes().rsplit(b'$', 1)[0] == header
+    assert first.load('name') == {'access_token': 'three'}
+    assert FileTokenStore(str(tmp_path / 'a'), key=FileTokenStore.generate_key()).load('name') is None
+
+
+def test_concurrent_saves(tmp_path):
+    store = FileTokenStore(str(tmp_path), key=FileTokenStore.generate_key())
+    threads = [threading.Thread(target=store.save, args=('name', {'access_token': str(i)})) for i in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store.load('name')['access_token'] in {str(i) for i in range(20)}
+    assert [p.name for p in tmp_path.iterdir()] == ['name.token']
+
+
+def test_processes_share_one_token(server, tmp_path):
+    workers = [
+        subprocess.Popen([sys.executable, '-c', WORKER, const.API_URI_AUTH, str(tmp_path)],
+                         stdout=subprocess.PIPE, text=True)
+        for _ in range(8)
+    ]
+    tokens = {worker.communicate(timeout=30)[0].strip() for worker in workers}
+    assert len(tokens) == 1
+    assert server.grants == ['password']
+
+
+def test_refresh_is_shared(server, tmp_path):
+    first = Auth('user@example.com', 'password', background_refresh=False,
+                 token_store=FileTokenStore(str(tmp_path), key='secret'))
+    second = Auth('user@example.com', 'password', background_refresh=False,
+                  token_store=FileTokenStore(str(tmp_path), key='secret'))
+    assert second.get_access_token() == first.get_access_token()
+
+    stale = second.get_access_token()
+    refreshed = first.refresh(stale_token=stale)
+    assert second.refresh(stale_token=stale) == refreshed != stale
+    assert server.grants == ['password', 'refresh_token']
@@ -0,0 +1,62 @@
+"""
+Offline tests for the pooled transport
+"""
+from sonetel import transport
+from tests.local_server import LocalServer
+
+
+def test_connections_are_reused():
+    t = transport.Transport(pool_maxsize=2)
+    with LocalServer() as server:
+        for _ in range(5):
+            assert t.request('get', f'{server.url}/account/', timeout=5).status_code == 200
+    stats = t.stats()
+    assert stats['requests'] == 5
+    assert stats['new_connections'] == 1
+    assert stats['pool_hits'] == 4
+    t.close()
+
+
+def test_idle_pool_is_dropped():
+    t = transport.Transport(keepalive_timeout=0)
+    with LocalServer() as server:
+        t.request('get', f'{server.url}/account/', timeout=5)
+        t.request('get', f'{server.url}/account/', timeout=5)
+    assert t.stats()['new_connections'] == 2
+    t.close()
+
+
+def test_set_transport():
+    custom = transport.Transport()
+    transport.set_transport(custom)
+    assert transport.get_transport() is custom
+    assert transport.configure(pool_maxsize=3).pool_maxsize == 3
+
+
+def test_concurrent_gets_are_coalesced():
+    import threading
+    import time
+
+    def slow(handler):
+        time.sleep(0.2)
+        return 200, {'status': 'success', 'response': 'ok'}, {}
+
+    t = transport.Transport(pool_maxsize=20)
+    results = []
+    with LocalServer({('GET', '/account/'): slow, ('GET', '/account/1'): slow}) as server:
+        def get(path, token):
+            response = t.request('get', f'{server.url}{path}', headers={'Authorization': token}, timeout=5)
+            results.append(response.json())
+
+        threads = [threading.Thread(target=get, args=('/account/', 'a')) for _ in range(20)]
+        threads += [threading.Thread(target=get, args=('/account/', 'b')),
+                    threading.Thread(target=get, args=('/account/1', 'a'))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(server.requests) == 3
+
+    assert results == [{'status': 'success', 'response': 'ok'}] * 22
+    assert t.stats()['coalesced'] == 19
+    t.close()